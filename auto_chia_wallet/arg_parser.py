@@ -8,14 +8,49 @@ class ArgParser:
         sp.add_parser("config", help="display config.yaml location")
         sp.add_parser("init", help="generate config.yaml")
         sp.add_parser("version", help="display version of auto_chia_wallet")
+        serve_parser = sp.add_parser("serve", help="run a local HTTP API that generates PlotNFTs on request")
+        serve_parser.add_argument("--port", type=int, help="Port to listen on, overrides serve.port in config.yaml")
+        serve_parser.add_argument("--workers", type=int, help="Concurrent generations, overrides serve.workers")
+        resume_parser = sp.add_parser("resume", help="finish the wallets an interrupted run left in the journal")
+        resume_parser.add_argument(
+            "-f", action="store_true", help="Fund wallets that never got coins from the feed wallet"
+        )
+        resume_parser.add_argument(
+            "--wait", type=float, default=0, help="Seconds to wait for wallets without coins, 0 lists them and moves on"
+        )
+        resume_parser.add_argument(
+            "--submitted", action="store_true", help="Also recheck wallets whose launcher was pushed"
+        )
+        bench_parser = sp.add_parser("bench", help="time the offline PlotNFT build against a fake coin")
+        bench_parser.add_argument("-n", "--count", type=int, default=100, help="Accounts to build per run")
+        bench_parser.add_argument("-w", "--workers", type=int, default=1, help="Most worker processes to measure")
+        bench_parser.add_argument("-o", "--output", default="benchmark.json", help="Where to write the JSON results")
+        bench_parser.add_argument("--baseline", help="Results of an earlier run, exits with 1 on a regression")
+        bench_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline")
+        p_feed = sp.add_parser("feed", help="Manage the feed wallet")
+        sp_feed = p_feed.add_subparsers(dest="target")
+        split_parser = sp_feed.add_parser("split", help="Split the feed wallet into many coins for parallel funding")
+        split_parser.add_argument("--coins", type=int, required=True, help="Number of coins to create")
+        split_parser.add_argument("--amount", type=int, help="Amount of each coin, defaults to feed_amount + fee")
         p_generate = sp.add_parser("generate", help="Used to generate a new set of keys, or a plotnft")
         sp_generate = p_generate.add_subparsers(dest="target")
         sp_generate.add_parser("key", help="Used to generate a new account")
+        keys_parser = sp_generate.add_parser("keys", help="Used to pre-generate keys into the key pool")
+        keys_parser.add_argument("-n", "--count", type=int, default=1, help="Number of keys to generate")
         plotnft_parser = sp_generate.add_parser("plotnft", help="Used to create a plot nft")
         plotnft_parser.add_argument("-m", action="store_true", help="Use existing mnemonic seed to generate PlotNFT")
         plotnft_parser.add_argument(
             "-f", action="store_true", help="Use a feed wallet, default is to print address and wait for coins"
         )
+        plotnft_parser.add_argument(
+            "-n", "--count", type=int, default=1, help="Number of PlotNFTs to generate, funded by one feed transaction"
+        )
+        plotnft_parser.add_argument(
+            "-p", action="store_true", help="Claim keys from the key pool made by 'generate keys' instead of deriving"
+        )
+        plotnft_parser.add_argument(
+            "-e", action="store_true", help="With -f, submit the launchers with the unconfirmed feed transaction"
+        )
 
     def parse_args(self):
         return self.parser.parse_args()
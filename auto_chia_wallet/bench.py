@@ -0,0 +1,284 @@
+import asyncio
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List, Optional, Set
+
+from chia.pools.pool_puzzles import SINGLETON_LAUNCHER_HASH
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.spend_bundle import SpendBundle
+from chia.util.ints import uint64
+from chia.util.keychain import bytes_to_mnemonic, token_bytes
+from chia.wallet.sign_coin_spends import sign_coin_spends
+
+from auto_chia_wallet.config import SELF_POOLING
+from auto_chia_wallet.fake_wallet import FakeWallet, get_constants, pool_state_template
+from auto_chia_wallet.puzzles import get_pool_puzzle_template
+from auto_chia_wallet.signing import BatchSigner, SigningJob, agg_sig_me_additional_data
+
+# In the order build_plotnft runs them. _generate_unsigned_transaction and sign_coin_spends are
+# the two halves of create_launcher_spend's signed transaction, timed again on their own
+STAGES: List[str] = [
+    "load_mnemonic",
+    "derive_keys",
+    "init_pool_state",
+    "create_launcher_spend",
+    "_generate_unsigned_transaction",
+    "sign_coin_spends",
+    "p2_singleton_puzzle_hash",
+]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered: List[float] = sorted(samples)
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": rank(0.5),
+        "p90": rank(0.9),
+        "p99": rank(0.99),
+        "max": ordered[-1],
+    }
+
+
+def offline_wallet(config: Dict, pool_template: Dict) -> FakeWallet:
+    # Never connected, nothing on the offline path talks to a node
+    wallet: FakeWallet = FakeWallet()
+    wallet.config = config
+    wallet.constants = get_constants(config["overrides"])
+    wallet.owns_node_client = False
+    wallet.pool_template = pool_template
+    return wallet
+
+
+async def fake_coin(wallet: FakeWallet) -> Set[Coin]:
+    # Stands in for the feed payment, only the puzzle hash has to belong to the wallet
+    return {
+        Coin(token_bytes(32), await wallet.get_first_puzzle_hash(), uint64(wallet.config["feed_wallet"]["feed_amount"]))
+    }
+
+
+async def time_stages(config: Dict, pool_template: Dict, mnemonic: str) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    wallet: FakeWallet = offline_wallet(config, pool_template)
+    try:
+        start = time.perf_counter()
+        await wallet.load_mnemonic(mnemonic)
+        timings["load_mnemonic"] = time.perf_counter() - start
+
+        # Wallet keys are derived on first use, so they're timed together here instead of in later stages
+        start = time.perf_counter()
+        coins: Set[Coin] = await fake_coin(wallet)
+        owner_puzzle_hash: bytes32 = await wallet.get_payout_address()
+        delay_ph, delay_time = await wallet.get_p2_delay_info()
+        await wallet.get_farmer_pub_key()
+        timings["derive_keys"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        initial_target_state = await wallet.init_pool_state()
+        timings["init_pool_state"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, _, launcher_id = await wallet.create_launcher_spend(
+            coins, initial_target_state, delay_time, delay_ph, owner_puzzle_hash
+        )
+        timings["create_launcher_spend"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        spends = await wallet._generate_unsigned_transaction(
+            uint64(1), SINGLETON_LAUNCHER_HASH, uint64(0), None, coins, None, None, owner_puzzle_hash
+        )
+        timings["_generate_unsigned_transaction"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await sign_coin_spends(
+            spends,
+            wallet.secret_key_store.secret_key_for_public_key,
+            agg_sig_me_additional_data(wallet.constants),
+            wallet.constants.MAX_BLOCK_COST_CLVM,
+        )
+        timings["sign_coin_spends"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        get_pool_puzzle_template(wallet.constants).p2_singleton_puzzle_hash(launcher_id, delay_time, delay_ph)
+        timings["p2_singleton_puzzle_hash"] = time.perf_counter() - start
+    finally:
+        wallet.close()
+    return timings
+
+
+async def build_accounts(config: Dict, pool_template: Dict, count: int) -> int:
+    # The whole offline path of one PlotNFT, as generate_plotnft runs it minus the RPC calls
+    for _ in range(count):
+        wallet: FakeWallet = offline_wallet(config, pool_template)
+        try:
+            await wallet.load_mnemonic(bytes_to_mnemonic(token_bytes(32)))
+            await wallet.build_plotnft(await fake_coin(wallet))
+        finally:
+            wallet.close()
+    return count
+
+
+async def build_signing_jobs(config: Dict, pool_template: Dict, count: int) -> List[SigningJob]:
+    # Unsigned launcher spends, as a batch hands them to its BatchSigner
+    jobs: List[SigningJob] = []
+    for _ in range(count):
+        wallet: FakeWallet = offline_wallet(config, pool_template)
+        try:
+            await wallet.load_mnemonic(bytes_to_mnemonic(token_bytes(32)))
+            spend_bundle, _ = await wallet.build_plotnft(await fake_coin(wallet), sign=False)
+            jobs.append(wallet.signing_job(spend_bundle))
+        finally:
+            wallet.close()
+    return jobs
+
+
+def build_accounts_in_worker(config: Dict, pool_template: Dict, count: int) -> int:
+    return asyncio.run(build_accounts(config, pool_template, count))
+
+
+def warm_up_worker() -> None:
+    # Long enough that each warm up lands in its own process, so every worker has started before timing
+    time.sleep(0.2)
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    # 1, 2, 4 ... and max_workers itself
+    counts: List[int] = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+async def run_benchmark(config, count: int = 100, max_workers: int = 1) -> Dict:
+    """
+    Times every offline stage of building a PlotNFT against a fake coin, count times, then the
+    accounts per second of the whole build, and the bundles per second of batch signing, at 1 up
+    to max_workers processes
+    """
+    config_dict: Dict = asdict(config)
+    # SELF_POOLING, so building the pool state template makes no request to a pool
+    config_dict["pool_info"]["state"] = SELF_POOLING
+    pool_template: Dict = await pool_state_template(config_dict)
+
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for _ in range(count):
+        timings: Dict[str, float] = await time_stages(config_dict, pool_template, bytes_to_mnemonic(token_bytes(32)))
+        for stage, seconds in timings.items():
+            samples[stage].append(seconds)
+
+    throughput: List[Dict] = []
+    loop = asyncio.get_running_loop()
+    for workers in worker_counts(max_workers):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            await asyncio.gather(*[loop.run_in_executor(executor, warm_up_worker) for _ in range(workers)])
+            shares: List[int] = [count // workers + (1 if index < count % workers else 0) for index in range(workers)]
+            start = time.perf_counter()
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(executor, build_accounts_in_worker, config_dict, pool_template, share)
+                    for share in shares
+                    if share > 0
+                ]
+            )
+            seconds = time.perf_counter() - start
+        throughput.append(
+            {"workers": workers, "accounts": count, "seconds": seconds, "accounts_per_second": count / seconds}
+        )
+
+    # Signing alone, the stage a batch hands to its BatchSigner
+    signing: List[Dict] = []
+    jobs: List[SigningJob] = await build_signing_jobs(config_dict, pool_template, count)
+    constants = get_constants(config_dict["overrides"])
+    for workers in worker_counts(max_workers):
+        signer = BatchSigner(workers, config.sign_executor)
+        try:
+            # Starts every worker, and checks the spends sign, before timing
+            for signed in await signer.sign(
+                jobs[:workers], agg_sig_me_additional_data(constants), constants.MAX_BLOCK_COST_CLVM
+            ):
+                if not isinstance(signed, SpendBundle):
+                    raise signed
+            start = time.perf_counter()
+            await signer.sign(jobs, agg_sig_me_additional_data(constants), constants.MAX_BLOCK_COST_CLVM)
+            seconds = time.perf_counter() - start
+        finally:
+            signer.close()
+        signing.append(
+            {"workers": workers, "bundles": count, "seconds": seconds, "bundles_per_second": count / seconds}
+        )
+
+    return {
+        "time": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "count": count,
+        "stages": {stage: percentiles(stage_samples) for stage, stage_samples in samples.items()},
+        "throughput": throughput,
+        "signing": signing,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    # Regressions beyond tolerance, a fraction, in stage p50 latency or in accounts per second
+    regressions: List[str] = []
+    for stage, stats in results["stages"].items():
+        if stage in baseline["stages"] and stats["p50"] > baseline["stages"][stage]["p50"] * (1 + tolerance):
+            regressions.append(
+                f"{stage} p50 {stats['p50'] * 1000:.3f}ms, baseline {baseline['stages'][stage]['p50'] * 1000:.3f}ms"
+            )
+    baseline_throughput: Dict[int, float] = {
+        entry["workers"]: entry["accounts_per_second"] for entry in baseline["throughput"]
+    }
+    for entry in results["throughput"]:
+        expected: Optional[float] = baseline_throughput.get(entry["workers"])
+        if expected is not None and entry["accounts_per_second"] < expected * (1 - tolerance):
+            regressions.append(
+                f"{entry['workers']} workers {entry['accounts_per_second']:.1f} accounts/s, baseline {expected:.1f}"
+            )
+    baseline_signing: Dict[int, float] = {
+        entry["workers"]: entry["bundles_per_second"] for entry in baseline.get("signing", [])
+    }
+    for entry in results["signing"]:
+        expected = baseline_signing.get(entry["workers"])
+        if expected is not None and entry["bundles_per_second"] < expected * (1 - tolerance):
+            regressions.append(
+                f"{entry['workers']} signing workers {entry['bundles_per_second']:.1f} bundles/s, baseline {expected:.1f}"
+            )
+    return regressions
+
+
+def print_results(results: Dict):
+    print(f"{'stage':<32}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, stats in results["stages"].items():
+        print(f"{stage:<32}" + "".join(f"{stats[key] * 1000:>10.3f}" for key in ("mean", "p50", "p90", "p99", "max")))
+    for entry in results["throughput"]:
+        print(f"{entry['workers']} workers: {entry['accounts_per_second']:.1f} accounts/s")
+    for entry in results["signing"]:
+        print(f"{entry['workers']} signing workers: {entry['bundles_per_second']:.1f} bundles/s")
+
+
+def bench(config, count: int, max_workers: int, output: str, baseline: Optional[str] = None, tolerance: float = 0.2):
+    results: Dict = asyncio.run(run_benchmark(config, count, max_workers))
+    print_results(results)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=4)
+    print(f"Wrote results to: {output}")
+    if baseline is None:
+        return 0
+    with open(baseline, "r") as file:
+        regressions: List[str] = compare(results, json.load(file), tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    return 1 if len(regressions) > 0 else 0
@@ -1,19 +1,25 @@
-import asyncio
+import json
 import os
 
-from auto_chia_wallet import generate_key, generate_plotnft_from_mnemonic, generate_plotnft
 from auto_chia_wallet.arg_parser import ArgParser
 from auto_chia_wallet.config import get_config_path, load_config
+from auto_chia_wallet.journal import Journal
+from auto_chia_wallet.metrics import metrics
+from auto_chia_wallet.output import BatchOutput, write_account_file
 
 
 def main():
     parser = ArgParser()
     args = parser.parse_args()
 
+    # Commands that only touch the config return before anything imports chia
     if args.cmd == "version":
-        import pkg_resources
+        try:
+            from importlib.metadata import version
+        except ImportError:  # Python 3.7
+            from importlib_metadata import version
 
-        print(pkg_resources.get_distribution("auto_chia_wallet"))
+        print(f"auto_chia_wallet {version('auto_chia_wallet')}")
         return 0
 
     elif args.cmd == "config":
@@ -31,21 +37,115 @@ def main():
         generate_config()
         return 0
 
+    # asyncio alone is a good part of the startup time, only the commands below run the event loop
+    import asyncio
+
+    if args.cmd == "serve":
+        from dataclasses import replace
+        from auto_chia_wallet.server import serve
+
+        config = load_config()
+        if args.port is not None:
+            config.serve = replace(config.serve, port=args.port)
+        if args.workers is not None:
+            config.serve = replace(config.serve, workers=args.workers)
+        try:
+            asyncio.run(serve(config))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    elif args.cmd == "bench":
+        from auto_chia_wallet.bench import bench
+        from auto_chia_wallet.config import load_default_config
+
+        # The packaged config, a benchmark shouldn't depend on the user's nodes or pool
+        return bench(load_default_config(), args.count, args.workers, args.output, args.baseline, args.tolerance)
+
+    elif args.cmd == "resume":
+        from auto_chia_wallet.commands import resume_plotnfts
+
+        config = load_config()
+        journal = Journal.open(config.journal_path)
+        output = BatchOutput.open(config)
+        try:
+            asyncio.run(resume_plotnfts(config, journal, args.f, output, args.wait, args.submitted))
+        finally:
+            output.close()
+            journal.close()
+            print_metrics()
+        return 0
+
+    elif args.cmd == "feed":
+        from auto_chia_wallet.commands import split_feed_wallet
+
+        config = load_config()
+        if args.target == "split":
+            asyncio.run(split_feed_wallet(config, args.coins, args.amount))
+            return 0
+        print("No action requested, add 'split'.")
+        return 0
+
     elif args.cmd == "generate":
+        from auto_chia_wallet.commands import (
+            generate_key,
+            generate_keys,
+            generate_plotnft_from_mnemonic,
+            generate_plotnft,
+            generate_plotnft_batch,
+        )
+
         config = load_config()
         if args.target == "key":
             asyncio.run(generate_key(config))
             return 0
+        elif args.target == "keys":
+            asyncio.run(generate_keys(config, args.count))
+            return 0
         elif args.target == "plotnft":
+            if args.e and not args.f:
+                print("'-e' spends the feed wallet's coins before they confirm and needs '-f'")
+                return 1
             if args.m:
-                asyncio.run(generate_plotnft_from_mnemonic(config, args.f))
-            else:
-                asyncio.run(generate_plotnft(config, args.f))
+                if args.count > 1:
+                    print("Generating more than one PlotNFT can't be used with '-m'")
+                    return 1
+                if args.e:
+                    print("'-e' can't be used with '-m'")
+                    return 1
+                save_account(config, asyncio.run(generate_plotnft_from_mnemonic(config, args.f)))
+                return 0
+            # Every stage is journaled, so 'autowallet resume' can finish wallets if this run dies
+            journal = Journal.open(config.journal_path)
+            try:
+                if args.count > 1:
+                    output = BatchOutput.open(config)
+                    try:
+                        asyncio.run(generate_plotnft_batch(config, args.count, args.f, args.p, args.e, journal, output))
+                    finally:
+                        output.close()
+                        print_metrics()
+                else:
+                    save_account(
+                        config, asyncio.run(generate_plotnft(config, args.f, args.p, eager=args.e, journal=journal))
+                    )
+            finally:
+                journal.close()
             return 0
         else:
-            print("No action requested, add 'key' or 'plotnft'.")
+            print("No action requested, add 'key', 'keys' or 'plotnft'.")
             return 0
 
     else:
         parser.show_help()
         return 1
+
+
+def save_account(config, output):
+    if output and output.get("status") == "success":
+        print(f"Saved account to: {write_account_file(config.output_dir, output)}")
+
+
+def print_metrics():
+    # Where the time of a batch went, per stage and per RPC method
+    print(json.dumps({"metrics": metrics.summary()}, indent=4))
@@ -0,0 +1,62 @@
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+
+if TYPE_CHECKING:
+    from auto_chia_wallet.fake_wallet import FakeWallet
+
+
+async def get_coin_records_chunked(
+    node_client: FullNodeRpcClient, puzzle_hashes: List[bytes32], chunk_size: int, include_spent_coins: bool = False
+) -> List[CoinRecord]:
+    # One get_coin_records_by_puzzle_hashes call per chunk, keeps each request a manageable size for the node
+    coin_records: List[CoinRecord] = []
+    for start in range(0, len(puzzle_hashes), chunk_size):
+        coin_records.extend(
+            await node_client.get_coin_records_by_puzzle_hashes(
+                puzzle_hashes[start : start + chunk_size], include_spent_coins=include_spent_coins
+            )
+        )
+    return coin_records
+
+
+async def find_coin_records_bulk(
+    wallets: List["FakeWallet"],
+    chunk_size: int,
+    include_spent_coins: bool = False,
+    node_client: Optional[FullNodeRpcClient] = None,
+) -> Dict[str, List[CoinRecord]]:
+    """
+    Looks up the coin records of many wallets at once, over every puzzle hash each wallet has
+    derived, and returns them keyed by wallet fingerprint. Every wallet gets an entry, empty
+    for wallets that haven't been funded yet. Uses the first wallet's node client unless given one
+    """
+    owners: Dict[bytes32, str] = {}
+    for wallet in wallets:
+        for puzzle_hash in await wallet.get_puzzle_hashes():
+            owners[puzzle_hash] = wallet.get_fp()
+    records: Dict[str, List[CoinRecord]] = {wallet.get_fp(): [] for wallet in wallets}
+    if len(owners) == 0:
+        return records
+    for record in await get_coin_records_chunked(
+        node_client if node_client is not None else wallets[0].node_client,
+        list(owners.keys()),
+        chunk_size,
+        include_spent_coins,
+    ):
+        records[owners[record.coin.puzzle_hash]].append(record)
+    return records
+
+
+async def find_coins_bulk(
+    wallets: List["FakeWallet"], chunk_size: int, node_client: Optional[FullNodeRpcClient] = None
+) -> Dict[str, List[Coin]]:
+    # The unspent coins of each wallet, keyed by wallet fingerprint
+    records: Dict[str, List[CoinRecord]] = await find_coin_records_bulk(wallets, chunk_size, False, node_client)
+    return {
+        fingerprint: [record.coin for record in wallet_records if not record.spent]
+        for fingerprint, wallet_records in records.items()
+    }
@@ -0,0 +1,472 @@
+import asyncio
+import json
+from dataclasses import asdict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+
+from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.wallet.transaction_record import TransactionRecord
+
+from auto_chia_wallet.coins import find_coin_records_bulk
+from auto_chia_wallet.fake_wallet import FakeWallet, pool_state_template
+from auto_chia_wallet.feed_wallet import FeedWallet, FeedWalletManager
+from auto_chia_wallet.journal import CONFIRMED, FUNDED, FUNDING, KEY, SUBMITTED, Journal
+from auto_chia_wallet.key_pool import KeyBundle, KeyPool
+from auto_chia_wallet.keygen import generate_key_bundles
+from auto_chia_wallet.output import BatchOutput
+from auto_chia_wallet.rpc_clients import RpcClientPool
+from auto_chia_wallet.signing import BatchSigner
+
+
+async def generate_key(config):
+    wallet: FakeWallet = await FakeWallet.new_wallet(config)
+    print("Generating new key")
+    await wallet.generate_key()
+    print(f"Mnemonic: {await wallet.get_mnemonic()}")
+    print(f"First Address: {await wallet.get_first_address()}")
+    wallet.close()
+
+
+async def generate_keys(config, count: int):
+    # Fill the key pool ahead of time, committing as keys arrive so an interrupted run keeps its work
+    key_pool: KeyPool = KeyPool.open(config.key_pool_path)
+    try:
+        bundles: List[KeyBundle] = []
+        async for bundle in generate_key_bundles(count, config.key_workers):
+            bundles.append(bundle)
+            if len(bundles) >= 100:
+                key_pool.add(bundles)
+                bundles = []
+        key_pool.add(bundles)
+        print(f"Generated {count} keys into: {key_pool.path}, {key_pool.unclaimed_count()} unclaimed")
+    finally:
+        key_pool.close()
+
+
+async def split_feed_wallet(config, count: int, amount: Optional[int] = None):
+    # Pre-split the feed wallet so batches and serve mode can fund many wallets in parallel
+    if amount is None:
+        amount = config.feed_wallet.feed_amount + config.feed_wallet.fee
+    feed_wallet: FeedWallet = await FeedWallet.connect(asdict(config))
+    try:
+        await feed_wallet.split_coins(count, amount)
+        print(f"Feed wallet inventory now holds {len(feed_wallet.inventory.coins)} coins: {feed_wallet.inventory.path}")
+    finally:
+        feed_wallet.close()
+
+
+async def key_bundles(config, count: int, use_key_pool=False) -> AsyncIterator[KeyBundle]:
+    # Yields unused keys from the key pool first, then derives however many the pool was short
+    claimed: List[KeyBundle] = []
+    if use_key_pool:
+        key_pool: KeyPool = KeyPool.open(config.key_pool_path)
+        try:
+            claimed = key_pool.claim(count)
+        finally:
+            key_pool.close()
+        if len(claimed) < count:
+            print(f"Key pool only had {len(claimed)} unused keys, generating {count - len(claimed)}")
+    for bundle in claimed:
+        yield bundle
+    if count > len(claimed):
+        async for bundle in generate_key_bundles(count - len(claimed), config.key_workers):
+            yield bundle
+
+
+async def claim_or_new_wallet(
+    config, use_key_pool=False, node_client: Optional[FullNodeRpcClient] = None
+) -> FakeWallet:
+    if use_key_pool:
+        key_pool: KeyPool = KeyPool.open(config.key_pool_path)
+        try:
+            claimed: List[KeyBundle] = key_pool.claim(1)
+        finally:
+            key_pool.close()
+        if len(claimed) > 0:
+            return await FakeWallet.from_key_bundle(claimed[0], config, node_client)
+        print("Key pool is empty, generating a new key")
+    return await FakeWallet.new_wallet(config, node_client)
+
+
+async def generate_plotnft(
+    config,
+    use_feed_wallet=False,
+    use_key_pool=False,
+    client_pool: Optional[RpcClientPool] = None,
+    pool_template: Optional[Dict] = None,
+    feed_manager: Optional[FeedWalletManager] = None,
+    eager=False,
+    journal: Optional[Journal] = None,
+):
+    # Long running callers pass their own client pool, pool state template and feed manager to reuse across runs
+    node_client = await client_pool.get_full_node_client(asdict(config)) if client_pool is not None else None
+    wallet: FakeWallet = await claim_or_new_wallet(config, use_key_pool, node_client)
+    wallet.pool_template = pool_template
+    await journal_keys(journal, [wallet])
+    if use_feed_wallet and eager:
+        wallet_client = await client_pool.get_wallet_client(asdict(config)) if client_pool is not None else None
+        journal_funding(journal, [wallet])
+        try:
+            outputs: List[Dict] = await FakeWallet.create_plotnfts_eager([wallet], wallet_client)
+        finally:
+            wallet.close()
+        journal_submitted(journal, [wallet], outputs)
+        print(json.dumps(outputs[0], sort_keys=True, indent=4, separators=(",", ": ")))
+        return outputs[0]
+    elif use_feed_wallet:
+        wallet_client = await client_pool.get_wallet_client(asdict(config)) if client_pool is not None else None
+        journal_funding(journal, [wallet])
+        coins = await wallet.fund_from_feed_wallet(wallet_client, feed_manager, journal_sent(journal, [wallet]))
+    else:
+        print(f"Mnemonic: {await wallet.get_mnemonic()}")
+        print(f"Searching for coins, send funds to the below address:")
+        print(f"First Address: {await wallet.get_first_address()}")
+        coins = await wallet.wait_for_coins()
+        print(f"Found coin: {coins.copy().pop().name()}")
+    journal_funded(journal, [wallet], [coins])
+    output = await wallet.create_plotnft(coins)
+    wallet.close()
+    journal_submitted(journal, [wallet], [output])
+    return output
+
+
+async def wallet_groups(
+    config, count: int, use_key_pool: bool, node_client: FullNodeRpcClient, pool_template: Dict, group_size: int
+) -> AsyncIterator[List[FakeWallet]]:
+    # Wallets for count keys, yielded in groups of group_size as soon as the last key of each group is ready
+    group: List[FakeWallet] = []
+    async for bundle in key_bundles(config, count, use_key_pool):
+        wallet: FakeWallet = await FakeWallet.from_key_bundle(bundle, config, node_client)
+        wallet.pool_template = pool_template
+        group.append(wallet)
+        if len(group) == group_size:
+            yield group
+            group = []
+    if len(group) > 0:
+        yield group
+
+
+async def generate_plotnft_batch(
+    config,
+    count: int,
+    use_feed_wallet=False,
+    use_key_pool=False,
+    eager=False,
+    journal: Optional[Journal] = None,
+    output: Optional[BatchOutput] = None,
+) -> List[Dict]:
+    # Fund every wallet from one feed transaction, or wait for all of them to be funded manually,
+    # then build and push all the launcher spends together. Eager batches instead fund and push each
+    # group of max_batch_size on its own. The batch shares one client per RPC server, and the launcher
+    # spends are signed together in the signer's workers
+    client_pool = RpcClientPool()
+    node_client = await client_pool.get_full_node_client(asdict(config))
+    pool_template: Dict = await pool_state_template(asdict(config))
+    signer = BatchSigner(config.sign_workers, config.sign_executor)
+    wallets: List[FakeWallet] = []
+    pending: Optional[asyncio.Task] = None
+    try:
+        if use_feed_wallet and eager:
+            # Each feed transaction and its launchers have to fit in one spend bundle, so wallets go in groups of
+            # max_batch_size. Each group is funded and pushed, after the one before it, as soon as its keys are
+            # ready, while the key pool or key workers carry on with the next group
+            wallet_client = await client_pool.get_wallet_client(asdict(config))
+            outputs: List[Dict] = []
+
+            async def submit(group: List[FakeWallet], previous: Optional[asyncio.Task]):
+                if previous is not None:
+                    await previous
+                journal_funding(journal, group)
+                outputs.extend(
+                    await FakeWallet.create_plotnfts_eager(
+                        group, wallet_client, signer, stream_outputs(journal, output)
+                    )
+                )
+
+            async for group in wallet_groups(
+                config, count, use_key_pool, node_client, pool_template, config.feed_wallet.max_batch_size
+            ):
+                wallets += group
+                await journal_keys(journal, group)
+                if pending is not None and pending.done():
+                    # Raises if a group failed, rather than deriving keys nobody will use
+                    pending.result()
+                pending = asyncio.create_task(submit(group, pending))
+            if pending is not None:
+                await pending
+            return outputs
+
+        # One feed transaction pays the whole batch, or every address is printed for manual funding,
+        # so all the keys are ready before funding starts
+        async for group in wallet_groups(config, count, use_key_pool, node_client, pool_template, count):
+            wallets += group
+        await journal_keys(journal, wallets)
+        if use_feed_wallet:
+            wallet_client = await client_pool.get_wallet_client(asdict(config))
+            journal_funding(journal, wallets)
+            coins = await FakeWallet.fund_batch_from_feed_wallet(wallets, wallet_client, journal_sent(journal, wallets))
+        else:
+            print(f"Searching for coins, send funds to the below addresses:")
+            for wallet in wallets:
+                print(f"{wallet.get_fp()} First Address: {await wallet.get_first_address()}")
+            coins = await FakeWallet.wait_for_coins_for_wallets(wallets)
+        journal_funded(journal, wallets, coins)
+        return await FakeWallet.create_plotnfts(
+            wallets, coins, signer=signer, on_outputs=stream_outputs(journal, output)
+        )
+    finally:
+        if pending is not None and not pending.done():
+            # Cancelling the last group cancels the ones it's waiting on
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        for wallet in wallets:
+            wallet.close()
+        signer.close()
+        await client_pool.close()
+
+
+async def resume_plotnfts(
+    config,
+    journal: Journal,
+    use_feed_wallet=False,
+    output: Optional[BatchOutput] = None,
+    wait: float = 0,
+    include_submitted=False,
+) -> List[Dict]:
+    """
+    Finishes every wallet the journal has left unfinished. What's on chain decides what's left to
+    do, with one bulk coin lookup for all of them: an unspent coin still needs its launcher, a spent
+    one means the launcher went through, no coin at all still needs funding. Wallets waiting for
+    coins are waited for up to wait seconds, the rest stay in the journal for the next resume
+    """
+    incomplete: Dict[str, Dict] = journal.incomplete(include_submitted)
+    if len(incomplete) == 0:
+        print("Nothing to resume")
+        return []
+    print(f"Resuming {len(incomplete)} wallets")
+    client_pool = RpcClientPool()
+    node_client = await client_pool.get_full_node_client(asdict(config))
+    pool_template: Dict = await pool_state_template(asdict(config))
+    wallets: List[FakeWallet] = []
+    try:
+        for state in incomplete.values():
+            wallet: FakeWallet = await FakeWallet.from_mnemonic(state["mnemonic"], config, node_client)
+            wallet.pool_template = pool_template
+            wallets.append(wallet)
+        records: Dict[str, List[CoinRecord]] = await find_coin_records_bulk(
+            wallets, config.full_node.coin_query_chunk_size, include_spent_coins=True
+        )
+
+        outputs: List[Dict] = []
+        ready: List[FakeWallet] = []
+        coins: List[Set[Coin]] = []
+        unfunded: List[FakeWallet] = []
+        paid: List[FakeWallet] = []
+        for wallet in wallets:
+            state: Dict = incomplete[wallet.get_fp()]
+            wallet_records: List[CoinRecord] = records[wallet.get_fp()]
+            unspent: List[Coin] = [record.coin for record in wallet_records if not record.spent]
+            if len(unspent) > 0:
+                # Also covers submitted launchers that were dropped, pushing the same spend again is harmless
+                ready.append(wallet)
+                coins.append({unspent[0]})
+            elif len(wallet_records) > 0 and state["stage"] == SUBMITTED:
+                # The run that pushed its launcher already wrote its account
+                journal.record(wallet.get_fp(), CONFIRMED)
+            elif len(wallet_records) > 0:
+                # Rebuilding from the spent coin gives back the same launcher id and account data
+                spend_bundle, data = await wallet.build_plotnft({wallet_records[0].coin})
+                journal.record(wallet.get_fp(), CONFIRMED, launcher_id=data["launcher_id"])
+                outputs.append({"status": "success", "data": data})
+                write_outputs(output, outputs[-1:])
+            elif state["stage"] == KEY:
+                unfunded.append(wallet)
+            elif state["stage"] == FUNDING and state.get("feed_tx_id"):
+                paid.append(wallet)
+            elif state["stage"] == FUNDING:
+                # Interrupted around the send, or an eager spend bundle that never made it on chain
+                print(
+                    f"{wallet.get_fp()} may have been sent a feed payment that was never journaled, check the feed "
+                    f"wallet and if it wasn't paid fund {await wallet.get_first_address()} and resume again"
+                )
+            else:
+                print(
+                    f"{wallet.get_fp()} is waiting on a transaction that isn't on chain yet, resume after the next block"
+                )
+
+        if len(paid) + len(unfunded) > 0 and use_feed_wallet:
+            # A feed transaction the wallet knows of is waited for, only wallets it never paid are funded again
+            wallet_client = await client_pool.get_wallet_client(asdict(config))
+            feed_wallet: FeedWallet = await FeedWallet.connect(asdict(config), wallet_client)
+            try:
+                known: Set[bytes32] = await feed_wallet.known_transactions(
+                    {bytes32.fromhex(incomplete[wallet.get_fp()]["feed_tx_id"]) for wallet in paid}
+                )
+            finally:
+                feed_wallet.close()
+            to_fund: List[FakeWallet] = unfunded + [
+                wallet for wallet in paid if bytes32.fromhex(incomplete[wallet.get_fp()]["feed_tx_id"]) not in known
+            ]
+            paid = [wallet for wallet in paid if bytes32.fromhex(incomplete[wallet.get_fp()]["feed_tx_id"]) in known]
+            unfunded = []
+            if len(to_fund) > 0:
+                journal_funding(journal, to_fund)
+                funded_coins = await FakeWallet.fund_batch_from_feed_wallet(
+                    to_fund, wallet_client, journal_sent(journal, to_fund)
+                )
+                journal_funded(journal, to_fund, funded_coins)
+                ready += to_fund
+                coins += funded_coins
+        if len(paid) + len(unfunded) > 0:
+            if len(unfunded) > 0:
+                print(f"Send funds to the below addresses:")
+            for wallet in unfunded:
+                print(f"{wallet.get_fp()} First Address: {await wallet.get_first_address()}")
+            for wallet in paid:
+                print(f"{wallet.get_fp()} is waiting on feed transaction {incomplete[wallet.get_fp()]['feed_tx_id']}")
+            waiting: List[FakeWallet] = []
+            if wait > 0:
+                print(f"Searching for coins for up to {wait} seconds")
+                found = await FakeWallet.wait_for_coins_for_wallets(
+                    paid + unfunded, {**asdict(config.wait), "timeout": wait}, return_exceptions=True
+                )
+                for wallet, wallet_coins in zip(paid + unfunded, found):
+                    if isinstance(wallet_coins, BaseException):
+                        waiting.append(wallet)
+                        continue
+                    journal_funded(journal, [wallet], [wallet_coins])
+                    ready.append(wallet)
+                    coins.append(wallet_coins)
+            else:
+                waiting = paid + unfunded
+            if len(waiting) > 0:
+                print(f"{len(waiting)} wallets have no coins yet, they're left for the next resume")
+
+        if len(ready) > 0:
+            signer = BatchSigner(config.sign_workers, config.sign_executor)
+            try:
+                outputs += await FakeWallet.create_plotnfts(
+                    ready, coins, signer=signer, on_outputs=stream_outputs(journal, output)
+                )
+            finally:
+                signer.close()
+        return outputs
+    finally:
+        for wallet in wallets:
+            wallet.close()
+        await client_pool.close()
+
+
+def write_outputs(output: Optional[BatchOutput], outputs: List[Dict]):
+    # Batches stream to their output file, without one every account is printed
+    if output is not None:
+        output.write(outputs)
+    else:
+        for json_output in outputs:
+            print(json.dumps(json_output, sort_keys=True, indent=4, separators=(",", ": ")))
+
+
+def stream_outputs(
+    journal: Optional[Journal], output: Optional[BatchOutput]
+) -> Callable[[List[FakeWallet], List[Dict]], None]:
+    # For FakeWallet.create_plotnfts, journals and writes each account as soon as its launcher is pushed or has failed
+    def write(wallets: List[FakeWallet], outputs: List[Dict]):
+        journal_submitted(journal, wallets, outputs)
+        write_outputs(output, outputs)
+
+    return write
+
+
+async def journal_keys(journal: Optional[Journal], wallets: List[FakeWallet]):
+    if journal is not None:
+        journal.record_many(
+            [
+                (
+                    wallet.get_fp(),
+                    KEY,
+                    {"mnemonic": await wallet.get_mnemonic(), "first_address": await wallet.get_first_address()},
+                )
+                for wallet in wallets
+            ]
+        )
+
+
+def journal_funding(journal: Optional[Journal], wallets: List[FakeWallet]):
+    # Clears the feed transaction of an earlier attempt, journal_sent records the new one once it's out
+    if journal is not None:
+        journal.record_many([(wallet.get_fp(), FUNDING, {"feed_tx_id": None}) for wallet in wallets])
+
+
+def journal_sent(
+    journal: Optional[Journal], wallets: List[FakeWallet]
+) -> Optional[Callable[[TransactionRecord], None]]:
+    # For the on_sent of feed sends, so resume can look up the very transaction that paid each wallet
+    if journal is None:
+        return None
+
+    def sent(transaction_record: TransactionRecord):
+        journal.record_many(
+            [(wallet.get_fp(), FUNDING, {"feed_tx_id": transaction_record.name.hex()}) for wallet in wallets]
+        )
+
+    return sent
+
+
+def journal_funded(journal: Optional[Journal], wallets: List[FakeWallet], coins: List[Set[Coin]]):
+    if journal is not None:
+        journal.record_many(
+            [
+                (wallet.get_fp(), FUNDED, {"coin_ids": [coin.name().hex() for coin in wallet_coins]})
+                for wallet, wallet_coins in zip(wallets, coins)
+            ]
+        )
+
+
+def journal_submitted(journal: Optional[Journal], wallets: List[FakeWallet], outputs: List[Dict]):
+    if journal is not None:
+        journal.record_many(
+            [
+                (wallet.get_fp(), SUBMITTED, {"launcher_id": output["data"]["launcher_id"]})
+                for wallet, output in zip(wallets, outputs)
+                if output["status"] == "success"
+            ]
+        )
+
+
+async def generate_plotnft_from_mnemonic(config, use_feed_wallet=False):
+    mnemonic = await load_key()
+    if len(mnemonic) == 0:
+        return {}
+    wallet: FakeWallet = await FakeWallet.from_mnemonic(mnemonic, config)
+    if use_feed_wallet:
+        coins = await wallet.fund_from_feed_wallet()
+    else:
+        print(f"Mnemonic: {await wallet.get_mnemonic()}")
+        print(f"Searching for coins, send funds to the below address:")
+        print(f"First Address: {await wallet.get_first_address()}")
+        coins = await wallet.wait_for_coins()
+        print(f"Found coin: {coins.copy().pop().name()}")
+    output = await wallet.create_plotnft(coins)
+    wallet.close()
+    return output
+
+
+async def load_key() -> str:
+    valid = False
+    mnemonic = ""
+    while not valid:
+        user_input = input("Please input your 24 words seperated by a space, or 'q' to quit")
+        if user_input == "q":
+            mnemonic = ""
+            valid = True
+        else:
+            words = user_input.split(" ")
+            if len(words) == 24:
+                mnemonic = user_input
+                valid = True
+            else:
+                print(f"Expected 24 words, got {len(words)}, try again or type 'q' to quit")
+                valid = False
+    return mnemonic
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
 from shutil import copyfile
 from typing import Dict, Any
-from chia.pools.pool_wallet_info import PoolSingletonState, SELF_POOLING
 
 import auto_chia_wallet.defaults as resources
 
@@ -9,12 +9,14 @@ import os
 import appdirs
 import importlib
 import importlib.resources
-import desert
-import marshmallow
-import yaml
 
 
 def load_config():
+    # desert and marshmallow are only needed to read the config, 'autowallet config' and 'version' skip them
+    import desert
+    import marshmallow
+    import yaml
+
     schema = desert.schema(Config)
     cf_path = get_config_path()
     try:
@@ -27,6 +29,10 @@ def load_config():
 
 
 def load_config_from_file(file):
+    import desert
+    import marshmallow
+    import yaml
+
     schema = desert.schema(Config)
     try:
         with file:
@@ -37,6 +43,11 @@ def load_config_from_file(file):
         raise Exception(f"Config file at: '{file.name}' is malformed") from e
 
 
+def load_default_config():
+    # The packaged config.yaml, for commands that don't need the user's nodes such as 'autowallet bench'
+    return load_config_from_file(importlib.resources.open_text(resources, "config.yaml"))
+
+
 def get_config_path():
     return appdirs.user_config_dir("auto_chia_wallet") + "/config.yaml"
 
@@ -85,6 +96,7 @@ class SSLConfig:
 class FullNodeInfo:
     hostname: str = "localhost"
     full_node_rpc_port: int = 8555
+    coin_query_chunk_size: int = 500
 
 
 @dataclass
@@ -95,12 +107,46 @@ class FeedWalletInfo:
     fee: int = 0
     hostname: str = "localhost"
     wallet_rpc_port: int = 9256
+    batch_window: float = 1.0
+    max_batch_size: int = 100
+    inventory_path: str = ""
+
+
+class PoolSingletonState(IntEnum):
+    # Mirrors chia.pools.pool_wallet_info.PoolSingletonState, so loading the config doesn't import chia
+    SELF_POOLING = 1
+    LEAVING_POOL = 2
+    FARMING_TO_POOL = 3
+
+
+SELF_POOLING = PoolSingletonState.SELF_POOLING
 
 
 @dataclass
 class PoolInfo:
     state: PoolSingletonState = SELF_POOLING
     url: str = ""
+    cache_ttl: float = 3600.0
+    cache_max_stale: float = 86400.0
+    cache_path: str = ""
+
+
+@dataclass
+class WaitInfo:
+    interval: float = 5.0
+    max_interval: float = 30.0
+    backoff: float = 1.5
+    timeout: float = 0.0
+
+
+@dataclass
+class ServeInfo:
+    hostname: str = "127.0.0.1"
+    port: int = 8931
+    workers: int = 4
+    queue_size: int = 100
+    max_jobs: int = 10000
+    use_key_pool: bool = False
 
 
 # Used to deserialize config.yaml
@@ -114,3 +160,12 @@ class Config:
     root_path: str = "~/.chia/mainnet/config/ssl/"
     prefix: str = "xch"
     output_dir: str = "/"
+    output_format: str = "ndjson"
+    output_fsync_every: int = 100
+    key_workers: int = 0
+    sign_workers: int = 0
+    sign_executor: str = "process"
+    key_pool_path: str = ""
+    journal_path: str = ""
+    wait: WaitInfo = field(default_factory=WaitInfo)
+    serve: ServeInfo = field(default_factory=ServeInfo)
@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional
+
+from blspy import G1Element, PrivateKey
+from chia.types.blockchain_format.program import Program
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.util.ints import uint32
+from chia.wallet.derive_keys import master_sk_to_farmer_sk, master_sk_to_singleton_owner_sk, master_sk_to_wallet_sk
+from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import (
+    DEFAULT_HIDDEN_PUZZLE_HASH,
+    calculate_synthetic_secret_key,
+    puzzle_for_pk,
+)
+
+# Same number of wallet keys the chia wallet derives up front
+MAX_DERIVATION_INDEX = 20
+
+
+class DerivationCache:
+    """
+    Derives a wallet's keys, puzzles and puzzle hashes the first time an index is asked
+    for and memoizes them, so each index costs one derivation for the life of the wallet
+    """
+
+    master_sk: PrivateKey
+
+    def __init__(self, master_sk: PrivateKey, max_index: int = MAX_DERIVATION_INDEX):
+        self.master_sk = master_sk
+        self.max_index = max_index
+        self._wallet_sks: Dict[int, PrivateKey] = {}
+        self._wallet_pks: Dict[int, G1Element] = {}
+        self._synthetic_sks: Dict[int, PrivateKey] = {}
+        self._puzzles: Dict[int, Program] = {}
+        self._puzzle_hashes: Dict[int, bytes32] = {}
+        # Filled as puzzle hashes are derived, searched further on a miss
+        self._indexes: Dict[bytes32, int] = {}
+        self._owner_sk: Optional[PrivateKey] = None
+        self._farmer_pk: Optional[G1Element] = None
+
+    def wallet_sk(self, index: int) -> PrivateKey:
+        if index not in self._wallet_sks:
+            self._wallet_sks[index] = master_sk_to_wallet_sk(self.master_sk, uint32(index))
+        return self._wallet_sks[index]
+
+    def wallet_pk(self, index: int) -> G1Element:
+        if index not in self._wallet_pks:
+            self._wallet_pks[index] = self.wallet_sk(index).get_g1()
+        return self._wallet_pks[index]
+
+    def synthetic_sk(self, index: int) -> PrivateKey:
+        # What the standard puzzle's AGG_SIG_ME is signed with
+        if index not in self._synthetic_sks:
+            self._synthetic_sks[index] = calculate_synthetic_secret_key(
+                self.wallet_sk(index), DEFAULT_HIDDEN_PUZZLE_HASH
+            )
+        return self._synthetic_sks[index]
+
+    def synthetic_sks(self) -> List[PrivateKey]:
+        # Every synthetic key derived so far, the ones a spend of this wallet's coins can need
+        return list(self._synthetic_sks.values())
+
+    def puzzle(self, index: int) -> Program:
+        if index not in self._puzzles:
+            self._puzzles[index] = puzzle_for_pk(self.wallet_pk(index))
+        return self._puzzles[index]
+
+    def puzzle_hash(self, index: int) -> bytes32:
+        if index not in self._puzzle_hashes:
+            puzzle_hash: bytes32 = self.puzzle(index).get_tree_hash()
+            self._puzzle_hashes[index] = puzzle_hash
+            self._indexes[puzzle_hash] = index
+        return self._puzzle_hashes[index]
+
+    def puzzle_hashes(self) -> List[bytes32]:
+        # Every puzzle hash derived so far, in index order, the addresses this wallet's coins can be at
+        return [self._puzzle_hashes[index] for index in sorted(self._puzzle_hashes)]
+
+    def remember_puzzle_hash(self, index: int, puzzle_hash: bytes32):
+        # For puzzle hashes that were already derived elsewhere, such as in a key generation worker
+        self._puzzle_hashes[index] = puzzle_hash
+        self._indexes[puzzle_hash] = index
+
+    def remember_farmer_pk(self, farmer_pk: G1Element):
+        self._farmer_pk = farmer_pk
+
+    def index_for_puzzle_hash(self, puzzle_hash: bytes32) -> Optional[int]:
+        if puzzle_hash in self._indexes:
+            return self._indexes[puzzle_hash]
+        for index in range(0, self.max_index):
+            if self.puzzle_hash(index) == puzzle_hash:
+                return index
+        return None
+
+    def owner_sk(self) -> PrivateKey:
+        if self._owner_sk is None:
+            self._owner_sk = master_sk_to_singleton_owner_sk(self.master_sk, uint32(0))
+        return self._owner_sk
+
+    def farmer_pk(self) -> G1Element:
+        if self._farmer_pk is None:
+            self._farmer_pk = master_sk_to_farmer_sk(self.master_sk).get_g1()
+        return self._farmer_pk
+
+    def clear(self):
+        self._wallet_sks.clear()
+        self._wallet_pks.clear()
+        self._synthetic_sks.clear()
+        self._puzzles.clear()
+        self._puzzle_hashes.clear()
+        self._indexes.clear()
+        self._owner_sk = None
+        self._farmer_pk = None
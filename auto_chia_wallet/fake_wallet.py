@@ -1,24 +1,17 @@
+import asyncio
 import json
 import sys
 import traceback
-from typing import Optional, Set, Tuple, List, Dict
-from pathlib import Path
+from typing import Callable, Optional, Set, Tuple, List, Dict, Union
 from dataclasses import asdict
 
-from chia.cmds.plotnft_funcs import create_pool_args
-from chia.consensus.coinbase import create_puzzlehash_for_pk
 from chia.consensus.constants import ConsensusConstants
 from chia.consensus.default_constants import DEFAULT_CONSTANTS
-from chia.pools.pool_puzzles import (
-    create_waiting_room_inner_puzzle,
-    create_full_puzzle,
-    SINGLETON_LAUNCHER,
-    create_pooling_inner_puzzle,
-    launcher_id_to_p2_puzzle_hash,
-)
+from chia.pools.pool_puzzles import SINGLETON_LAUNCHER, SINGLETON_LAUNCHER_HASH
 from chia.pools.pool_wallet import PoolWallet
 from chia.pools.pool_wallet_info import FARMING_TO_POOL, initial_pool_state_from_dict
 from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.rpc.wallet_rpc_client import WalletRpcClient
 from chia.types.announcement import Announcement
 from chia.types.blockchain_format.coin import Coin
 from chia.types.blockchain_format.program import SerializedProgram, Program
@@ -40,11 +33,6 @@ from chia.util.keychain import (
     bytes_to_mnemonic,
     mnemonic_to_seed,
 )
-from chia.wallet.derive_keys import (
-    master_sk_to_wallet_sk,
-    master_sk_to_singleton_owner_sk,
-    master_sk_to_farmer_sk,
-)
 from chia.wallet.puzzles.puzzle_utils import (
     make_assert_coin_announcement,
     make_create_coin_announcement,
@@ -55,17 +43,22 @@ from chia.wallet.puzzles.puzzle_utils import (
     make_assert_absolute_seconds_exceeds_condition,
     make_create_puzzle_announcement,
 )
-from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import (
-    puzzle_for_pk,
-    DEFAULT_HIDDEN_PUZZLE_HASH,
-    solution_for_conditions,
-    calculate_synthetic_secret_key,
-)
+from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import solution_for_conditions
 from chia.wallet.secret_key_store import SecretKeyStore
 
 
 # will replace this when the chia provided through pip is updated to allow importing the class
-from auto_chia_wallet.feed_wallet import FeedWallet
+from auto_chia_wallet.derivation import DerivationCache
+from auto_chia_wallet.feed_wallet import FeedWallet, FeedWalletManager
+from auto_chia_wallet.key_pool import KeyBundle
+from auto_chia_wallet.metrics import metrics
+from auto_chia_wallet.pool_info import get_pool_info_cache
+from auto_chia_wallet.puzzles import PoolPuzzleTemplate, get_pool_puzzle_template
+from auto_chia_wallet.rpc_clients import create_full_node_client
+from auto_chia_wallet.signing import BatchSigner, SigningJob, agg_sig_me_additional_data
+from auto_chia_wallet.spend_bundles import push_spend_bundles
+from auto_chia_wallet.validation import check_spend_bundle
+from auto_chia_wallet.watcher import BlockWatcher
 
 
 class AmountWithPuzzlehash(TypedDict):
@@ -73,61 +66,92 @@ class AmountWithPuzzlehash(TypedDict):
     puzzlehash: bytes32
 
 
+_constants_cache: Dict[Tuple, ConsensusConstants] = {}
+
+
+def get_constants(overrides: Dict) -> ConsensusConstants:
+    # DEFAULT_CONSTANTS.replace builds a new dataclass each call, the overrides are the same for every wallet
+    key = tuple(sorted(overrides.items()))
+    if key not in _constants_cache:
+        _constants_cache[key] = DEFAULT_CONSTANTS.replace(**overrides)
+    return _constants_cache[key]
+
+
+async def pool_state_template(config: Dict) -> Dict:
+    """
+    The parts of the initial pool state that are the same for every wallet, the owner's
+    keys are filled in per wallet by FakeWallet.init_pool_state. The pool's info comes from the
+    process wide PoolInfoCache, so this is cheap to call again for a template that's up to date
+    """
+    pool_url: Optional[str] = None
+    relative_lock_height = uint32(0)
+    target_puzzle_hash = None
+    if FARMING_TO_POOL == config["pool_info"]["state"]:
+        pool_url = config["pool_info"]["url"]
+        json_dict = await get_pool_info_cache(config["pool_info"]).get(pool_url)
+        relative_lock_height = json_dict["relative_lock_height"]
+        target_puzzle_hash = bytes32(hexstr_to_bytes(json_dict["target_puzzle_hash"]))
+    return {
+        "target_puzzle_hash": target_puzzle_hash.hex() if target_puzzle_hash else None,
+        "relative_lock_height": relative_lock_height,
+        "pool_url": pool_url,
+        "state": config["pool_info"]["state"].name,
+    }
+
+
 class FakeWallet(PoolWallet):
     key: PrivateKey
     node_client: FullNodeRpcClient
+    owns_node_client: bool
     constants: ConsensusConstants
     config: Dict
-    secret_key_store = SecretKeyStore()
-    puz_hashes: Dict = {}
+    secret_key_store: SecretKeyStore
+    derivations: Optional[DerivationCache]
+    pool_template: Optional[Dict]
     mnemonic: str
 
+    def __init__(self):
+        # Signing material is per wallet, so concurrent wallets in one process never share keys
+        self.secret_key_store = SecretKeyStore()
+        self.derivations = None
+        self.pool_template = None
+
     @staticmethod
-    async def new_wallet(config):
+    async def new_wallet(config, node_client: Optional[FullNodeRpcClient] = None):
         wallet: FakeWallet = FakeWallet()
         wallet.config = asdict(config)
-        wallet.constants = DEFAULT_CONSTANTS.replace(**wallet.config["overrides"])
-        await wallet.generate_key()
-        wallet.node_client = await FullNodeRpcClient.create(
-            wallet.config["full_node"]["hostname"],
-            wallet.config["full_node"]["full_node_rpc_port"],
-            wallet.config["root_path"],
-            {
-                "private_ssl_ca": {
-                    "crt": Path(wallet.config["ssl"]["private_ssl_ca"]["crt"]),
-                    "key": Path(wallet.config["ssl"]["private_ssl_ca"]["key"]),
-                },
-                "daemon_ssl": {
-                    "private_crt": Path(wallet.config["ssl"]["daemon_ssl"]["private_crt"]),
-                    "private_key": Path(wallet.config["ssl"]["daemon_ssl"]["private_key"]),
-                },
-            },
-        )
+        wallet.constants = get_constants(wallet.config["overrides"])
+        with metrics.timer("key_derivation"):
+            await wallet.generate_key()
+        await wallet.connect(node_client)
         return wallet
 
     @staticmethod
-    async def from_mnemonic(mnemonic, config):
+    async def from_mnemonic(mnemonic, config, node_client: Optional[FullNodeRpcClient] = None):
         wallet: FakeWallet = FakeWallet()
         wallet.config = asdict(config)
-        wallet.constants = DEFAULT_CONSTANTS.replace(**wallet.config["overrides"])
-        await wallet.load_mnemonic(mnemonic)
-        wallet.node_client = await FullNodeRpcClient.create(
-            wallet.config["full_node"]["hostname"],
-            wallet.config["full_node"]["full_node_rpc_port"],
-            wallet.config["root_path"],
-            {
-                "private_ssl_ca": {
-                    "crt": Path(wallet.config["ssl"]["private_ssl_ca"]["crt"]),
-                    "key": Path(wallet.config["ssl"]["private_ssl_ca"]["key"]),
-                },
-                "daemon_ssl": {
-                    "private_crt": Path(wallet.config["ssl"]["daemon_ssl"]["private_crt"]),
-                    "private_key": Path(wallet.config["ssl"]["daemon_ssl"]["private_key"]),
-                },
-            },
-        )
+        wallet.constants = get_constants(wallet.config["overrides"])
+        with metrics.timer("key_derivation"):
+            await wallet.load_mnemonic(mnemonic)
+        await wallet.connect(node_client)
+        return wallet
+
+    @staticmethod
+    async def from_key_bundle(bundle: KeyBundle, config, node_client: Optional[FullNodeRpcClient] = None):
+        # Skips seed derivation entirely, the bundle was derived ahead of time
+        wallet: FakeWallet = FakeWallet()
+        wallet.config = asdict(config)
+        wallet.constants = get_constants(wallet.config["overrides"])
+        with metrics.timer("key_derivation"):
+            await wallet.load_key_bundle(bundle)
+        await wallet.connect(node_client)
         return wallet
 
+    async def connect(self, node_client: Optional[FullNodeRpcClient] = None):
+        # A client shared from an RpcClientPool is left open when this wallet closes
+        self.owns_node_client = node_client is None
+        self.node_client = node_client if node_client is not None else await create_full_node_client(self.config)
+
     @staticmethod
     async def get_coin_for_nft(transaction_record) -> Set[Coin]:
         to_hash: bytes32 = transaction_record.to_puzzle_hash
@@ -142,26 +166,25 @@ class FakeWallet(PoolWallet):
         assert len(coins) == 1
         return coins
 
+    @staticmethod
+    async def get_coins_for_nfts(transaction_record, puzzle_hashes: List[bytes32]) -> Dict[bytes32, Set[Coin]]:
+        # Split the additions of a multi output feed transaction back out to each receiving wallet
+        coins: Dict[bytes32, Set[Coin]] = {puzzle_hash: set() for puzzle_hash in puzzle_hashes}
+        for addition in transaction_record.additions:
+            if addition.puzzle_hash in coins:
+                coins[addition.puzzle_hash].add(addition)
+        for puzzle_hash, wallet_coins in coins.items():
+            if len(wallet_coins) != 1:
+                raise ValueError(f"Expected one feed coin for {puzzle_hash.hex()}, found {len(wallet_coins)}")
+        return coins
+
     async def init_pool_state(self):
-        owner_sk: PrivateKey = master_sk_to_singleton_owner_sk(self.key, uint32(0))
-        wallet_sk = master_sk_to_wallet_sk(self.key, uint32(1))
-        owner_puzzle_hash = create_puzzlehash_for_pk(wallet_sk.get_g1())
-        pool_url: Optional[str] = None
-        relative_lock_height = uint32(0)
-        target_puzzle_hash = None
-        if FARMING_TO_POOL == self.config["pool_info"]["state"]:
-            pool_url = self.config["pool_info"]["url"]
-            json_dict = await create_pool_args(pool_url)
-            relative_lock_height = json_dict["relative_lock_height"]
-            target_puzzle_hash = bytes32(hexstr_to_bytes(json_dict["target_puzzle_hash"]))
+        owner_sk: PrivateKey = self.derivations.owner_sk()
+        owner_puzzle_hash = await self.get_payout_address()
+        if self.pool_template is None:
+            self.pool_template = await pool_state_template(self.config)
         owner_pk: G1Element = owner_sk.get_g1()
-        initial_target_state_dict = {
-            "target_puzzle_hash": target_puzzle_hash.hex() if target_puzzle_hash else None,
-            "relative_lock_height": relative_lock_height,
-            "pool_url": pool_url,
-            "state": self.config["pool_info"]["state"].name,
-        }
-        initial_target_state = initial_pool_state_from_dict(initial_target_state_dict, owner_pk, owner_puzzle_hash)
+        initial_target_state = initial_pool_state_from_dict(dict(self.pool_template), owner_pk, owner_puzzle_hash)
         PoolWallet._verify_initial_target_state(initial_target_state)
         return initial_target_state
 
@@ -172,25 +195,29 @@ class FakeWallet(PoolWallet):
         fingerprint: str = str(self.key.get_g1().get_fingerprint())
         return fingerprint
 
-    async def get_first_address(self) -> bytes32:
-        init_sk = master_sk_to_wallet_sk(self.key, uint32(0))
-        first_address_hex = create_puzzlehash_for_pk(init_sk.get_g1())
-        first_address = encode_puzzle_hash(first_address_hex, self.config["prefix"])
+    async def get_first_address(self) -> str:
+        first_address = encode_puzzle_hash(await self.get_first_puzzle_hash(), self.config["prefix"])
         return first_address
 
+    async def get_first_puzzle_hash(self) -> bytes32:
+        return self.derivations.puzzle_hash(0)
+
+    async def get_puzzle_hashes(self) -> List[bytes32]:
+        # The first puzzle hash and every other one derived so far, what bulk coin lookups search
+        self.derivations.puzzle_hash(0)
+        return self.derivations.puzzle_hashes()
+
     async def get_payout_address(self) -> bytes:
-        wallet_sk = master_sk_to_wallet_sk(self.key, uint32(1))
-        owner_puzzle_hash = create_puzzlehash_for_pk(wallet_sk.get_g1())
+        owner_puzzle_hash = self.derivations.puzzle_hash(1)
         return owner_puzzle_hash
 
     async def get_p2_delay_info(self) -> Tuple[bytes, uint64]:
-        sk = master_sk_to_wallet_sk(self.key, uint32(2))
-        p2_singleton_delayed_ph = create_puzzlehash_for_pk(sk.get_g1())
+        p2_singleton_delayed_ph = self.derivations.puzzle_hash(2)
         p2_singleton_delay_time = uint64(604800)
         return p2_singleton_delayed_ph, p2_singleton_delay_time
 
     async def get_farmer_pub_key(self) -> bytes32:
-        return master_sk_to_farmer_sk(self.key).get_g1()
+        return self.derivations.farmer_pk()
 
     async def generate_key(self):
         # Generate keys and extract farmer data needed to send initial funds
@@ -200,11 +227,16 @@ class FakeWallet(PoolWallet):
         self.mnemonic = mnemonic
         seed: bytes = mnemonic_to_seed(self.mnemonic, "")
         self.key: PrivateKey = AugSchemeMPL.key_gen(seed)
-        for i in range(0, 20):
-            wallet_sk = master_sk_to_wallet_sk(self.key, (uint32(i)))
-            puzzle = puzzle_for_pk(wallet_sk.get_g1())
-            puz_hash = puzzle.get_tree_hash()
-            self.puz_hashes[puz_hash] = (wallet_sk.get_g1(), wallet_sk)
+        # Wallet keys and puzzle hashes are derived on first use
+        self.derivations = DerivationCache(self.key)
+
+    async def load_key_bundle(self, bundle: KeyBundle):
+        self.mnemonic = bundle.mnemonic
+        self.key: PrivateKey = PrivateKey.from_bytes(bundle.master_sk)
+        self.derivations = DerivationCache(self.key)
+        self.derivations.remember_puzzle_hash(0, bytes32(bundle.first_puzzle_hash))
+        self.derivations.remember_puzzle_hash(1, bytes32(bundle.payout_puzzle_hash))
+        self.derivations.remember_farmer_pk(G1Element.from_bytes(bundle.farmer_pk))
 
     async def create_launcher_spend(
         self,
@@ -213,53 +245,43 @@ class FakeWallet(PoolWallet):
         delay_time: uint64,
         delay_ph: bytes32,
         change_address: bytes32,
+        sign: bool = True,
     ) -> Tuple[SpendBundle, bytes32, bytes32]:
         launcher_parent: Coin = coins.copy().pop()
         genesis_launcher_puz: Program = SINGLETON_LAUNCHER
         amount = uint64(1)
-        launcher_coin: Coin = Coin(launcher_parent.name(), genesis_launcher_puz.get_tree_hash(), amount)
-        escaping_inner_puzzle: Program = create_waiting_room_inner_puzzle(
+        launcher_coin: Coin = Coin(launcher_parent.name(), SINGLETON_LAUNCHER_HASH, amount)
+        # Only the singleton's puzzle hash goes in the launcher spend, so the puzzles are never built
+        puzzles: PoolPuzzleTemplate = get_pool_puzzle_template(self.constants)
+        inner_puzzle_hash: bytes32 = puzzles.inner_puzzle_hash(
+            initial_target_state.state,
             initial_target_state.target_puzzle_hash,
             initial_target_state.relative_lock_height,
             initial_target_state.owner_pubkey,
-            launcher_coin.name(),
-            bytes32(hexstr_to_bytes(self.constants.GENESIS_CHALLENGE))
-            if isinstance(self.constants.GENESIS_CHALLENGE, str)
-            else bytes32(self.constants.GENESIS_CHALLENGE),
-            delay_time,
-            delay_ph,
-        )
-        self_pooling_inner_puzzle: Program = create_pooling_inner_puzzle(
-            initial_target_state.target_puzzle_hash,
-            escaping_inner_puzzle.get_tree_hash(),
-            initial_target_state.owner_pubkey,
-            launcher_coin.name(),
-            bytes32(hexstr_to_bytes(self.constants.GENESIS_CHALLENGE))
-            if isinstance(self.constants.GENESIS_CHALLENGE, str)
-            else bytes32(self.constants.GENESIS_CHALLENGE),
-            delay_time,
-            delay_ph,
+            puzzles.p2_singleton_puzzle_hash(launcher_coin.name(), delay_time, delay_ph),
         )
-        if initial_target_state.state == 1:
-            puzzle = escaping_inner_puzzle
-        elif initial_target_state.state == 3:
-            puzzle = self_pooling_inner_puzzle
-        else:
-            raise ValueError("Invalid initial state")
-        full_pooling_puzzle: Program = create_full_puzzle(puzzle, launcher_id=launcher_coin.name())
-        puzzle_hash: bytes32 = full_pooling_puzzle.get_tree_hash()
+        puzzle_hash: bytes32 = puzzles.full_puzzle_hash(inner_puzzle_hash, launcher_coin.name())
         pool_state_bytes = Program.to([("p", bytes(initial_target_state)), ("t", delay_time), ("h", delay_ph)])
         announcement_set: Set[bytes32] = set()
         announcement_message = Program.to([puzzle_hash, amount, pool_state_bytes]).get_tree_hash()
         announcement_set.add(Announcement(launcher_coin.name(), announcement_message).name())
-        # Generate Signed SpendBundle
-        create_launcher_spend_bundle: Optional[SpendBundle] = await self.generate_signed_spend_bundle(
-            amount,
-            genesis_launcher_puz.get_tree_hash(),
-            change_address,
-            coins,
-            announcement_set,
-        )
+        if sign:
+            # Generate Signed SpendBundle
+            create_launcher_spend_bundle: Optional[SpendBundle] = await self.generate_signed_spend_bundle(
+                amount,
+                SINGLETON_LAUNCHER_HASH,
+                change_address,
+                coins,
+                announcement_set,
+            )
+        else:
+            # Signed later with the rest of its batch, see signing_job
+            create_launcher_spend_bundle = SpendBundle(
+                await self._generate_unsigned_transaction(
+                    amount, SINGLETON_LAUNCHER_HASH, uint64(0), None, coins, None, announcement_set, change_address
+                ),
+                G2Element(),
+            )
         assert create_launcher_spend_bundle is not None
         genesis_launcher_solution: Program = Program.to([puzzle_hash, amount, pool_state_bytes])
         launcher_cs: CoinSpend = CoinSpend(
@@ -290,14 +312,13 @@ class FakeWallet(PoolWallet):
             change_address,
         )
         assert len(spends) > 0
-        spend_bundle: SpendBundle = await sign_coin_spends(
-            spends,
-            self.secret_key_store.secret_key_for_public_key,
-            bytes32(hexstr_to_bytes(self.constants.AGG_SIG_ME_ADDITIONAL_DATA))
-            if isinstance(self.constants.AGG_SIG_ME_ADDITIONAL_DATA, str)
-            else bytes32(self.constants.AGG_SIG_ME_ADDITIONAL_DATA),
-            11000000000,  # MAX_BLOCK_COST_CLVM
-        )
+        with metrics.timer("sign"):
+            spend_bundle: SpendBundle = await sign_coin_spends(
+                spends,
+                self.secret_key_store.secret_key_for_public_key,
+                agg_sig_me_additional_data(self.constants),
+                self.constants.MAX_BLOCK_COST_CLVM,
+            )
         return spend_bundle
 
     async def _generate_unsigned_transaction(
@@ -426,29 +447,28 @@ class FakeWallet(PoolWallet):
         return solution_for_conditions(condition_list)
 
     async def puzzle_for_puzzle_hash(self, puzzle_hash: bytes32) -> Program:
-        maybe = self.puz_hashes[puzzle_hash]
-        if maybe is None:
+        index: Optional[int] = self.derivations.index_for_puzzle_hash(puzzle_hash)
+        if index is None:
             error_msg = f"Wallet couldn't find keys for puzzle_hash {puzzle_hash}"
             print(error_msg)
             raise ValueError(error_msg)
-        public_key, secret_key = maybe
-        synthetic_secret_key = calculate_synthetic_secret_key(secret_key, DEFAULT_HIDDEN_PUZZLE_HASH)
-        self.secret_key_store.save_secret_key(synthetic_secret_key)
-        return puzzle_for_pk(public_key)
+        self.secret_key_store.save_secret_key(self.derivations.synthetic_sk(index))
+        return self.derivations.puzzle(index)
 
     async def send_spend_bundle(self, spend_bundle):
-        # Send the SpendBundle to the fullnode to process
-        push_tx_response: Dict = await self.node_client.push_tx(spend_bundle)
+        # Send the SpendBundle to the fullnode to process, a bundle it would reject fails here without a round trip
+        with metrics.timer("validate"):
+            await check_spend_bundle(spend_bundle, self.constants)
+        with metrics.timer("push"):
+            push_tx_response: Dict = await self.node_client.push_tx(spend_bundle)
         if push_tx_response["status"] == "SUCCESS":
             print(f"Submitted spend_bundle successfully: {spend_bundle.name().hex()}")
         else:
             raise ValueError(f"Error submitting nft spend_bundle: {push_tx_response}")
 
     async def find_coins(self) -> Set[Coin]:
-        init_sk = master_sk_to_wallet_sk(self.key, uint32(0))
-        first_address_hex = create_puzzlehash_for_pk(init_sk.get_g1())
         coin_records: List[CoinRecord] = await self.node_client.get_coin_records_by_puzzle_hash(
-            first_address_hex, include_spent_coins=False
+            await self.get_first_puzzle_hash(), include_spent_coins=False
         )
         coins: Set = set()
         for record in coin_records:
@@ -458,15 +478,80 @@ class FakeWallet(PoolWallet):
                 break
         return coins
 
-    async def fund_from_feed_wallet(self) -> Set[Coin]:
-        feed_wallet: FeedWallet = await FeedWallet.connect(self.config)
-        transaction_record: TransactionRecord = await feed_wallet.send_feed_funds(await self.get_first_address())
+    async def wait_for_coins(self, watcher: Optional[BlockWatcher] = None) -> Set[Coin]:
+        if watcher is None:
+            watcher = BlockWatcher(self.node_client, self.config["wait"])
+        with metrics.timer("coin_wait"):
+            return await watcher.wait_for_coins(self)
+
+    @staticmethod
+    async def wait_for_coins_for_wallets(
+        wallets: List["FakeWallet"], wait_config: Optional[Dict] = None, return_exceptions=False
+    ) -> List[Union[Set[Coin], BaseException]]:
+        # All wallets share one watcher, so each new block costs a handful of bulk lookups. With
+        # return_exceptions a wallet that times out gets its exception in place of coins
+        watcher = BlockWatcher(
+            wallets[0].node_client,
+            wait_config if wait_config is not None else wallets[0].config["wait"],
+            chunk_size=wallets[0].config["full_node"]["coin_query_chunk_size"],
+        )
+        return list(
+            await asyncio.gather(
+                *[wallet.wait_for_coins(watcher) for wallet in wallets], return_exceptions=return_exceptions
+            )
+        )
+
+    async def fund_from_feed_wallet(
+        self,
+        wallet_client: Optional[WalletRpcClient] = None,
+        feed_manager: Optional[FeedWalletManager] = None,
+        on_sent: Optional[Callable[[TransactionRecord], None]] = None,
+    ) -> Set[Coin]:
+        # on_sent gets the feed transaction once the wallet accepts it. Not called with a feed_manager,
+        # its queue sends the transaction
+        if feed_manager is not None:
+            # Shared with other generations in this process, the payment may be one output of a larger transaction
+            puzzle_hash: bytes32 = await self.get_first_puzzle_hash()
+            transaction_record: TransactionRecord = await feed_manager.fund(puzzle_hash)
+            return (await self.get_coins_for_nfts(transaction_record, [puzzle_hash]))[puzzle_hash]
+        feed_wallet: FeedWallet = await FeedWallet.connect(self.config, wallet_client)
+        watcher = BlockWatcher(
+            self.node_client, self.config["wait"], feed_wallet.wallet_client, self.config["feed_wallet"]["id"]
+        )
+        transaction_record: TransactionRecord = await feed_wallet.send_feed_funds(
+            await self.get_first_address(), watcher, on_sent
+        )
         coins: Set[Coin] = await self.get_coin_for_nft(transaction_record)
         feed_wallet.close()
         return coins
 
-    async def create_plotnft(self, coins: Set[Coin]) -> Dict:
+    @staticmethod
+    async def fund_batch_from_feed_wallet(
+        wallets: List["FakeWallet"],
+        wallet_client: Optional[WalletRpcClient] = None,
+        on_sent: Optional[Callable[[TransactionRecord], None]] = None,
+    ) -> List[Set[Coin]]:
+        feed_wallet: FeedWallet = await FeedWallet.connect(wallets[0].config, wallet_client)
+        watcher = BlockWatcher(
+            wallets[0].node_client,
+            wallets[0].config["wait"],
+            feed_wallet.wallet_client,
+            wallets[0].config["feed_wallet"]["id"],
+        )
         try:
+            puzzle_hashes: List[bytes32] = [await wallet.get_first_puzzle_hash() for wallet in wallets]
+            transaction_record: TransactionRecord = await feed_wallet.send_feed_funds_batch(
+                puzzle_hashes, watcher, on_sent
+            )
+        finally:
+            feed_wallet.close()
+        coins: Dict[bytes32, Set[Coin]] = await FakeWallet.get_coins_for_nfts(transaction_record, puzzle_hashes)
+        return [coins[puzzle_hash] for puzzle_hash in puzzle_hashes]
+
+    async def build_plotnft(self, coins: Set[Coin], sign: bool = True) -> Tuple[SpendBundle, Dict]:
+        # Builds the launcher spend and the account info, without submitting anything. Unless sign is
+        # False the spend is signed, otherwise signing_job gives what a BatchSigner needs to sign it
+        with metrics.timer("spend_build"):
             initial_target_state = await self.init_pool_state()
             p2_singleton_delayed_ph, p2_singleton_delay_time = await self.get_p2_delay_info()
             owner_puzzle_hash = await self.get_payout_address()
@@ -476,35 +561,168 @@ class FakeWallet(PoolWallet):
                 p2_singleton_delay_time,
                 p2_singleton_delayed_ph,
                 owner_puzzle_hash,
+                sign,
             )
             if spend_bundle is None:
                 raise ValueError("Failed to generate Spend Bundle")
-            await self.send_spend_bundle(spend_bundle)
             # Create p2_singleton_puzzle_hash, used for plotting
-            p2_singleton_puzzle_hash: bytes32 = launcher_id_to_p2_puzzle_hash(
+            p2_singleton_puzzle_hash: bytes32 = get_pool_puzzle_template(self.constants).p2_singleton_puzzle_hash(
                 launcher_coin_id, p2_singleton_delay_time, p2_singleton_delayed_ph
             )
-            json_output = {
-                "status": "success",
-                "data": {
-                    "mnemonic": await self.get_mnemonic(),
-                    "pool_url": self.config["pool_info"]["url"] if self.config["pool_info"]["url"] is not None else "",
-                    "xch_payout_address": await self.get_first_address(),
-                    "launcher_id": launcher_coin_id.hex(),
-                    "farmer_key": str(await self.get_farmer_pub_key()),
-                    "singleton_puzzle_hash": singleton_puzzle_hash.hex(),
-                    "pool_puzzle_hash(plotting)": p2_singleton_puzzle_hash.hex(),
-                    "pool_address": encode_puzzle_hash(p2_singleton_puzzle_hash, self.config["prefix"]),
-                },
+            data = {
+                "fingerprint": self.key.get_g1().get_fingerprint(),
+                "mnemonic": await self.get_mnemonic(),
+                "pool_url": self.config["pool_info"]["url"] if self.config["pool_info"]["url"] is not None else "",
+                "xch_payout_address": await self.get_first_address(),
+                "launcher_id": launcher_coin_id.hex(),
+                "farmer_key": str(await self.get_farmer_pub_key()),
+                "singleton_puzzle_hash": singleton_puzzle_hash.hex(),
+                "pool_puzzle_hash(plotting)": p2_singleton_puzzle_hash.hex(),
+                "pool_address": encode_puzzle_hash(p2_singleton_puzzle_hash, self.config["prefix"]),
             }
+        return spend_bundle, data
+
+    def signing_job(self, spend_bundle: SpendBundle) -> SigningJob:
+        # The unsigned launcher spend with the synthetic keys that building it derived
+        return SigningJob(bytes(spend_bundle), [bytes(secret_key) for secret_key in self.derivations.synthetic_sks()])
+
+    async def create_plotnft(self, coins: Set[Coin]) -> Dict:
+        try:
+            spend_bundle, data = await self.build_plotnft(coins)
+            await self.send_spend_bundle(spend_bundle)
+            json_output = {"status": "success", "data": data}
         except Exception as e:
-            exc_type, exc_value, exc_traceback = sys.exc_info()
-            traceback.print_exception(exc_type, exc_value, exc_traceback, limit=2, file=sys.stdout)
-            json_output = {"status": "error", "data": repr(e)}
+            json_output = self.error_output(e, self)
         finally:
             self.close()
         print(json.dumps(json_output, sort_keys=True, indent=4, separators=(",", ": ")))
         return json_output
 
+    @staticmethod
+    async def create_plotnfts(
+        wallets: List["FakeWallet"],
+        coins: List[Set[Coin]],
+        funding_bundle: Optional[SpendBundle] = None,
+        signer: Optional[BatchSigner] = None,
+        on_outputs: Optional[Callable[[List["FakeWallet"], List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        # Builds every launcher spend, then aggregates them into as few push_tx calls as the cost limit allows.
+        # With a funding bundle the launchers spend coins it creates, so everything goes in one push_tx.
+        # With a signer the spends are built unsigned and signed together in its workers. on_outputs is
+        # given each wallet's output as soon as it's final, rather than once the whole batch is done
+        outputs: List[Dict] = []
+        spend_bundles: List[SpendBundle] = []
+        built: List[int] = []
+
+        def report(indices: List[int]):
+            if on_outputs is not None and len(indices) > 0:
+                on_outputs([wallets[index] for index in indices], [outputs[index] for index in indices])
+
+        try:
+            results = await asyncio.gather(
+                *[
+                    wallet.build_plotnft(wallet_coins, sign=signer is None)
+                    for wallet, wallet_coins in zip(wallets, coins)
+                ],
+                return_exceptions=True,
+            )
+            if signer is not None:
+                results = await FakeWallet.sign_plotnfts(wallets, results, signer)
+            for index, result in enumerate(results):
+                if isinstance(result, Exception):
+                    outputs.append(FakeWallet.error_output(result, wallets[index]))
+                else:
+                    spend_bundle, data = result
+                    outputs.append({"status": "success", "data": data})
+                    spend_bundles.append(spend_bundle)
+                    built.append(index)
+            report([index for index, result in enumerate(results) if isinstance(result, Exception)])
+            if len(spend_bundles) > 0:
+                # The wallets whose launchers are in each pushed bundle
+                launchers: List[List[int]] = [[index] for index in built]
+                if funding_bundle is not None:
+                    # Every launcher shares the fate of the one aggregated bundle
+                    spend_bundles = [SpendBundle.aggregate([funding_bundle] + spend_bundles)]
+                    launchers = [built]
+
+                def pushed(bundle_indices: List[int], errors: List[Optional[Exception]]):
+                    done: List[int] = []
+                    for bundle_index, error in zip(bundle_indices, errors):
+                        for index in launchers[bundle_index]:
+                            if error is not None:
+                                outputs[index] = FakeWallet.error_output(error, wallets[index])
+                            done.append(index)
+                    report(done)
+
+                # Validation shares the signer's workers, the bundles are already signed by then
+                await push_spend_bundles(
+                    wallets[0].node_client,
+                    spend_bundles,
+                    wallets[0].constants,
+                    pushed,
+                    signer.executor if signer is not None else None,
+                )
+        finally:
+            for wallet in wallets:
+                wallet.close()
+        return outputs
+
+    @staticmethod
+    async def sign_plotnfts(wallets: List["FakeWallet"], results: List, signer: BatchSigner) -> List:
+        # Signs every launcher spend that was built, keeping each result in its wallet's place
+        built: List[int] = [index for index, result in enumerate(results) if not isinstance(result, Exception)]
+        with metrics.timer("batch_sign"):
+            signed = await signer.sign(
+                [wallets[index].signing_job(results[index][0]) for index in built],
+                agg_sig_me_additional_data(wallets[0].constants),
+                wallets[0].constants.MAX_BLOCK_COST_CLVM,
+            )
+        results = list(results)
+        for index, spend_bundle in zip(built, signed):
+            results[index] = spend_bundle if isinstance(spend_bundle, Exception) else (spend_bundle, results[index][1])
+        return results
+
+    @staticmethod
+    async def create_plotnfts_eager(
+        wallets: List["FakeWallet"],
+        wallet_client: Optional[WalletRpcClient] = None,
+        signer: Optional[BatchSigner] = None,
+        on_outputs: Optional[Callable[[List["FakeWallet"], List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """
+        Skips waiting for the feed transaction to confirm. The feed wallet signs the funding
+        transaction without pushing it, and it's submitted in the same spend bundle as the
+        launchers that spend its outputs, so everything confirms in one block
+        """
+        feed_wallet: FeedWallet = await FeedWallet.connect(wallets[0].config, wallet_client)
+        try:
+            puzzle_hashes: List[bytes32] = [await wallet.get_first_puzzle_hash() for wallet in wallets]
+            transaction_record: TransactionRecord = await feed_wallet.create_feed_batch(puzzle_hashes)
+        finally:
+            feed_wallet.close()
+        coins: Dict[bytes32, Set[Coin]] = await FakeWallet.get_coins_for_nfts(transaction_record, puzzle_hashes)
+        return await FakeWallet.create_plotnfts(
+            wallets,
+            [coins[puzzle_hash] for puzzle_hash in puzzle_hashes],
+            transaction_record.spend_bundle,
+            signer,
+            on_outputs,
+        )
+
+    @staticmethod
+    def error_output(e: BaseException, wallet: Optional["FakeWallet"] = None) -> Dict:
+        traceback.print_exception(type(e), e, e.__traceback__, limit=2, file=sys.stdout)
+        json_output: Dict = {"status": "error", "data": repr(e)}
+        if wallet is not None:
+            # The wallet may hold coins already, such as a feed payment whose launcher failed, so its keys are kept
+            json_output["fingerprint"] = wallet.key.get_g1().get_fingerprint()
+            json_output["mnemonic"] = wallet.mnemonic
+        return json_output
+
     def close(self):
-        self.node_client.close()
+        # Drop cached signing material, closing is safe to repeat
+        self.secret_key_store = SecretKeyStore()
+        if self.derivations is not None:
+            self.derivations.clear()
+        if self.owns_node_client:
+            self.node_client.close()
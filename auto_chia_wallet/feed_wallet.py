@@ -1,78 +1,378 @@
-import time
-
-from pathlib import Path
-from typing import Dict
+import asyncio
+import json
+import os
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
+import appdirs
 from chia.rpc.wallet_rpc_client import WalletRpcClient
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.util.bech32m import decode_puzzle_hash
 from chia.wallet.transaction_record import TransactionRecord
 
+from auto_chia_wallet.metrics import metrics
+from auto_chia_wallet.rpc_clients import create_wallet_client
+from auto_chia_wallet.wait import wait_until
+from auto_chia_wallet.watcher import BlockWatcher
+
+
+def get_inventory_path(inventory_path: str = "") -> str:
+    if inventory_path:
+        return os.path.expanduser(inventory_path)
+    return appdirs.user_data_dir("auto_chia_wallet") + "/feed_inventory.json"
+
+
+class CoinInventory:
+    """
+    Feed wallet coins made by 'autowallet feed split'. Sends take coins from here so that
+    parallel fundings each spend their own coin, coins are removed as soon as they're taken.
+    """
+
+    path: str
+    coins: List[Coin]
+
+    def __init__(self, path: str, coins: List[Coin]):
+        self.path = path
+        self.coins = coins
+
+    @staticmethod
+    def open(inventory_path: str = "") -> "CoinInventory":
+        path = get_inventory_path(inventory_path)
+        coins: List[Coin] = []
+        if os.path.isfile(path):
+            with open(path, "r") as file:
+                coins = [Coin.from_json_dict(coin) for coin in json.load(file)]
+        return CoinInventory(path, coins)
+
+    def add(self, coins: List[Coin]):
+        self.coins.extend(coins)
+        self.save()
+
+    def take(self, amount: int) -> Optional[List[Coin]]:
+        # Smallest set of coins, in the order they were added, covering amount. None if there aren't enough
+        taken: List[Coin] = []
+        total = 0
+        for coin in self.coins:
+            if total >= amount:
+                break
+            taken.append(coin)
+            total += coin.amount
+        if total < amount:
+            return None
+        self.coins = self.coins[len(taken) :]
+        self.save()
+        return taken
+
+    def save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump([coin.to_json_dict() for coin in self.coins], file)
+        os.replace(temp_path, self.path)
+
 
 class FeedWallet:
     wallet_client: WalletRpcClient
+    owns_wallet_client: bool
+    inventory: CoinInventory
     config: Dict
 
     @staticmethod
-    async def connect(config):
+    async def connect(config, wallet_client: Optional[WalletRpcClient] = None):
+        # A client shared from an RpcClientPool is left open when this wallet closes
         wallet: FeedWallet = FeedWallet()
         wallet.config = config
-        wallet.wallet_client = await WalletRpcClient.create(
-            wallet.config["feed_wallet"]["hostname"],
-            wallet.config["feed_wallet"]["wallet_rpc_port"],
-            wallet.config["root_path"],
-            {
-                "private_ssl_ca": {
-                    "crt": Path(wallet.config["ssl"]["private_ssl_ca"]["crt"]),
-                    "key": Path(wallet.config["ssl"]["private_ssl_ca"]["key"]),
-                },
-                "daemon_ssl": {
-                    "private_crt": Path(wallet.config["ssl"]["daemon_ssl"]["private_crt"]),
-                    "private_key": Path(wallet.config["ssl"]["daemon_ssl"]["private_key"]),
-                },
-            },
-        )
+        wallet.inventory = CoinInventory.open(config["feed_wallet"]["inventory_path"])
+        wallet.owns_wallet_client = wallet_client is None
+        wallet.wallet_client = wallet_client if wallet_client is not None else await create_wallet_client(config)
         return wallet
 
-    async def send_feed_funds(self, address) -> TransactionRecord:
+    async def send_feed_funds(
+        self,
+        address,
+        watcher: Optional[BlockWatcher] = None,
+        on_sent: Optional[Callable[[TransactionRecord], None]] = None,
+    ) -> TransactionRecord:
+        # on_sent gets the transaction as soon as the wallet accepts it, before it confirms
+        await self.check_feed_balance(self.config["feed_wallet"]["feed_amount"])
+
+        # Send the Funds from teh feed wallet to the address of the new wallet
+        print("Sending Transaction")
+        with metrics.timer("feed_send"):
+            transaction_record: TransactionRecord = await self.wallet_client.send_transaction(
+                self.config["feed_wallet"]["id"],
+                self.config["feed_wallet"]["feed_amount"],
+                address,
+                self.config["feed_wallet"]["fee"],
+            )
+        if transaction_record is None:
+            raise Exception("Failed to submit feed transaction")
+        if on_sent is not None:
+            on_sent(transaction_record)
+        return await self.wait_for_confirmation(transaction_record, watcher)
+
+    async def send_feed_funds_batch(
+        self,
+        puzzle_hashes: List[bytes32],
+        watcher: Optional[BlockWatcher] = None,
+        on_sent: Optional[Callable[[TransactionRecord], None]] = None,
+    ) -> TransactionRecord:
+        # A single transaction with one output per new wallet, so the whole batch confirms in one block
+        await self.check_feed_balance(self.config["feed_wallet"]["feed_amount"] * len(puzzle_hashes))
+        transaction_record: TransactionRecord = await self.submit_feed_batch(puzzle_hashes)
+        if on_sent is not None:
+            on_sent(transaction_record)
+        return await self.wait_for_confirmation(transaction_record, watcher)
+
+    async def submit_feed_batch(self, puzzle_hashes: List[bytes32]) -> TransactionRecord:
+        print(f"Sending Transaction to {len(puzzle_hashes)} wallets")
+        # Spend pre-split coins when there are some, so parallel sends never wait on the same locked coin.
+        # Taken coins leave the inventory even if the send fails, a coin spent elsewhere is never retried
+        coins: Optional[List[Coin]] = self.inventory.take(self.feed_batch_amount(puzzle_hashes))
+        with metrics.timer("feed_send"):
+            transaction_record: TransactionRecord = await self.wallet_client.send_transaction_multi(
+                self.config["feed_wallet"]["id"],
+                self.feed_additions(puzzle_hashes),
+                coins=coins,
+                fee=self.config["feed_wallet"]["fee"],
+            )
+        if transaction_record is None:
+            raise Exception("Failed to submit feed transaction")
+        return transaction_record
+
+    async def create_feed_batch(self, puzzle_hashes: List[bytes32]) -> TransactionRecord:
+        # Signed by the wallet but not pushed, the caller submits it along with spends of its outputs.
+        # The wallet doesn't lock coins for unsubmitted transactions, so use the coin inventory for parallel calls
+        await self.check_feed_balance(self.feed_batch_amount(puzzle_hashes))
+        print(f"Creating signed Transaction to {len(puzzle_hashes)} wallets")
+        coins: Optional[List[Coin]] = self.inventory.take(self.feed_batch_amount(puzzle_hashes))
+        with metrics.timer("feed_send"):
+            transaction_record: TransactionRecord = await self.wallet_client.create_signed_transaction(
+                self.feed_additions(puzzle_hashes),
+                coins=coins,
+                fee=self.config["feed_wallet"]["fee"],
+            )
+        if transaction_record is None or transaction_record.spend_bundle is None:
+            raise Exception("Failed to create feed transaction")
+        return transaction_record
+
+    async def known_transactions(self, tx_ids: Set[bytes32]) -> Set[bytes32]:
+        # The ones of tx_ids the feed wallet has a record of, confirmed or not. One it has never heard of never went out
+        known: Set[bytes32] = set()
+        for tx_id in tx_ids:
+            try:
+                await self.wallet_client.get_transaction(self.config["feed_wallet"]["id"], tx_id)
+            except ValueError:
+                # The wallet answers an unknown id with an error
+                continue
+            known.add(tx_id)
+        return known
+
+    def feed_additions(self, puzzle_hashes: List[bytes32]) -> List[Dict]:
+        return [
+            {"amount": self.config["feed_wallet"]["feed_amount"], "puzzle_hash": puzzle_hash}
+            for puzzle_hash in puzzle_hashes
+        ]
+
+    def feed_batch_amount(self, puzzle_hashes: List[bytes32]) -> int:
+        return self.config["feed_wallet"]["feed_amount"] * len(puzzle_hashes) + self.config["feed_wallet"]["fee"]
+
+    async def split_coins(self, count: int, amount: int) -> TransactionRecord:
+        """
+        Fans the feed wallet out into count coins of amount each, to the wallet's own new addresses,
+        and records them in the coin inventory for later sends to pick from
+        """
+        await self.check_feed_balance(count * amount + self.config["feed_wallet"]["fee"])
+        puzzle_hashes: List[bytes32] = []
+        for _ in range(count):
+            # Coins with the same parent, puzzle hash and amount would be identical, so each needs its own address
+            address: str = await self.wallet_client.get_next_address(self.config["feed_wallet"]["id"], True)
+            puzzle_hashes.append(decode_puzzle_hash(address))
+        print(f"Splitting feed wallet into {count} coins of {amount}")
+        transaction_record: TransactionRecord = await self.wallet_client.send_transaction_multi(
+            self.config["feed_wallet"]["id"],
+            [{"amount": amount, "puzzle_hash": puzzle_hash} for puzzle_hash in puzzle_hashes],
+            fee=self.config["feed_wallet"]["fee"],
+        )
+        if transaction_record is None:
+            raise Exception("Failed to submit split transaction")
+        transaction_record = await self.wait_for_confirmation(transaction_record)
+        split_coins: List[Coin] = [
+            coin for coin in transaction_record.additions if coin.puzzle_hash in puzzle_hashes and coin.amount == amount
+        ]
+        self.inventory.add(split_coins)
+        return transaction_record
+
+    async def check_feed_balance(self, amount: int):
+        await self.log_in()
+        # Make sure the feed wallet has enough funds to send to new wallet
+        print("Checking balance")
+        max_avail = await self.get_max_send_amount()
+        if max_avail < amount:
+            raise Exception("Error Not enough funds in feed wallet")
+
+    async def log_in(self):
         print("Logging into feed wallet")
         login_resp = await self.wallet_client.log_in_and_skip(self.config["feed_wallet"]["fingerprint"])
         if login_resp is None or login_resp["success"] is False:
             raise Exception("Failed to login to feed wallet")
 
-        # Make sure the feed wallet has enough funds to send to new wallet
-        print("Checking balance")
+    async def get_max_send_amount(self) -> int:
         wallet_balance = await self.wallet_client.get_wallet_balance(self.config["feed_wallet"]["id"])
-        max_avail = wallet_balance["max_send_amount"]
-        if max_avail < self.config["feed_wallet"]["feed_amount"]:
-            print(wallet_balance)
-            raise Exception("Error Not enough funds in feed wallet")
+        return wallet_balance["max_send_amount"]
 
-        # Send the Funds from teh feed wallet to the address of the new wallet
-        print("Sending Transaction")
-        transaction_record: TransactionRecord = await self.wallet_client.send_transaction(
-            self.config["feed_wallet"]["id"],
-            self.config["feed_wallet"]["feed_amount"],
-            address,
-            self.config["feed_wallet"]["fee"],
-        )
-        if transaction_record is None:
-            raise Exception("Failed to submit feed transaction")
+    async def wait_for_confirmation(
+        self, transaction_record: TransactionRecord, watcher: Optional[BlockWatcher] = None
+    ) -> TransactionRecord:
+        with metrics.timer("confirmation_wait"):
+            return await self._wait_for_confirmation(transaction_record, watcher)
+
+    async def _wait_for_confirmation(
+        self, transaction_record: TransactionRecord, watcher: Optional[BlockWatcher] = None
+    ) -> TransactionRecord:
+        # Wait for the transaction to be confirmed, sharing the watcher's per block checks if one is given
+        tx_id: bytes32 = transaction_record.name
+        if watcher is not None:
+            print("Waiting for transaction to be confirmed")
+            transaction_record = await watcher.wait_for_transaction(tx_id)
+            print(f"Transaction confirmed at height: {transaction_record.confirmed_at_height} tx_id: {tx_id.hex()}")
+            return transaction_record
 
-        # Wait for the transaction to be confirmed
-        confirmed = False
-        total_wait = 0
-        while not confirmed:
-            print(f"\rWaiting for transaction to be confirmed: {str(total_wait)} ")
-            time.sleep(5)
-            total_wait = total_wait + 5
-            transaction_record = await self.wallet_client.get_transaction(
+        async def get_confirmed_transaction() -> Optional[TransactionRecord]:
+            record: TransactionRecord = await self.wallet_client.get_transaction(
                 self.config["feed_wallet"]["id"],
-                transaction_record.name,
+                tx_id,
             )
-            confirmed = transaction_record.confirmed
+            return record if record.confirmed else None
+
+        transaction_record = await wait_until(
+            get_confirmed_transaction, self.config["wait"], "Waiting for transaction to be confirmed"
+        )
         print(
             f"\rTransaction confirmed at height: {transaction_record.confirmed_at_height} tx_id: {transaction_record.name.hex()}"
         )
         return transaction_record
 
     def close(self):
-        self.wallet_client.close()
+        if self.owns_wallet_client:
+            self.wallet_client.close()
+
+
+class FeedWalletManager:
+    """
+    Shares one logged in feed wallet between concurrent generations. Funding requests go
+    through a single queue and requests arriving within feed_wallet.batch_window seconds are
+    sent as one multi output transaction. Amounts in flight are reserved locally against the
+    last known balance, which is only re-read from the wallet when the local figure runs short.
+    Change locked in pending transactions isn't modelled, so a batch can pass the local check
+    and still be refused by the wallet, its requests then fail with the wallet's error.
+    """
+
+    feed_wallet: FeedWallet
+    watcher: Optional[BlockWatcher]
+    available: int
+    reserved: int
+    snapshot: int
+
+    def __init__(self, feed_wallet: FeedWallet, watcher: Optional[BlockWatcher] = None):
+        self.feed_wallet = feed_wallet
+        self.watcher = watcher
+        self.config = feed_wallet.config
+        self.available = 0
+        self.reserved = 0
+        # Counts balance reads, an amount is only released from the reading it was reserved against
+        self.snapshot = 0
+        self.requests: asyncio.Queue = asyncio.Queue()
+        self._sender: Optional[asyncio.Task] = None
+        self._confirmations: Set[asyncio.Task] = set()
+
+    @staticmethod
+    async def connect(config, wallet_client: Optional[WalletRpcClient] = None, watcher: Optional[BlockWatcher] = None):
+        manager = FeedWalletManager(await FeedWallet.connect(config, wallet_client), watcher)
+        await manager.feed_wallet.log_in()
+        manager.available = await manager.feed_wallet.get_max_send_amount()
+        return manager
+
+    async def fund(self, puzzle_hash: bytes32) -> TransactionRecord:
+        # Resolves with the confirmed transaction that paid feed_amount to the puzzle hash
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self.requests.put((puzzle_hash, future))
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._send_loop())
+        return await future
+
+    async def _send_loop(self):
+        while True:
+            batch: List[Tuple[bytes32, asyncio.Future]] = [await self.requests.get()]
+            deadline = asyncio.get_running_loop().time() + self.config["feed_wallet"]["batch_window"]
+            while len(batch) < self.config["feed_wallet"]["max_batch_size"]:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.requests.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._send(batch)
+
+    async def _send(self, batch: List[Tuple[bytes32, asyncio.Future]]):
+        amount = self.config["feed_wallet"]["feed_amount"] * len(batch) + self.config["feed_wallet"]["fee"]
+        try:
+            if amount > self.available - self.reserved:
+                # The wallet's max_send_amount already excludes coins locked by our pending transactions,
+                # so what was reserved against the old reading is dropped instead of subtracted again
+                self.available = await self.feed_wallet.get_max_send_amount()
+                self.reserved = 0
+                self.snapshot += 1
+            if amount > self.available - self.reserved:
+                raise Exception("Error Not enough funds in feed wallet")
+            transaction_record = await self.feed_wallet.submit_feed_batch([puzzle_hash for puzzle_hash, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.reserved += amount
+        # Waiting happens off the send loop, so the next batch can go out while this one confirms
+        task = asyncio.create_task(self._confirm(transaction_record, amount, self.snapshot, batch))
+        self._confirmations.add(task)
+        task.add_done_callback(self._confirmations.discard)
+
+    async def _confirm(
+        self,
+        transaction_record: TransactionRecord,
+        amount: int,
+        snapshot: int,
+        batch: List[Tuple[bytes32, asyncio.Future]],
+    ):
+        try:
+            confirmed: TransactionRecord = await self.feed_wallet.wait_for_confirmation(
+                transaction_record, self.watcher
+            )
+        except Exception as e:
+            if snapshot == self.snapshot:
+                # Whether the transaction is still pending isn't known, so the next send reads the balance again
+                self.available = 0
+                self.reserved = 0
+                self.snapshot += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if snapshot == self.snapshot:
+            # Once confirmed the spend is reflected in the wallet's balance, drop it from both sides
+            self.reserved -= amount
+            self.available -= amount
+        for _, future in batch:
+            if not future.done():
+                future.set_result(confirmed)
+
+    async def close(self):
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+        for task in list(self._confirmations):
+            task.cancel()
+        await asyncio.gather(*self._confirmations, return_exceptions=True)
+        self.feed_wallet.close()
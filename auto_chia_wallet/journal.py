@@ -0,0 +1,74 @@
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+import appdirs
+
+# Stages in the order a wallet goes through them
+KEY = "key"
+FUNDING = "funding"
+FUNDED = "funded"
+SUBMITTED = "submitted"
+CONFIRMED = "confirmed"
+
+
+def get_journal_path(journal_path: str = "") -> str:
+    if journal_path:
+        return os.path.expanduser(journal_path)
+    return appdirs.user_data_dir("auto_chia_wallet") + "/journal.jsonl"
+
+
+class Journal:
+    """
+    Append only JSON lines log of every stage each wallet reaches, written before the next
+    stage starts. 'autowallet resume' reads it back to finish wallets a crashed run left behind,
+    the key entry holds the mnemonic so a funded wallet is never lost.
+    """
+
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "a")
+        # Ends a line cut off by a crash, so the next entry starts on its own line
+        if self.file.tell() > 0:
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    self.file.write("\n")
+
+    @staticmethod
+    def open(journal_path: str = "") -> "Journal":
+        return Journal(get_journal_path(journal_path))
+
+    def record(self, fingerprint: str, stage: str, **data):
+        self.record_many([(fingerprint, stage, data)])
+
+    def record_many(self, entries: List[Tuple[str, str, Dict]]):
+        # One fsync per call, batches record a stage for every wallet at once
+        now = time.time()
+        for fingerprint, stage, data in entries:
+            self.file.write(json.dumps({"fingerprint": fingerprint, "stage": stage, "time": now, **data}) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def incomplete(self, include_submitted=False) -> Dict[str, Dict]:
+        # Folds every entry into the latest state of each wallet, keeping the unfinished ones. A wallet
+        # whose launcher was pushed is done, unless include_submitted asks to check it confirmed
+        finished = (CONFIRMED,) if include_submitted else (SUBMITTED, CONFIRMED)
+        wallets: Dict[str, Dict] = {}
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    entry: Dict = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut off by the crash, the stage it was recording never finished
+                    continue
+                wallets.setdefault(entry["fingerprint"], {}).update(entry)
+        return {fingerprint: state for fingerprint, state in wallets.items() if state["stage"] not in finished}
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import List, Optional
+
+import appdirs
+
+
+@dataclass(frozen=True)
+class KeyBundle:
+    # Plain bytes so bundles can be passed back from worker processes and stored without chia
+    mnemonic: str
+    master_sk: bytes
+    fingerprint: int
+    first_puzzle_hash: bytes
+    payout_puzzle_hash: bytes
+    farmer_pk: bytes
+
+
+def get_key_pool_path(key_pool_path: str = "") -> str:
+    if key_pool_path:
+        return os.path.expanduser(key_pool_path)
+    return appdirs.user_data_dir("auto_chia_wallet") + "/key_pool.sqlite"
+
+
+class KeyPool:
+    """
+    Keys generated ahead of time with 'autowallet generate keys', so PlotNFT generation can
+    claim a ready key instead of deriving one on the critical path. Each key is claimed once.
+    """
+
+    path: str
+    connection: sqlite3.Connection
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS keys("
+            "fingerprint INTEGER PRIMARY KEY, "
+            "mnemonic TEXT NOT NULL, "
+            "master_sk BLOB NOT NULL, "
+            "first_puzzle_hash BLOB NOT NULL, "
+            "payout_puzzle_hash BLOB NOT NULL, "
+            "farmer_pk BLOB NOT NULL, "
+            "claimed INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS keys_first_puzzle_hash ON keys(first_puzzle_hash)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS keys_claimed ON keys(claimed)")
+
+    @staticmethod
+    def open(key_pool_path: str = "") -> "KeyPool":
+        return KeyPool(get_key_pool_path(key_pool_path))
+
+    def add(self, bundles: List[KeyBundle]):
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO keys VALUES(?, ?, ?, ?, ?, ?, 0)",
+                [
+                    (
+                        bundle.fingerprint,
+                        bundle.mnemonic,
+                        bundle.master_sk,
+                        bundle.first_puzzle_hash,
+                        bundle.payout_puzzle_hash,
+                        bundle.farmer_pk,
+                    )
+                    for bundle in bundles
+                ],
+            )
+
+    def claim(self, count: int) -> List[KeyBundle]:
+        # BEGIN IMMEDIATE takes the write lock first, so concurrent processes never claim the same key
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            rows = self.connection.execute(
+                "SELECT fingerprint, mnemonic, master_sk, first_puzzle_hash, payout_puzzle_hash, farmer_pk "
+                "FROM keys WHERE claimed = 0 LIMIT ?",
+                (count,),
+            ).fetchall()
+            self.connection.executemany("UPDATE keys SET claimed = 1 WHERE fingerprint = ?", [(r[0],) for r in rows])
+        return [self._bundle_from_row(row) for row in rows]
+
+    def get_by_fingerprint(self, fingerprint: int) -> Optional[KeyBundle]:
+        row = self.connection.execute(
+            "SELECT fingerprint, mnemonic, master_sk, first_puzzle_hash, payout_puzzle_hash, farmer_pk "
+            "FROM keys WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        return self._bundle_from_row(row) if row is not None else None
+
+    def get_by_puzzle_hash(self, puzzle_hash: bytes) -> Optional[KeyBundle]:
+        row = self.connection.execute(
+            "SELECT fingerprint, mnemonic, master_sk, first_puzzle_hash, payout_puzzle_hash, farmer_pk "
+            "FROM keys WHERE first_puzzle_hash = ?",
+            (bytes(puzzle_hash),),
+        ).fetchone()
+        return self._bundle_from_row(row) if row is not None else None
+
+    def unclaimed_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM keys WHERE claimed = 0").fetchone()[0]
+
+    @staticmethod
+    def _bundle_from_row(row) -> KeyBundle:
+        fingerprint, mnemonic, master_sk, first_puzzle_hash, payout_puzzle_hash, farmer_pk = row
+        return KeyBundle(
+            mnemonic=mnemonic,
+            master_sk=bytes(master_sk),
+            fingerprint=fingerprint,
+            first_puzzle_hash=bytes(first_puzzle_hash),
+            payout_puzzle_hash=bytes(payout_puzzle_hash),
+            farmer_pk=bytes(farmer_pk),
+        )
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,37 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Optional
+
+from blspy import AugSchemeMPL, PrivateKey
+from chia.util.keychain import bytes_to_mnemonic, mnemonic_to_seed, token_bytes
+
+from auto_chia_wallet.derivation import DerivationCache
+from auto_chia_wallet.key_pool import KeyBundle
+
+
+def derive_key_bundle(mnemonic: Optional[str] = None) -> KeyBundle:
+    # The CPU heavy part of creating a wallet, mnemonic_to_seed alone runs 2048 rounds of PBKDF2
+    if mnemonic is None:
+        mnemonic = bytes_to_mnemonic(token_bytes(32))
+    master_sk: PrivateKey = AugSchemeMPL.key_gen(mnemonic_to_seed(mnemonic, ""))
+    derivations = DerivationCache(master_sk)
+    return KeyBundle(
+        mnemonic=mnemonic,
+        master_sk=bytes(master_sk),
+        fingerprint=master_sk.get_g1().get_fingerprint(),
+        first_puzzle_hash=bytes(derivations.puzzle_hash(0)),
+        payout_puzzle_hash=bytes(derivations.puzzle_hash(1)),
+        farmer_pk=bytes(derivations.farmer_pk()),
+    )
+
+
+async def generate_key_bundles(count: int, workers: int = 0) -> AsyncIterator[KeyBundle]:
+    """
+    Derives count new keys across a pool of worker processes, yielding each bundle as soon
+    as it is ready. workers of 0 uses one process per core
+    """
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers if workers > 0 else None) as executor:
+        futures = [loop.run_in_executor(executor, derive_key_bundle) for _ in range(count)]
+        for future in asyncio.as_completed(futures):
+            yield await future
@@ -0,0 +1,125 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Upper bounds in seconds, wide enough for both a signature and a wait for confirmation
+BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets: List[int] = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+
+class Metrics:
+    """
+    Stage timings and RPC counters for this process. Every RPC client made by rpc_clients is
+    instrumented, stages are timed where they run. Exported as Prometheus text by 'autowallet
+    serve' on /metrics, and as a JSON summary at the end of batch runs.
+    """
+
+    counters: Dict[Tuple[str, Labels], int]
+    histograms: Dict[Tuple[str, Labels], Histogram]
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name: str, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def reset(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def prometheus_text(self) -> str:
+        lines: List[str] = []
+        for name in sorted({name for name, _ in self.counters}):
+            lines.append(f"# TYPE autowallet_{name} counter")
+            for (counter_name, labels), value in sorted(self.counters.items()):
+                if counter_name == name:
+                    lines.append(f"autowallet_{name}{self._labels(labels)} {value}")
+        for name in sorted({name for name, _ in self.histograms}):
+            lines.append(f"# TYPE autowallet_{name} histogram")
+            for (histogram_name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if histogram_name != name:
+                    continue
+                for bound, value in zip(BUCKETS, histogram.buckets):
+                    lines.append(f"autowallet_{name}_bucket{self._labels(labels + (('le', str(bound)),))} {value}")
+                lines.append(f"autowallet_{name}_bucket{self._labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"autowallet_{name}_sum{self._labels(labels)} {histogram.sum}")
+                lines.append(f"autowallet_{name}_count{self._labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels: Labels) -> str:
+        if len(labels) == 0:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+    def summary(self) -> Dict:
+        # Keyed by each metric's label values joined, in label name order, such as "sign" or "push_tx,full_node"
+        summary: Dict[str, Dict] = {}
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            summary.setdefault(name, {})[",".join(label for _, label in labels)] = {
+                "count": histogram.count,
+                "seconds": histogram.sum,
+                "mean": histogram.sum / histogram.count,
+                "max": histogram.max,
+            }
+        for (name, labels), value in sorted(self.counters.items()):
+            summary.setdefault(name, {})[",".join(label for _, label in labels)] = value
+        return summary
+
+
+# One registry per process, like the RPC client pool
+metrics = Metrics()
+
+
+def instrument_client(client, service: str):
+    """
+    Counts and times every request the client makes, all of the RpcClient methods go through fetch
+    """
+    fetch = client.fetch
+
+    async def timed_fetch(path, request_json):
+        start = time.perf_counter()
+        try:
+            return await fetch(path, request_json)
+        except Exception:
+            metrics.count("rpc_errors_total", service=service, method=path)
+            raise
+        finally:
+            metrics.count("rpc_requests_total", service=service, method=path)
+            metrics.observe("rpc_seconds", time.perf_counter() - start, service=service, method=path)
+
+    client.fetch = timed_fetch
+    return client
@@ -0,0 +1,107 @@
+import csv
+import json
+import os
+import time
+from typing import Dict, List
+
+# Columns of the csv batch format, the keys of FakeWallet.build_plotnft's data
+CSV_FIELDS: List[str] = [
+    "status",
+    "fingerprint",
+    "mnemonic",
+    "pool_url",
+    "xch_payout_address",
+    "launcher_id",
+    "farmer_key",
+    "singleton_puzzle_hash",
+    "pool_puzzle_hash(plotting)",
+    "pool_address",
+    "error",
+]
+
+
+def write_account_file(output_dir: str, output: Dict) -> str:
+    # Written to a temporary file first, so a crash never leaves a half written account behind
+    path: str = os.path.join(os.path.expanduser(output_dir), f"account{output['data']['fingerprint']}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as file:
+        json.dump(output, file, sort_keys=True, indent=4, separators=(",", ": "))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+    return path
+
+
+class BatchOutput:
+    """
+    Streams the results of a batch to one file, a line per account as soon as it's known, so
+    downstream tooling can read accounts while the batch is still running. Format is 'ndjson'
+    or 'csv', the file is fsynced every fsync_every accounts and when closed.
+    """
+
+    path: str
+    format: str
+    fsync_every: int
+
+    def __init__(self, path: str, format: str = "ndjson", fsync_every: int = 100):
+        if format not in ("ndjson", "csv"):
+            raise ValueError(f"Unknown output format: '{format}', expected 'ndjson' or 'csv'")
+        self.path = path
+        self.format = format
+        self.fsync_every = fsync_every
+        self.pending = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.file = None
+
+    def _open_file(self):
+        # Opened with the first account, a run that produces nothing leaves no empty file behind
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        new_file: bool = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, "a", newline="")
+        self.csv_writer = csv.DictWriter(self.file, CSV_FIELDS, extrasaction="ignore")
+        if self.format == "csv" and new_file:
+            self.csv_writer.writeheader()
+
+    @staticmethod
+    def open(config) -> "BatchOutput":
+        # One file per run, named after when it started
+        extension: str = "csv" if config.output_format == "csv" else "ndjson"
+        path: str = os.path.join(
+            os.path.expanduser(config.output_dir), f"accounts-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
+        )
+        return BatchOutput(path, config.output_format, config.output_fsync_every)
+
+    def write(self, outputs: List[Dict]):
+        if self.file is None:
+            self._open_file()
+        for output in outputs:
+            if output["status"] == "success":
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            if self.format == "csv":
+                if output["status"] == "success":
+                    self.csv_writer.writerow({"status": output["status"], **output["data"]})
+                else:
+                    # With the fingerprint and mnemonic of the wallet it failed for, when there is one
+                    self.csv_writer.writerow({**output, "error": output["data"]})
+            else:
+                self.file.write(json.dumps(output, sort_keys=True) + "\n")
+            self.pending += 1
+        self.file.flush()
+        if self.pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self.file is None:
+            return
+        self.file.flush()
+        self.sync()
+        self.file.close()
+        print(f"Wrote {self.succeeded} accounts to: {self.path}, {self.failed} failed")
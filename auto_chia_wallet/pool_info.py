@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from chia.cmds.plotnft_funcs import create_pool_args
+
+
+class PoolInfoCache:
+    """
+    The parts of a pool's /pool_info that joining needs, target_puzzle_hash and relative_lock_height,
+    keyed by pool url. Entries are fresh for ttl seconds, after that the next lookup fetches them
+    again. If that fetch fails an entry up to max_stale seconds old is used instead of failing the
+    wallet, and keeps being used for another ttl seconds before the pool is asked again. With a
+    path the cache is kept in a JSON file, so separate runs share it too.
+    """
+
+    path: str
+    ttl: float
+    max_stale: float
+    entries: Dict[str, Dict]
+    # When each url last failed to refresh
+    failed: Dict[str, float]
+
+    def __init__(self, path: str = "", ttl: float = 3600.0, max_stale: float = 86400.0):
+        self.path = os.path.expanduser(path) if path else ""
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.entries = {}
+        self.failed = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        if self.path and os.path.isfile(self.path):
+            try:
+                with open(self.path, "r") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                # Only a cache, a damaged file is fetched again
+                self.entries = {}
+
+    def _lock(self, pool_url: str) -> asyncio.Lock:
+        # One fetch per url at a time, the wallets of a batch wait for it rather than each asking the pool
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            self.loop = loop
+            self.locks = {}
+        if pool_url not in self.locks:
+            self.locks[pool_url] = asyncio.Lock()
+        return self.locks[pool_url]
+
+    def _age(self, pool_url: str) -> float:
+        return time.time() - self.entries[pool_url]["fetched"] if pool_url in self.entries else float("inf")
+
+    def _usable(self, pool_url: str) -> bool:
+        # Fresh, or stale but the last refresh failed less than ttl ago
+        if self._age(pool_url) < self.ttl:
+            return True
+        return time.time() - self.failed.get(pool_url, 0.0) < self.ttl and self._age(pool_url) < self.max_stale
+
+    async def get(self, pool_url: str) -> Dict:
+        if self._usable(pool_url):
+            return self.entries[pool_url]
+        async with self._lock(pool_url):
+            # Another wallet may have fetched it, or failed to, while this one waited
+            if self._usable(pool_url):
+                return self.entries[pool_url]
+            try:
+                json_dict: Dict = await create_pool_args(pool_url)
+            except Exception as e:
+                if self._age(pool_url) < self.max_stale:
+                    self.failed[pool_url] = time.time()
+                    print(
+                        f"Couldn't refresh pool info from {pool_url}, using info from {self._age(pool_url):.0f}s ago: {e}"
+                    )
+                    return self.entries[pool_url]
+                raise
+            self.failed.pop(pool_url, None)
+            self.entries[pool_url] = {
+                "target_puzzle_hash": json_dict["target_puzzle_hash"],
+                "relative_lock_height": json_dict["relative_lock_height"],
+                "fetched": time.time(),
+            }
+            self.save()
+            return self.entries[pool_url]
+
+    def save(self):
+        if not self.path:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.path)
+
+
+# Shared by every wallet in the process, like the consensus constants
+_pool_info_caches: Dict[Tuple, PoolInfoCache] = {}
+
+
+def get_pool_info_cache(pool_info: Dict) -> PoolInfoCache:
+    key = (pool_info["cache_path"], pool_info["cache_ttl"], pool_info["cache_max_stale"])
+    if key not in _pool_info_caches:
+        _pool_info_caches[key] = PoolInfoCache(*key)
+    return _pool_info_caches[key]
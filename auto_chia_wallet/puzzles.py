@@ -0,0 +1,128 @@
+from functools import lru_cache
+from typing import Dict, Union
+
+from chia.consensus.constants import ConsensusConstants
+from chia.pools.pool_puzzles import (
+    P2_SINGLETON_HASH,
+    POOL_MEMBER_HASH,
+    POOL_WAITING_ROOM_HASH,
+    SINGLETON_LAUNCHER_HASH,
+    SINGLETON_MOD_HASH,
+)
+from chia.pools.pool_wallet_info import FARMING_TO_POOL, SELF_POOLING
+from chia.types.blockchain_format.program import Program
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.util.byte_types import hexstr_to_bytes
+from chia.util.hash import std_hash
+from blspy import G1Element
+
+
+def atom_hash(atom: bytes) -> bytes32:
+    return std_hash(b"\1" + atom)
+
+
+def pair_hash(left: bytes32, right: bytes32) -> bytes32:
+    return std_hash(b"\2" + left + right)
+
+
+NIL_HASH: bytes32 = atom_hash(b"")
+ONE_HASH: bytes32 = atom_hash(b"\1")  # q, and the environment curried arguments are consed onto
+TWO_HASH: bytes32 = atom_hash(b"\2")  # a
+FOUR_HASH: bytes32 = atom_hash(b"\4")  # c
+
+
+@lru_cache(maxsize=4096)
+def quoted_hash(value_hash: bytes32) -> bytes32:
+    # Tree hash of (q . value), memoized as most curried values are the same for every wallet
+    return pair_hash(ONE_HASH, value_hash)
+
+
+def curried_tree_hash(mod_hash: bytes32, *arg_hashes: bytes32) -> bytes32:
+    """
+    Tree hash of mod.curry(*args), from the tree hashes of mod and of each argument, without
+    building the curried program. Program.curry makes (a (q . mod) (c (q . arg1) (c (q . arg2) ... 1)))
+    """
+    environment: bytes32 = ONE_HASH
+    for arg_hash in reversed(arg_hashes):
+        environment = pair_hash(FOUR_HASH, pair_hash(quoted_hash(arg_hash), pair_hash(environment, NIL_HASH)))
+    return pair_hash(TWO_HASH, pair_hash(quoted_hash(mod_hash), pair_hash(environment, NIL_HASH)))
+
+
+class PoolPuzzleTemplate:
+    """
+    Puzzle hashes of the pool singletons on one network. The launcher spend only needs the
+    singleton's puzzle hash, so rather than curry and hash whole inner puzzles per wallet like
+    chia's pool_puzzles, the hashes are built from the hashes of their arguments. The network's
+    values are worked out once, per wallet only the owner key, launcher id and delay are new.
+    """
+
+    pool_reward_prefix: bytes32
+
+    def __init__(self, genesis_challenge: bytes32):
+        self.pool_reward_prefix = bytes32(genesis_challenge[:16] + b"\x00" * 16)
+        self.pool_reward_prefix_hash: bytes32 = atom_hash(self.pool_reward_prefix)
+        self.singleton_mod_hash_hash: bytes32 = atom_hash(SINGLETON_MOD_HASH)
+        self.launcher_hash_hash: bytes32 = atom_hash(SINGLETON_LAUNCHER_HASH)
+
+    def p2_singleton_puzzle_hash(self, launcher_id: bytes32, delay_time: int, delay_ph: bytes32) -> bytes32:
+        # Same as launcher_id_to_p2_puzzle_hash, the pool address that plots are made for
+        return curried_tree_hash(
+            P2_SINGLETON_HASH,
+            self.singleton_mod_hash_hash,
+            atom_hash(launcher_id),
+            self.launcher_hash_hash,
+            Program.to(delay_time).get_tree_hash(),
+            atom_hash(delay_ph),
+        )
+
+    def inner_puzzle_hash(
+        self,
+        state: int,
+        target_puzzle_hash: bytes32,
+        relative_lock_height: int,
+        owner_pubkey: G1Element,
+        p2_singleton_puzzle_hash: bytes32,
+    ) -> bytes32:
+        # The waiting room puzzle is always needed, the pool member puzzle escapes to it by hash
+        target_hash: bytes32 = atom_hash(target_puzzle_hash)
+        p2_singleton_hash: bytes32 = atom_hash(p2_singleton_puzzle_hash)
+        owner_pubkey_hash: bytes32 = atom_hash(bytes(owner_pubkey))
+        waiting_room_hash: bytes32 = curried_tree_hash(
+            POOL_WAITING_ROOM_HASH,
+            target_hash,
+            p2_singleton_hash,
+            owner_pubkey_hash,
+            self.pool_reward_prefix_hash,
+            Program.to(relative_lock_height).get_tree_hash(),
+        )
+        if state == SELF_POOLING:
+            return waiting_room_hash
+        elif state == FARMING_TO_POOL:
+            return curried_tree_hash(
+                POOL_MEMBER_HASH,
+                target_hash,
+                p2_singleton_hash,
+                owner_pubkey_hash,
+                self.pool_reward_prefix_hash,
+                atom_hash(waiting_room_hash),
+            )
+        raise ValueError("Invalid initial state")
+
+    def full_puzzle_hash(self, inner_puzzle_hash: bytes32, launcher_id: bytes32) -> bytes32:
+        # Same as create_full_puzzle(inner_puzzle, launcher_id).get_tree_hash(), the singleton's puzzle hash
+        singleton_struct_hash: bytes32 = pair_hash(
+            self.singleton_mod_hash_hash, pair_hash(atom_hash(launcher_id), self.launcher_hash_hash)
+        )
+        return curried_tree_hash(SINGLETON_MOD_HASH, singleton_struct_hash, inner_puzzle_hash)
+
+
+_templates: Dict[Union[str, bytes], PoolPuzzleTemplate] = {}
+
+
+def get_pool_puzzle_template(constants: ConsensusConstants) -> PoolPuzzleTemplate:
+    # One per network, shared by every wallet in the process like the consensus constants. Overrides
+    # can give the genesis challenge as hex, it's only parsed the first time
+    key = constants.GENESIS_CHALLENGE
+    if key not in _templates:
+        _templates[key] = PoolPuzzleTemplate(bytes32(hexstr_to_bytes(key)) if isinstance(key, str) else bytes32(key))
+    return _templates[key]
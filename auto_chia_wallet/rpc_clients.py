@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.rpc.rpc_client import RpcClient
+from chia.rpc.wallet_rpc_client import WalletRpcClient
+
+from auto_chia_wallet.metrics import instrument_client
+
+
+def ssl_config(config: Dict) -> Dict:
+    return {
+        "private_ssl_ca": {
+            "crt": Path(config["ssl"]["private_ssl_ca"]["crt"]),
+            "key": Path(config["ssl"]["private_ssl_ca"]["key"]),
+        },
+        "daemon_ssl": {
+            "private_crt": Path(config["ssl"]["daemon_ssl"]["private_crt"]),
+            "private_key": Path(config["ssl"]["daemon_ssl"]["private_key"]),
+        },
+    }
+
+
+async def create_full_node_client(config: Dict) -> FullNodeRpcClient:
+    client: FullNodeRpcClient = await FullNodeRpcClient.create(
+        config["full_node"]["hostname"],
+        config["full_node"]["full_node_rpc_port"],
+        config["root_path"],
+        ssl_config(config),
+    )
+    return instrument_client(client, "full_node")
+
+
+async def create_wallet_client(config: Dict) -> WalletRpcClient:
+    client: WalletRpcClient = await WalletRpcClient.create(
+        config["feed_wallet"]["hostname"],
+        config["feed_wallet"]["wallet_rpc_port"],
+        config["root_path"],
+        ssl_config(config),
+    )
+    return instrument_client(client, "wallet")
+
+
+class RpcClientPool:
+    """
+    Hands out one client per type, host and port, so the SSL context, certificates and HTTPS
+    session are set up once instead of once per wallet. Clients from the pool are owned by
+    the pool, wallets given one must not close it.
+    """
+
+    clients: Dict[Tuple[str, str, int], RpcClient]
+
+    def __init__(self):
+        self.clients = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_full_node_client(self, config: Dict) -> FullNodeRpcClient:
+        key = ("full_node", config["full_node"]["hostname"], config["full_node"]["full_node_rpc_port"])
+        return await self._get(key, create_full_node_client, config)
+
+    async def get_wallet_client(self, config: Dict) -> WalletRpcClient:
+        key = ("wallet", config["feed_wallet"]["hostname"], config["feed_wallet"]["wallet_rpc_port"])
+        return await self._get(key, create_wallet_client, config)
+
+    async def _get(self, key: Tuple[str, str, int], create, config: Dict):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if key not in self.clients:
+                self.clients[key] = await create(config)
+            return self.clients[key]
+
+    async def close(self):
+        clients = list(self.clients.values())
+        self.clients = {}
+        for client in clients:
+            client.close()
+        for client in clients:
+            await client.await_closed()
+
+
+_client_pool: Optional[RpcClientPool] = None
+
+
+def get_client_pool() -> RpcClientPool:
+    # One pool per process, which also means one per warm Lambda container
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = RpcClientPool()
+    return _client_pool
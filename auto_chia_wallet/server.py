@@ -0,0 +1,161 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from auto_chia_wallet.commands import generate_plotnft
+from auto_chia_wallet.config import Config
+from auto_chia_wallet.fake_wallet import pool_state_template
+from auto_chia_wallet.feed_wallet import FeedWalletManager
+from auto_chia_wallet.metrics import metrics
+from auto_chia_wallet.rpc_clients import RpcClientPool
+from auto_chia_wallet.watcher import BlockWatcher
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"  # queued, running, success, error
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    result: Optional[Dict] = None
+
+    def to_json(self) -> Dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created": self.created,
+            "finished": self.finished,
+            "result": self.result,
+        }
+
+
+class PlotNFTServer:
+    """
+    Local HTTP API for generating PlotNFTs from a long running process. Requests are queued
+    up to serve.queue_size and answered with 429 beyond that, serve.workers jobs run at once,
+    and every job shares the same RPC clients, pool state and logged in feed wallet.
+
+        POST /plotnft     queue a new PlotNFT, returns {"job_id": ...}
+        GET  /jobs/{id}   job status, with the generated account once finished
+        GET  /metrics     stage timings and RPC counters, in the Prometheus text format
+    """
+
+    config: Config
+    client_pool: RpcClientPool
+    queue: asyncio.Queue
+    jobs: "OrderedDict[str, Job]"
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.client_pool = RpcClientPool()
+        self.queue = asyncio.Queue(maxsize=config.serve.queue_size)
+        self.jobs = OrderedDict()
+        self.feed_manager: Optional[FeedWalletManager] = None
+        self.workers: List[asyncio.Task] = []
+        self.runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes(
+            [
+                web.post("/plotnft", self.post_plotnft),
+                web.get("/jobs/{job_id}", self.get_job),
+                web.get("/metrics", self.get_metrics),
+            ]
+        )
+        return app
+
+    async def start(self):
+        config: Dict = asdict(self.config)
+        # Fails on a pool that can't be reached before serving anything, and fills the pool info cache
+        await pool_state_template(config)
+        # One feed wallet login, and one watcher confirming every job's feed transaction per block
+        wallet_client = await self.client_pool.get_wallet_client(config)
+        watcher = BlockWatcher(
+            await self.client_pool.get_full_node_client(config),
+            config["wait"],
+            wallet_client,
+            config["feed_wallet"]["id"],
+            config["full_node"]["coin_query_chunk_size"],
+        )
+        self.feed_manager = await FeedWalletManager.connect(config, wallet_client, watcher)
+        self.workers = [asyncio.create_task(self.worker()) for _ in range(self.config.serve.workers)]
+        self.runner = web.AppRunner(self.make_app())
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.config.serve.hostname, self.config.serve.port).start()
+        print(f"Serving on http://{self.config.serve.hostname}:{self.config.serve.port}")
+
+    async def stop(self):
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        if self.feed_manager is not None:
+            await self.feed_manager.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+        await self.client_pool.close()
+
+    async def post_plotnft(self, request: web.Request) -> web.Response:
+        job = Job(id=uuid.uuid4().hex)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return web.json_response({"error": "queue is full, try again later"}, status=429)
+        self.jobs[job.id] = job
+        self._forget_finished_jobs()
+        return web.json_response({"job_id": job.id}, status=202)
+
+    async def get_job(self, request: web.Request) -> web.Response:
+        job: Optional[Job] = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": "unknown job"}, status=404)
+        return web.json_response(job.to_json())
+
+    async def get_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=metrics.prometheus_text(), content_type="text/plain", charset="utf-8")
+
+    async def worker(self):
+        while True:
+            job: Job = await self.queue.get()
+            job.status = "running"
+            try:
+                job.result = await generate_plotnft(
+                    self.config,
+                    use_feed_wallet=True,
+                    use_key_pool=self.config.serve.use_key_pool,
+                    client_pool=self.client_pool,
+                    # From the pool info cache, so it's refreshed once the pool's info is older than its ttl
+                    pool_template=await pool_state_template(asdict(self.config)),
+                    feed_manager=self.feed_manager,
+                )
+                job.status = job.result["status"]
+            except Exception as e:
+                job.result = {"status": "error", "data": repr(e)}
+                job.status = "error"
+            finally:
+                job.finished = time.time()
+                self.queue.task_done()
+
+    def _forget_finished_jobs(self):
+        # Keeps memory bounded, the oldest finished jobs are dropped first
+        while len(self.jobs) > self.config.serve.max_jobs:
+            for job_id, job in self.jobs.items():
+                if job.finished is not None:
+                    del self.jobs[job_id]
+                    break
+            else:
+                return
+
+
+async def serve(config: Config):
+    server = PlotNFTServer(config)
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+from dataclasses import asdict
+from typing import Dict, Optional
+
+from auto_chia_wallet.commands import generate_plotnft
+from auto_chia_wallet.config import Config, load_config_from_file
+from auto_chia_wallet.fake_wallet import get_constants, pool_state_template
+from auto_chia_wallet.rpc_clients import RpcClientPool, get_client_pool
+
+# Everything below lives for as long as the container does, so warm invocations only pay for the spend
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    global _config
+    if _config is None:
+        with open(os.environ.get("AUTO_CHIA_WALLET_CONFIG", "./config.yaml"), "r") as file:
+            _config = load_config_from_file(file)
+        # Built once here, every wallet after this gets the cached constants
+        get_constants(_config.overrides)
+    return _config
+
+
+async def handle(event: Dict) -> Dict:
+    config: Config = get_config()
+    client_pool: RpcClientPool = get_client_pool()
+    nft_data = await generate_plotnft(
+        config,
+        use_feed_wallet=True,
+        use_key_pool=bool(event.get("use_key_pool", False)),
+        client_pool=client_pool,
+        # The pool's info is cached for the life of the container, and refreshed after pool_info.cache_ttl
+        pool_template=await pool_state_template(asdict(config)),
+        eager=bool(event.get("eager", False)),
+    )
+    return {
+        "statusCode": 200 if nft_data.get("status") == "success" else 500,
+        "headers": {"Access-Control-Allow-Origin": "*", "Access-Control-Allow-Methods": "GET"},
+        "body": json.dumps(nft_data),
+    }
+
+
+def lambda_handler(event, context):
+    # A persistent loop, rather than asyncio.run, keeps the pooled RPC clients usable between invocations
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(handle(event or {}))
@@ -0,0 +1,123 @@
+import asyncio
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Union
+
+from blspy import PrivateKey
+from chia.consensus.constants import ConsensusConstants
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.spend_bundle import SpendBundle
+from chia.util.byte_types import hexstr_to_bytes
+from chia.wallet.secret_key_store import SecretKeyStore
+from chia.wallet.sign_coin_spends import sign_coin_spends
+
+
+def agg_sig_me_additional_data(constants: ConsensusConstants) -> bytes32:
+    # Overrides can give it as hex
+    if isinstance(constants.AGG_SIG_ME_ADDITIONAL_DATA, str):
+        return bytes32(hexstr_to_bytes(constants.AGG_SIG_ME_ADDITIONAL_DATA))
+    return bytes32(constants.AGG_SIG_ME_ADDITIONAL_DATA)
+
+
+@dataclass(frozen=True)
+class SigningJob:
+    # Plain bytes so jobs can be passed to worker processes, like KeyBundle
+    spend_bundle: bytes
+    secret_keys: List[bytes]
+
+
+async def sign_job(job: SigningJob, additional_data: bytes, max_cost: int) -> SpendBundle:
+    secret_key_store = SecretKeyStore()
+    for secret_key in job.secret_keys:
+        secret_key_store.save_secret_key(PrivateKey.from_bytes(secret_key))
+    unsigned: SpendBundle = SpendBundle.from_bytes(job.spend_bundle)
+    return await sign_coin_spends(
+        unsigned.coin_spends, secret_key_store.secret_key_for_public_key, additional_data, max_cost
+    )
+
+
+async def sign_jobs(jobs: List[SigningJob], additional_data: bytes, max_cost: int) -> List[Union[bytes, str]]:
+    # A signed spend bundle per job in order, or why it couldn't be signed, one bad job doesn't fail the rest
+    results: List[Union[bytes, str]] = []
+    for job in jobs:
+        try:
+            results.append(bytes(await sign_job(job, additional_data, max_cost)))
+        except Exception as e:
+            results.append(repr(e))
+    return results
+
+
+def sign_jobs_in_worker(jobs: List[SigningJob], additional_data: bytes, max_cost: int) -> List[Union[bytes, str]]:
+    return asyncio.run(sign_jobs(jobs, additional_data, max_cost))
+
+
+class BatchSigner:
+    """
+    Signs the launcher spends of a batch in a pool of worker processes, or threads, instead of
+    one wallet at a time on the event loop. Jobs are split into one chunk per worker, so each
+    worker gets a single round trip, and results come back in the order the jobs were given.
+    A chunk the pool fails to run, a worker that died or jobs that couldn't be pickled, is
+    signed on the event loop instead, as its wallets are already funded.
+    """
+
+    workers: int
+    executor_type: str
+    executor: Executor
+
+    def __init__(self, workers: int = 0, executor: str = "process"):
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unknown signing executor: '{executor}', expected 'process' or 'thread'")
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.executor_type = executor
+        self.executor = self._make_executor()
+
+    def _make_executor(self) -> Executor:
+        if self.executor_type == "process":
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    async def sign(
+        self, jobs: List[SigningJob], additional_data: bytes, max_cost: int
+    ) -> List[Union[SpendBundle, Exception]]:
+        if len(jobs) == 0:
+            return []
+        loop = asyncio.get_running_loop()
+        # Chia's sized bytes classes can't be pickled, workers get plain bytes
+        additional_data = bytes(additional_data)
+        chunk_size: int = -(-len(jobs) // self.workers)
+        chunks: List[List[SigningJob]] = [jobs[start : start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(self.executor, sign_jobs_in_worker, chunk, additional_data, max_cost)
+                for chunk in chunks
+            ],
+            return_exceptions=True,
+        )
+        if any(isinstance(chunk_results, BrokenExecutor) for chunk_results in results):
+            # A broken pool fails every later call too, the next batch gets a fresh one
+            self.executor.shutdown(wait=False)
+            self.executor = self._make_executor()
+        results = [
+            (
+                await self._sign_inline(chunk, chunk_results, additional_data, max_cost)
+                if isinstance(chunk_results, Exception)
+                else chunk_results
+            )
+            for chunk, chunk_results in zip(chunks, results)
+        ]
+        return [
+            SpendBundle.from_bytes(result) if isinstance(result, bytes) else ValueError(f"Signing failed: {result}")
+            for chunk_results in results
+            for result in chunk_results
+        ]
+
+    @staticmethod
+    async def _sign_inline(
+        chunk: List[SigningJob], error: Exception, additional_data: bytes, max_cost: int
+    ) -> List[Union[bytes, str]]:
+        print(f"Signing {len(chunk)} spends in this process, the signing pool failed: {error!r}")
+        return await sign_jobs(chunk, additional_data, max_cost)
+
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,88 @@
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from chia.consensus.constants import ConsensusConstants
+from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.types.spend_bundle import SpendBundle
+
+from auto_chia_wallet.metrics import metrics
+from auto_chia_wallet.validation import ValidationResult, validate_spend_bundles
+
+# The mempool only accepts a single spend bundle up to half of the block cost limit
+MEMPOOL_BUNDLE_COST_FACTOR = 0.5
+
+
+def max_bundle_cost(constants: ConsensusConstants) -> int:
+    return int(constants.MAX_BLOCK_COST_CLVM * MEMPOOL_BUNDLE_COST_FACTOR)
+
+
+def pack_spend_bundles(costs: List[int], max_cost: int) -> List[List[int]]:
+    """
+    Groups spend bundles, by the index of their cost, into as few groups as possible
+    where each group stays under max_cost once aggregated. Takes each bundle's exact
+    cost, their sum is a little over the aggregate's as it's serialized once
+    """
+    groups: List[List[int]] = []
+    group_cost = 0
+    for index, cost in enumerate(costs):
+        if cost > max_cost:
+            raise ValueError(f"Spend bundle {index} exceeds the cost limit: {cost} > {max_cost}")
+        if len(groups) == 0 or group_cost + cost > max_cost:
+            groups.append([])
+            group_cost = 0
+        groups[-1].append(index)
+        group_cost += cost
+    return groups
+
+
+async def push_spend_bundles(
+    node_client: FullNodeRpcClient,
+    spend_bundles: List[SpendBundle],
+    constants: ConsensusConstants,
+    on_pushed: Optional[Callable[[List[int], List[Optional[Exception]]], None]] = None,
+    executor: Optional[Executor] = None,
+) -> List[Optional[Exception]]:
+    """
+    Aggregates the spend bundles and submits them in as few push_tx calls as the
+    cost limit allows. Returns the error, if any, for each of the input bundles.
+    Bundles that fail local validation, or cost too much to push even on their own,
+    are left out so they can't sink the rest. on_pushed is given the indices and
+    errors of bundles as soon as they're final, the rejected ones and then each push.
+    Validation runs in executor, the loop's default threads without one
+    """
+    errors: List[Optional[Exception]] = [None] * len(spend_bundles)
+    max_cost: int = max_bundle_cost(constants)
+    valid: List[int] = []
+    costs: List[int] = []
+    with metrics.timer("validate"):
+        results: List[ValidationResult] = await validate_spend_bundles(spend_bundles, constants, executor)
+    for index, (spend_bundle, result) in enumerate(zip(spend_bundles, results)):
+        if result.error is not None:
+            errors[index] = ValueError(
+                f"Spend bundle {spend_bundle.name().hex()} failed local validation: {result.error}"
+            )
+        elif result.cost > max_cost:
+            errors[index] = ValueError(
+                f"Spend bundle {spend_bundle.name().hex()} exceeds the cost limit: {result.cost} > {max_cost}"
+            )
+        else:
+            valid.append(index)
+            costs.append(result.cost)
+    rejected: List[int] = [index for index, error in enumerate(errors) if error is not None]
+    if on_pushed is not None and len(rejected) > 0:
+        on_pushed(rejected, [errors[index] for index in rejected])
+    for valid_group in pack_spend_bundles(costs, max_cost):
+        group: List[int] = [valid[index] for index in valid_group]
+        aggregate: SpendBundle = SpendBundle.aggregate([spend_bundles[index] for index in group])
+        try:
+            with metrics.timer("push"):
+                push_tx_response: Dict = await node_client.push_tx(aggregate)
+            if push_tx_response["status"] != "SUCCESS":
+                raise ValueError(f"Error submitting aggregated spend_bundle: {push_tx_response}")
+            print(f"Submitted {len(group)} spend_bundles successfully: {aggregate.name().hex()}")
+        except Exception as e:
+            for index in group:
+                errors[index] = e
+        if on_pushed is not None:
+            on_pushed(group, [errors[index] for index in group])
+    return errors
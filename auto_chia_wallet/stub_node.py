@@ -0,0 +1,436 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+from blspy import G2Element
+from chia.consensus.block_record import BlockRecord
+from chia.server.server import ssl_context_for_server
+from chia.ssl.create_ssl import generate_ca_signed_cert, make_ca_cert
+from chia.types.blockchain_format.classgroup import ClassgroupElement
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.program import Program, SerializedProgram
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.types.coin_spend import CoinSpend
+from chia.types.spend_bundle import SpendBundle
+from chia.util.bech32m import decode_puzzle_hash, encode_puzzle_hash
+from chia.util.hash import std_hash
+from chia.util.ints import uint8, uint32, uint64, uint128
+from chia.wallet.transaction_record import TransactionRecord
+from chia.wallet.util.transaction_type import TransactionType
+
+from auto_chia_wallet.config import Config, DaemonSSL, PoolInfo, PrivateSSL, SSLConfig
+
+
+@dataclass
+class StubSettings:
+    block_time: float = 1.0  # Seconds between blocks, every mempool bundle goes into the next one
+    latency: float = 0.0  # Seconds added to every RPC
+    jitter: float = 0.0  # Up to this many more seconds, picked at random per RPC
+    failure_rate: float = 0.0  # Fraction of RPCs answered with an error
+    feed_coins: int = 10  # Coins the feed wallet starts with
+    feed_coin_amount: int = 1000000000
+    fingerprint: int = 1234567890
+    prefix: str = "xch"
+
+
+def stub_puzzle(index: int) -> Program:
+    # (r (c (q . index) 1)) returns its solution as the conditions, the index gives each address its own puzzle hash
+    return Program.to([6, [4, (1, index), 1]])
+
+
+class StubChain:
+    """
+    Coin set, mempool and blocks, enough of a full node for the RPCs this package calls.
+    Bundles are checked for unknown and double spent coins, signatures and costs are not.
+    """
+
+    def __init__(self):
+        self.height = 0
+        self.header_hash: bytes32 = std_hash(b"stub genesis")
+        self.coins: Dict[bytes32, CoinRecord] = {}
+        self.by_puzzle_hash: Dict[bytes32, List[bytes32]] = {}
+        self.mempool: Dict[bytes32, SpendBundle] = {}
+        self.mempool_removals: Dict[bytes32, bytes32] = {}
+        self.included: Dict[bytes32, int] = {}
+
+    def add_coin(self, coin: Coin):
+        self.coins[coin.name()] = CoinRecord(coin, uint32(self.height), uint32(0), False, False, uint64(time.time()))
+        self.by_puzzle_hash.setdefault(coin.puzzle_hash, []).append(coin.name())
+
+    def coin_records(self, puzzle_hashes: List[bytes32], include_spent_coins: bool) -> List[CoinRecord]:
+        records: List[CoinRecord] = []
+        for puzzle_hash in puzzle_hashes:
+            for name in self.by_puzzle_hash.get(puzzle_hash, []):
+                if include_spent_coins or not self.coins[name].spent:
+                    records.append(self.coins[name])
+        return records
+
+    def push(self, spend_bundle: SpendBundle) -> str:
+        # Raises like the full node's push_tx, a bundle that's already in the mempool is a success
+        name: bytes32 = spend_bundle.name()
+        if name in self.mempool or name in self.included:
+            return "SUCCESS"
+        additions: Set[bytes32] = {coin.name() for coin in spend_bundle.additions()}
+        removals: List[Coin] = spend_bundle.removals()
+        for coin in removals:
+            if coin.name() in additions:
+                continue
+            record: Optional[CoinRecord] = self.coins.get(coin.name())
+            if record is None:
+                raise ValueError(f"Failed to include transaction {name}, error UNKNOWN_UNSPENT")
+            if record.spent:
+                raise ValueError(f"Failed to include transaction {name}, error DOUBLE_SPEND")
+            if coin.name() in self.mempool_removals:
+                raise ValueError(f"Failed to include transaction {name}, error MEMPOOL_CONFLICT")
+        self.mempool[name] = spend_bundle
+        for coin in removals:
+            self.mempool_removals[coin.name()] = name
+        return "SUCCESS"
+
+    def new_block(self):
+        self.height += 1
+        self.header_hash = std_hash(self.header_hash + bytes(uint32(self.height)))
+        for name, spend_bundle in self.mempool.items():
+            for coin in spend_bundle.additions():
+                self.add_coin(coin)
+            for coin in spend_bundle.removals():
+                self.coins[coin.name()] = replace(self.coins[coin.name()], spent=True, spent_block_index=self.height)
+            self.included[name] = self.height
+        self.mempool = {}
+        self.mempool_removals = {}
+
+    def peak(self) -> BlockRecord:
+        # Only the height is read by the clients, the rest just has to parse
+        return BlockRecord(
+            header_hash=self.header_hash,
+            prev_hash=std_hash(self.header_hash),
+            height=uint32(self.height),
+            weight=uint128(self.height),
+            total_iters=uint128(self.height),
+            signage_point_index=uint8(0),
+            challenge_vdf_output=ClassgroupElement.get_default_element(),
+            infused_challenge_vdf_output=None,
+            reward_infusion_new_challenge=self.header_hash,
+            challenge_block_info_hash=self.header_hash,
+            sub_slot_iters=uint64(1),
+            pool_puzzle_hash=self.header_hash,
+            farmer_puzzle_hash=self.header_hash,
+            required_iters=uint64(0),
+            deficit=uint8(0),
+            overflow=False,
+            prev_transaction_block_height=uint32(self.height),
+            timestamp=uint64(time.time()),
+            prev_transaction_block_hash=None,
+            fees=uint64(0),
+            reward_claims_incorporated=None,
+            finished_challenge_slot_hashes=None,
+            finished_infused_challenge_slot_hashes=None,
+            finished_reward_slot_hashes=None,
+            sub_epoch_summary_included=None,
+        )
+
+
+class StubWallet:
+    """
+    A feed wallet whose coins are locked by stub_puzzle, so its spends need no keys and can
+    be aggregated with real launcher spends the same way the wallet node's transactions are
+    """
+
+    def __init__(self, chain: StubChain, settings: StubSettings):
+        self.chain = chain
+        self.settings = settings
+        self.puzzles: Dict[bytes32, Program] = {}
+        self.transactions: Dict[bytes32, TransactionRecord] = {}
+        for _ in range(settings.feed_coins):
+            puzzle_hash: bytes32 = self.new_puzzle_hash()
+            chain.add_coin(Coin(std_hash(puzzle_hash), puzzle_hash, uint64(settings.feed_coin_amount)))
+
+    def new_puzzle_hash(self) -> bytes32:
+        puzzle: Program = stub_puzzle(len(self.puzzles))
+        self.puzzles[puzzle.get_tree_hash()] = puzzle
+        return puzzle.get_tree_hash()
+
+    def spendable_coins(self) -> List[Coin]:
+        return [
+            record.coin
+            for record in self.chain.coin_records(list(self.puzzles.keys()), False)
+            if record.coin.name() not in self.chain.mempool_removals
+        ]
+
+    def balance(self) -> Dict:
+        confirmed: int = sum(record.coin.amount for record in self.chain.coin_records(list(self.puzzles.keys()), False))
+        spendable: int = sum(coin.amount for coin in self.spendable_coins())
+        return {
+            "wallet_id": 1,
+            "confirmed_wallet_balance": confirmed,
+            "unconfirmed_wallet_balance": spendable,
+            "spendable_balance": spendable,
+            "max_send_amount": spendable,
+            "pending_change": 0,
+        }
+
+    def create_transaction(
+        self, additions: List[Tuple[bytes32, int]], fee: int, coins: Optional[List[Coin]] = None
+    ) -> TransactionRecord:
+        total: int = sum(amount for _, amount in additions) + fee
+        if coins is None:
+            coins = []
+            for coin in sorted(self.spendable_coins(), key=lambda c: c.amount, reverse=True):
+                if sum(c.amount for c in coins) >= total:
+                    break
+                coins.append(coin)
+        if sum(coin.amount for coin in coins) < total:
+            raise ValueError(f"Can't send more than {sum(coin.amount for coin in self.spendable_coins())}")
+        conditions: List = [[51, puzzle_hash, amount] for puzzle_hash, amount in additions]
+        change: int = sum(coin.amount for coin in coins) - total
+        if change > 0:
+            conditions.append([51, self.new_puzzle_hash(), change])
+        coin_spends: List[CoinSpend] = [
+            CoinSpend(
+                coin,
+                SerializedProgram.from_program(self.puzzles[coin.puzzle_hash]),
+                SerializedProgram.from_program(Program.to(conditions if index == 0 else [])),
+            )
+            for index, coin in enumerate(coins)
+        ]
+        spend_bundle = SpendBundle(coin_spends, G2Element())
+        return TransactionRecord(
+            confirmed_at_height=uint32(0),
+            created_at_time=uint64(time.time()),
+            to_puzzle_hash=additions[0][0],
+            amount=uint64(total - fee),
+            fee_amount=uint64(fee),
+            confirmed=False,
+            sent=uint32(0),
+            spend_bundle=spend_bundle,
+            additions=spend_bundle.additions(),
+            removals=spend_bundle.removals(),
+            wallet_id=uint32(1),
+            sent_to=[],
+            trade_id=None,
+            type=uint32(TransactionType.OUTGOING_TX.value),
+            name=spend_bundle.name(),
+        )
+
+    def send(self, transaction: TransactionRecord) -> TransactionRecord:
+        self.chain.push(transaction.spend_bundle)
+        transaction = replace(transaction, sent=uint32(1))
+        self.transactions[transaction.name] = transaction
+        return transaction
+
+    def transaction(self, tx_id: bytes32) -> TransactionRecord:
+        if tx_id not in self.transactions:
+            raise ValueError(f"Transaction 0x{tx_id.hex()} not found")
+        transaction: TransactionRecord = self.transactions[tx_id]
+        if not transaction.confirmed and tx_id in self.chain.included:
+            transaction = replace(transaction, confirmed=True, confirmed_at_height=uint32(self.chain.included[tx_id]))
+            self.transactions[tx_id] = transaction
+        return transaction
+
+    def transactions_between(self, start: int, end: int) -> List[TransactionRecord]:
+        # Paged like the wallet's transaction store in chia 1.2, highest confirmed_at_height first, so unconfirmed
+        # transactions (height 0) are the first to fall off a page once there are more transactions than fit
+        transactions: List[TransactionRecord] = sorted(
+            [self.transaction(tx_id) for tx_id in list(self.transactions.keys())],
+            key=lambda transaction: transaction.confirmed_at_height,
+            reverse=True,
+        )
+        return list(reversed(transactions[start:end]))
+
+    def transaction_json(self, transaction: TransactionRecord) -> Dict:
+        # Only get_transactions adds the address, the other wallet RPCs return the plain record
+        return {
+            **transaction.to_json_dict(),
+            "to_address": encode_puzzle_hash(transaction.to_puzzle_hash, self.settings.prefix),
+        }
+
+
+class StubServer:
+    """
+    Serves a StubChain as a full node RPC and a StubWallet as a wallet RPC, over the same
+    mutual TLS as chia, so FullNodeRpcClient and WalletRpcClient connect to it unchanged.
+    Every RPC is counted by method, and delayed or failed as the settings say.
+    """
+
+    settings: StubSettings
+    chain: StubChain
+    wallet: StubWallet
+    rpc_counts: Counter
+
+    def __init__(self, settings: StubSettings):
+        self.settings = settings
+        self.chain = StubChain()
+        self.wallet = StubWallet(self.chain, settings)
+        self.rpc_counts = Counter()
+        self.runners: List[web.AppRunner] = []
+        self.full_node_port = 0
+        self.wallet_port = 0
+        self._block_task: Optional[asyncio.Task] = None
+
+    def full_node_routes(self) -> Dict[str, Callable[[Dict], Dict]]:
+        return {
+            "get_blockchain_state": lambda request: {
+                "blockchain_state": {
+                    "peak": self.chain.peak().to_json_dict(),
+                    "sync": {"synced": True, "sync_mode": False, "sync_progress_height": 0, "sync_tip_height": 0},
+                    "mempool_size": len(self.chain.mempool),
+                }
+            },
+            "get_coin_records_by_puzzle_hash": lambda request: {
+                "coin_records": [
+                    record.to_json_dict()
+                    for record in self.chain.coin_records(
+                        [bytes32.fromhex(request["puzzle_hash"])], request.get("include_spent_coins", True)
+                    )
+                ]
+            },
+            "get_coin_records_by_puzzle_hashes": lambda request: {
+                "coin_records": [
+                    record.to_json_dict()
+                    for record in self.chain.coin_records(
+                        [bytes32.fromhex(puzzle_hash) for puzzle_hash in request["puzzle_hashes"]],
+                        request.get("include_spent_coins", True),
+                    )
+                ]
+            },
+            "push_tx": lambda request: {"status": self.chain.push(SpendBundle.from_json_dict(request["spend_bundle"]))},
+        }
+
+    def wallet_routes(self) -> Dict[str, Callable[[Dict], Dict]]:
+        def additions(request: Dict) -> List[Tuple[bytes32, int]]:
+            return [(bytes32.fromhex(addition["puzzle_hash"]), addition["amount"]) for addition in request["additions"]]
+
+        def coins(request: Dict) -> Optional[List[Coin]]:
+            return [Coin.from_json_dict(coin) for coin in request["coins"]] if request.get("coins") else None
+
+        def sent(transaction: TransactionRecord) -> Dict:
+            transaction = self.wallet.send(transaction)
+            return {"transaction": transaction.to_json_dict(), "transaction_id": transaction.name.hex()}
+
+        return {
+            "log_in": lambda request: {"fingerprint": request["fingerprint"]},
+            "get_wallet_balance": lambda request: {"wallet_balance": self.wallet.balance()},
+            "get_next_address": lambda request: {
+                "wallet_id": request["wallet_id"],
+                "address": encode_puzzle_hash(self.wallet.new_puzzle_hash(), self.settings.prefix),
+            },
+            "send_transaction": lambda request: sent(
+                self.wallet.create_transaction(
+                    [(decode_puzzle_hash(request["address"]), request["amount"])], request.get("fee", 0)
+                )
+            ),
+            "send_transaction_multi": lambda request: sent(
+                self.wallet.create_transaction(additions(request), request.get("fee", 0), coins(request))
+            ),
+            "create_signed_transaction": lambda request: {
+                "signed_tx": self.wallet.create_transaction(
+                    additions(request), request.get("fee", 0), coins(request)
+                ).to_json_dict()
+            },
+            "get_transaction": lambda request: {
+                "transaction": self.wallet.transaction(bytes32.fromhex(request["transaction_id"])).to_json_dict(),
+                "transaction_id": request["transaction_id"],
+            },
+            "get_transactions": lambda request: {
+                "transactions": [
+                    self.wallet.transaction_json(transaction)
+                    for transaction in self.wallet.transactions_between(request.get("start", 0), request.get("end", 50))
+                ],
+                "wallet_id": request["wallet_id"],
+            },
+        }
+
+    def make_app(self, routes: Dict[str, Callable[[Dict], Dict]]) -> web.Application:
+        def handler(method: str, route: Callable[[Dict], Dict]):
+            async def handle(request: web.Request) -> web.Response:
+                self.rpc_counts[method] += 1
+                delay: float = self.settings.latency + random.uniform(0, self.settings.jitter)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if random.random() < self.settings.failure_rate:
+                    return web.json_response({"success": False, "error": f"simulated failure of {method}"})
+                try:
+                    response: Dict = route(await request.json())
+                except (ValueError, KeyError) as e:
+                    return web.json_response({"success": False, "error": str(e)})
+                return web.json_response({**response, "success": True})
+
+            return handle
+
+        app = web.Application()
+        app.add_routes([web.post(f"/{method}", handler(method, route)) for method, route in routes.items()])
+        return app
+
+    async def start(self, config: Config, root_path: str) -> Config:
+        """
+        Creates a CA and certificate under root_path, starts both servers on free local ports
+        and the block timer, then returns config pointed at them
+        """
+        root = Path(root_path)
+        ssl = SSLConfig(PrivateSSL(), DaemonSSL())
+        for path in (root / ssl.private_ssl_ca.crt, root / ssl.daemon_ssl.private_crt):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        make_ca_cert(root / ssl.private_ssl_ca.crt, root / ssl.private_ssl_ca.key)
+        generate_ca_signed_cert(
+            (root / ssl.private_ssl_ca.crt).read_bytes(),
+            (root / ssl.private_ssl_ca.key).read_bytes(),
+            root / ssl.daemon_ssl.private_crt,
+            root / ssl.daemon_ssl.private_key,
+        )
+        ssl_context = ssl_context_for_server(
+            root / ssl.private_ssl_ca.crt,
+            root / ssl.private_ssl_ca.key,
+            root / ssl.daemon_ssl.private_crt,
+            root / ssl.daemon_ssl.private_key,
+        )
+        ports: List[int] = []
+        for routes in (self.full_node_routes(), self.wallet_routes()):
+            runner = web.AppRunner(self.make_app(routes))
+            await runner.setup()
+            await web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context).start()
+            self.runners.append(runner)
+            ports.append(runner.addresses[0][1])
+        self.full_node_port, self.wallet_port = ports
+        self._block_task = asyncio.create_task(self._make_blocks())
+        return replace(
+            config,
+            root_path=str(root),
+            ssl=ssl,
+            prefix=self.settings.prefix,
+            overrides={},
+            pool_info=PoolInfo(),
+            full_node=replace(config.full_node, hostname="127.0.0.1", full_node_rpc_port=self.full_node_port),
+            feed_wallet=replace(
+                config.feed_wallet,
+                id="1",
+                fingerprint=self.settings.fingerprint,
+                hostname="127.0.0.1",
+                wallet_rpc_port=self.wallet_port,
+                inventory_path=str(root / "feed_inventory.json"),
+            ),
+            wait=replace(
+                config.wait,
+                interval=self.settings.block_time / 4,
+                max_interval=self.settings.block_time,
+                backoff=1.0,
+            ),
+        )
+
+    async def _make_blocks(self):
+        while True:
+            await asyncio.sleep(self.settings.block_time)
+            self.chain.new_block()
+
+    async def stop(self):
+        if self._block_task is not None:
+            self._block_task.cancel()
+            await asyncio.gather(self._block_task, return_exceptions=True)
+        for runner in self.runners:
+            await runner.cleanup()
+        self.runners = []
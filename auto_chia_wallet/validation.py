@@ -0,0 +1,161 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Set
+
+from blspy import AugSchemeMPL, G1Element
+from chia.consensus.constants import ConsensusConstants
+from chia.consensus.cost_calculator import NPCResult, calculate_cost_of_program
+from chia.full_node.bundle_tools import simple_solution_generator
+from chia.full_node.mempool_check_conditions import get_name_puzzle_conditions
+from chia.types.announcement import Announcement
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.condition_opcodes import ConditionOpcode
+from chia.types.generator_types import BlockGenerator
+from chia.types.spend_bundle import SpendBundle
+from chia.util.clvm import int_from_bytes
+from chia.util.condition_tools import pkm_pairs
+from chia.util.errors import Err
+from chia.util.generator_tools import additions_for_npc
+
+from auto_chia_wallet.signing import agg_sig_me_additional_data
+
+# Bundles validated by name, bounded like serve's finished jobs
+MAX_CACHED_RESULTS = 10000
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    cost: int
+    fee: int
+    error: Optional[str] = None
+
+
+_results: "OrderedDict[bytes32, ValidationResult]" = OrderedDict()
+
+
+def validate_spend_bundle(spend_bundle: SpendBundle, constants: ConsensusConstants) -> ValidationResult:
+    """
+    Runs the bundle's puzzles the way the full node's mempool does, and checks what can be checked
+    without the coin set: the conditions, that every asserted announcement is created in the bundle,
+    amounts, and the aggregate signature. Gives the exact CLVM cost the mempool will charge. Results
+    are cached by bundle name, so a bundle checked before packing isn't run again before its push
+    """
+    name: bytes32 = spend_bundle.name()
+    result: Optional[ValidationResult] = _cached(name)
+    if result is None:
+        result = _store(name, _validate(spend_bundle, constants))
+    return result
+
+
+async def validate_spend_bundles(
+    spend_bundles: List[SpendBundle], constants: ConsensusConstants, executor: Optional[Executor] = None
+) -> List[ValidationResult]:
+    # validate_spend_bundle off the event loop, in executor or the loop's default threads. A bundle
+    # the executor fails to run, say a broken process pool, is validated on the loop instead
+    loop = asyncio.get_running_loop()
+    names: List[bytes32] = [spend_bundle.name() for spend_bundle in spend_bundles]
+    results: List[Optional[ValidationResult]] = [_cached(name) for name in names]
+    uncached: List[int] = [index for index, result in enumerate(results) if result is None]
+    # Chia's sized bytes classes can't be pickled, plain bytes do for process workers
+    worker_constants: ConsensusConstants = constants.replace(
+        **{name: bytes(value) for name, value in asdict(constants).items() if isinstance(value, bytes)}
+    )
+    validated = await asyncio.gather(
+        *[
+            loop.run_in_executor(executor, validate_spend_bundle_bytes, bytes(spend_bundles[index]), worker_constants)
+            for index in uncached
+        ],
+        return_exceptions=True,
+    )
+    failed: List[Exception] = [result for result in validated if isinstance(result, Exception)]
+    if len(failed) > 0:
+        print(f"Validating {len(failed)} spend bundles in this process, the executor failed: {failed[0]!r}")
+    for index, result in zip(uncached, validated):
+        if isinstance(result, Exception):
+            result = _validate(spend_bundles[index], constants)
+        results[index] = _store(names[index], result)
+    return results
+
+
+def validate_spend_bundle_bytes(spend_bundle: bytes, constants: ConsensusConstants) -> ValidationResult:
+    # For worker processes, which get the bundle serialized and have their own cache
+    return validate_spend_bundle(SpendBundle.from_bytes(spend_bundle), constants)
+
+
+async def check_spend_bundle(
+    spend_bundle: SpendBundle, constants: ConsensusConstants, executor: Optional[Executor] = None
+) -> int:
+    # The exact cost of a valid bundle, raises for one the full node would reject
+    result: ValidationResult = (await validate_spend_bundles([spend_bundle], constants, executor))[0]
+    if result.error is not None:
+        raise ValueError(f"Spend bundle {spend_bundle.name().hex()} failed local validation: {result.error}")
+    return result.cost
+
+
+def _cached(name: bytes32) -> Optional[ValidationResult]:
+    if name not in _results:
+        return None
+    _results.move_to_end(name)
+    return _results[name]
+
+
+def _store(name: bytes32, result: ValidationResult) -> ValidationResult:
+    _results[name] = result
+    while len(_results) > MAX_CACHED_RESULTS:
+        _results.popitem(last=False)
+    return result
+
+
+def _validate(spend_bundle: SpendBundle, constants: ConsensusConstants) -> ValidationResult:
+    generator: BlockGenerator = simple_solution_generator(spend_bundle)
+    npc_result: NPCResult = get_name_puzzle_conditions(
+        generator, constants.MAX_BLOCK_COST_CLVM, cost_per_byte=constants.COST_PER_BYTE, safe_mode=True
+    )
+    if npc_result.error is not None:
+        return ValidationResult(0, 0, Err(npc_result.error).name)
+    cost: int = calculate_cost_of_program(generator.program, npc_result, constants.COST_PER_BYTE)
+
+    removals: List[Coin] = spend_bundle.removals()
+    additions: List[Coin] = additions_for_npc(npc_result.npc_list)
+    if len({coin.name() for coin in removals}) != len(removals):
+        return ValidationResult(cost, 0, Err.DOUBLE_SPEND.name)
+    if len({coin.name() for coin in additions}) != len(additions):
+        return ValidationResult(cost, 0, Err.DUPLICATE_OUTPUT.name)
+    for coin in additions:
+        if coin.amount > constants.MAX_COIN_AMOUNT:
+            return ValidationResult(cost, 0, Err.COIN_AMOUNT_EXCEEDS_MAXIMUM.name)
+    fee: int = sum(coin.amount for coin in removals) - sum(coin.amount for coin in additions)
+    if fee < 0:
+        return ValidationResult(cost, fee, Err.MINTING_COIN.name)
+
+    announcements: Set[bytes32] = set()
+    asserted: List[bytes32] = []
+    reserved_fee = 0
+    for npc in npc_result.npc_list:
+        for opcode, conditions in npc.conditions:
+            for condition in conditions:
+                if opcode == ConditionOpcode.CREATE_COIN_ANNOUNCEMENT:
+                    announcements.add(Announcement(npc.coin_name, condition.vars[0]).name())
+                elif opcode == ConditionOpcode.CREATE_PUZZLE_ANNOUNCEMENT:
+                    announcements.add(Announcement(npc.puzzle_hash, condition.vars[0]).name())
+                elif opcode in (ConditionOpcode.ASSERT_COIN_ANNOUNCEMENT, ConditionOpcode.ASSERT_PUZZLE_ANNOUNCEMENT):
+                    asserted.append(bytes32(condition.vars[0]))
+                elif opcode == ConditionOpcode.RESERVE_FEE:
+                    reserved_fee += int_from_bytes(condition.vars[0])
+    for announcement in asserted:
+        if announcement not in announcements:
+            return ValidationResult(cost, fee, Err.ASSERT_ANNOUNCE_CONSUMED_FAILED.name)
+    if reserved_fee > fee:
+        return ValidationResult(cost, fee, Err.RESERVE_FEE_CONDITION_FAILED.name)
+
+    public_keys, messages = pkm_pairs(npc_result.npc_list, agg_sig_me_additional_data(constants))
+    if not AugSchemeMPL.aggregate_verify(
+        [G1Element.from_bytes(public_key) for public_key in public_keys],
+        messages,
+        spend_bundle.aggregated_signature,
+    ):
+        return ValidationResult(cost, fee, Err.BAD_AGGREGATE_SIGNATURE.name)
+    return ValidationResult(cost, fee)
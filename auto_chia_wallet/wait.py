@@ -0,0 +1,28 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+async def wait_until(check: Callable[[], Awaitable[T]], wait_config: Dict, message: Optional[str] = None) -> T:
+    """
+    Awaits check() until it returns a truthy value, sleeping on the event loop between attempts.
+    The interval grows by wait_config["backoff"] up to wait_config["max_interval"], and an
+    asyncio.TimeoutError is raised once wait_config["timeout"] seconds have passed (0 waits forever)
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline: Optional[float] = start + wait_config["timeout"] if wait_config["timeout"] > 0 else None
+    interval: float = wait_config["interval"]
+    while True:
+        result = await check()
+        if result:
+            return result
+        now = loop.time()
+        if deadline is not None and now >= deadline:
+            raise asyncio.TimeoutError(f"Gave up after {round(now - start)}s: {message or 'wait_until'}")
+        if message is not None:
+            print(f"\r{message}: {round(now - start)} ")
+        sleep_for = interval if deadline is None else min(interval, deadline - now)
+        await asyncio.sleep(sleep_for)
+        interval = min(interval * wait_config["backoff"], wait_config["max_interval"])
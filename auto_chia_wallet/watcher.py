@@ -0,0 +1,142 @@
+import asyncio
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from chia.rpc.full_node_rpc_client import FullNodeRpcClient
+from chia.rpc.wallet_rpc_client import WalletRpcClient
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.wallet.transaction_record import TransactionRecord
+
+from auto_chia_wallet.coins import find_coins_bulk
+from auto_chia_wallet.wait import wait_until
+
+if TYPE_CHECKING:
+    from auto_chia_wallet.fake_wallet import FakeWallet
+
+
+class BlockWatcher:
+    """
+    Tracks the full node's peak height and, only when a new block arrives, checks every
+    waiting wallet with one bulk coin lookup and every outstanding transaction id, resolving
+    the futures of all waiting wallets. RPC load scales with blocks instead of waiters, and
+    with the number of feed transactions rather than the wallets they fund.
+    """
+
+    node_client: FullNodeRpcClient
+    wallet_client: Optional[WalletRpcClient]
+    wallet_id: Optional[str]
+    wait_config: Dict
+    chunk_size: int
+    peak_height: Optional[int]
+
+    def __init__(
+        self,
+        node_client: FullNodeRpcClient,
+        wait_config: Dict,
+        wallet_client: Optional[WalletRpcClient] = None,
+        wallet_id: Optional[str] = None,
+        chunk_size: int = 500,
+    ):
+        self.node_client = node_client
+        self.chunk_size = chunk_size
+        self.wallet_client = wallet_client
+        self.wallet_id = wallet_id
+        self.wait_config = wait_config
+        self.peak_height = None
+        # Coin waiters are keyed by wallet fingerprint, transaction waiters by tx id
+        self.coin_waiters: Dict[str, List[asyncio.Future]] = {}
+        self.coin_wallets: Dict[str, "FakeWallet"] = {}
+        self.transaction_waiters: Dict[bytes32, List[asyncio.Future]] = {}
+        self._new_waiters = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait_for_coins(self, wallet: "FakeWallet") -> Set[Coin]:
+        # Resolves with the first unspent coin found at any of the wallet's puzzle hashes
+        self.coin_wallets[wallet.get_fp()] = wallet
+        return await self._wait(self.coin_waiters, wallet.get_fp())
+
+    async def wait_for_transaction(self, tx_id: bytes32) -> TransactionRecord:
+        if self.wallet_client is None:
+            raise ValueError("BlockWatcher needs a wallet_client to watch transactions")
+        return await self._wait(self.transaction_waiters, tx_id)
+
+    async def _wait(self, waiters: Dict, key):
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiters.setdefault(key, []).append(future)
+        self._new_waiters = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            if self.wait_config["timeout"] > 0:
+                return await asyncio.wait_for(future, self.wait_config["timeout"])
+            return await future
+        finally:
+            if future in waiters.get(key, []):
+                waiters[key].remove(future)
+                if len(waiters[key]) == 0:
+                    del waiters[key]
+
+    async def _run(self):
+        # The deadline belongs to each waiter, the watcher itself polls until nobody is waiting
+        poll_config: Dict = {**self.wait_config, "timeout": 0}
+        try:
+            while len(self.coin_waiters) > 0 or len(self.transaction_waiters) > 0:
+                await wait_until(self._has_new_peak, poll_config)
+                await self.check_pending()
+        except Exception as e:
+            for futures in list(self.coin_waiters.values()) + list(self.transaction_waiters.values()):
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _has_new_peak(self) -> bool:
+        if len(self.coin_waiters) == 0 and len(self.transaction_waiters) == 0:
+            return True
+        blockchain_state: Dict = await self.node_client.get_blockchain_state()
+        peak = blockchain_state["peak"]
+        height: Optional[int] = peak.height if peak is not None else None
+        if height != self.peak_height or self._new_waiters:
+            self.peak_height = height
+            self._new_waiters = False
+            return True
+        return False
+
+    async def check_pending(self):
+        # Wallets nobody waits for anymore are dropped
+        self.coin_wallets = {fingerprint: self.coin_wallets[fingerprint] for fingerprint in self.coin_waiters}
+        if len(self.coin_wallets) > 0:
+            coins: Dict[str, List[Coin]] = await find_coins_bulk(
+                list(self.coin_wallets.values()), self.chunk_size, self.node_client
+            )
+            self._resolve(
+                self.coin_waiters,
+                {
+                    fingerprint: {wallet_coins[0]}
+                    for fingerprint, wallet_coins in coins.items()
+                    if len(wallet_coins) > 0
+                },
+            )
+
+        if len(self.transaction_waiters) > 0:
+            # One get_transaction per id, get_transactions is paged and its order differs between chia versions
+            tx_ids: List[bytes32] = list(self.transaction_waiters.keys())
+            transactions = await asyncio.gather(
+                *[self.wallet_client.get_transaction(self.wallet_id, tx_id) for tx_id in tx_ids], return_exceptions=True
+            )
+            confirmed: Dict[bytes32, TransactionRecord] = {}
+            for tx_id, transaction in zip(tx_ids, transactions):
+                if isinstance(transaction, Exception):
+                    # Such as a transaction the wallet doesn't know, only its own waiters fail
+                    for future in self.transaction_waiters.get(tx_id, []):
+                        if not future.done():
+                            future.set_exception(transaction)
+                elif transaction.confirmed:
+                    confirmed[tx_id] = transaction
+            self._resolve(self.transaction_waiters, confirmed)
+
+    @staticmethod
+    def _resolve(waiters: Dict, results: Dict):
+        for key, result in results.items():
+            for future in waiters.get(key, []):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,72 @@
+"""
+Times how long the CLI takes to start for commands that don't generate anything, and checks that
+none of them imports chia or blspy. Exits with 1 over --budget, the seconds allowed on top of a
+bare interpreter's startup, so provisioning scripts calling autowallet in a loop stay fast:
+
+    python benchmarks/import_time.py --runs 20 --budget 0.15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+# Runs a command through the CLI's entry point, then reports whether any heavy module was imported
+COMMAND = """
+import sys
+sys.argv = ["autowallet"] + sys.argv[1:]
+from auto_chia_wallet.cli import main
+try:
+    main()
+except BaseException:
+    pass
+heavy = sorted(name for name in sys.modules if name.split(".")[0] in ("chia", "blspy", "clvm", "aiohttp"))
+print("HEAVY " + " ".join(heavy[:5]), file=sys.stderr)
+"""
+
+COMMANDS: List[List[str]] = [["version"], ["config"], ["--help"]]
+
+
+def startup_seconds(args: List[str], runs: int) -> float:
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def heavy_modules(command: List[str]) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", COMMAND] + command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    for line in result.stderr.splitlines():
+        if line.startswith("HEAVY"):
+            return line[len("HEAVY") :].strip()
+    return f"command failed: {result.stderr.strip()[-200:]}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CLI startup time benchmark")
+    parser.add_argument("-r", "--runs", type=int, default=10, help="Runs per command, the median is reported")
+    parser.add_argument("--budget", type=float, default=0.15, help="Seconds allowed over bare interpreter startup")
+    args = parser.parse_args()
+
+    interpreter: float = startup_seconds(["-c", "pass"], args.runs)
+    print(f"{'interpreter':<16}{interpreter * 1000:>10.1f}ms")
+    failed = False
+    for command in COMMANDS:
+        seconds: float = startup_seconds(["-c", COMMAND] + command, args.runs) - interpreter
+        heavy: str = heavy_modules(command)
+        over: bool = seconds > args.budget
+        print(f"{' '.join(command):<16}{seconds * 1000:>10.1f}ms" + (" over budget" if over else ""))
+        if heavy:
+            print(f"  imports {heavy}")
+        failed = failed or over or bool(heavy)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
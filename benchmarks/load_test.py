@@ -0,0 +1,138 @@
+"""
+Runs PlotNFT generations against an in-process stub full node and wallet, no chia nodes needed.
+Generations share one client pool, pool state and feed wallet manager, the same as 'autowallet serve':
+
+    python benchmarks/load_test.py --count 200 --concurrency 20 --block-time 2 --latency 0.01
+    python benchmarks/load_test.py --count 200 --concurrency 20 --failure-rate 0.01 --output load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Dict, List
+
+from auto_chia_wallet.commands import generate_plotnft
+from auto_chia_wallet.bench import percentiles
+from auto_chia_wallet.config import Config, load_default_config
+from auto_chia_wallet.fake_wallet import pool_state_template
+from auto_chia_wallet.feed_wallet import FeedWalletManager
+from auto_chia_wallet.rpc_clients import RpcClientPool
+from auto_chia_wallet.stub_node import StubServer, StubSettings
+from auto_chia_wallet.watcher import BlockWatcher
+
+
+async def run_load_test(count: int, concurrency: int, settings: StubSettings, verbose: bool = False) -> Dict:
+    stub = StubServer(settings)
+    with tempfile.TemporaryDirectory() as root_path:
+        config: Config = await stub.start(load_default_config(), root_path)
+        config_dict: Dict = asdict(config)
+        client_pool = RpcClientPool()
+        feed_manager = None
+        try:
+            pool_template: Dict = await pool_state_template(config_dict)
+            wallet_client = await client_pool.get_wallet_client(config_dict)
+            watcher = BlockWatcher(
+                await client_pool.get_full_node_client(config_dict),
+                config_dict["wait"],
+                wallet_client,
+                config_dict["feed_wallet"]["id"],
+                config_dict["full_node"]["coin_query_chunk_size"],
+            )
+            feed_manager = await FeedWalletManager.connect(config_dict, wallet_client, watcher)
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies: List[float] = []
+            errors: List[str] = []
+
+            async def generate():
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        result: Dict = await generate_plotnft(
+                            config,
+                            use_feed_wallet=True,
+                            client_pool=client_pool,
+                            pool_template=pool_template,
+                            feed_manager=feed_manager,
+                        )
+                        if result["status"] != "success":
+                            errors.append(result["data"])
+                            return
+                    except Exception as e:
+                        errors.append(repr(e))
+                        return
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            # Every generation prints its progress and account, which would drown out the report
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+                await asyncio.gather(*[generate() for _ in range(count)])
+            seconds = time.perf_counter() - start
+        finally:
+            if feed_manager is not None:
+                await feed_manager.close()
+            await client_pool.close()
+            await stub.stop()
+
+    return {
+        "settings": asdict(settings),
+        "accounts": count,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "errors": sorted(set(errors))[:10],
+        "seconds": seconds,
+        "accounts_per_second": len(latencies) / seconds,
+        "latency": percentiles(latencies) if len(latencies) > 0 else {},
+        "blocks": stub.chain.height,
+        "rpc_counts": dict(stub.rpc_counts),
+        "rpc_calls_per_account": sum(stub.rpc_counts.values()) / count,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PlotNFT load test against a stub full node and wallet")
+    parser.add_argument("-n", "--count", type=int, default=100, help="PlotNFTs to generate")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Generations running at once")
+    parser.add_argument("--block-time", type=float, default=1.0, help="Seconds between stub blocks")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every RPC")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds per RPC")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of RPCs that fail")
+    parser.add_argument("--feed-coins", type=int, default=10, help="Coins the stub feed wallet starts with")
+    parser.add_argument("-o", "--output", help="Where to write the JSON results")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the output of every generation")
+    args = parser.parse_args()
+
+    settings = StubSettings(
+        block_time=args.block_time,
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        feed_coins=args.feed_coins,
+    )
+    results: Dict = asyncio.run(run_load_test(args.count, args.concurrency, settings, args.verbose))
+    print(
+        f"{results['succeeded']}/{results['accounts']} accounts in {results['seconds']:.1f}s over {results['blocks']} "
+        f"blocks, {results['accounts_per_second']:.1f} accounts/s"
+    )
+    if results["latency"]:
+        print("latency " + ", ".join(f"{key} {results['latency'][key]:.2f}s" for key in ("p50", "p90", "p99", "max")))
+    print(f"{results['rpc_calls_per_account']:.1f} RPC calls per account")
+    for method, calls in sorted(results["rpc_counts"].items(), key=lambda item: -item[1]):
+        print(f"  {method:<36}{calls:>8}")
+    for error in results["errors"]:
+        print(f"error: {error}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=4)
+        print(f"Wrote results to: {args.output}")
+    return 0 if results["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Times the offline PlotNFT build, the same as 'autowallet bench'. Keep a results file from a
+known good commit as the baseline, a run more than --tolerance slower than it exits with 1:
+
+    python benchmarks/offline_spend.py --count 200 --workers 4 --output baseline.json
+    python benchmarks/offline_spend.py --count 200 --workers 4 --baseline baseline.json
+"""
+
+import argparse
+import sys
+
+from auto_chia_wallet.bench import bench
+from auto_chia_wallet.config import load_default_config
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline PlotNFT build benchmark")
+    parser.add_argument("-n", "--count", type=int, default=100, help="Accounts to build per run")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Most worker processes to measure")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Results of an earlier run to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+    return bench(load_default_config(), args.count, args.workers, args.output, args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,5 @@
-from auto_chia_wallet import generate_plotnft
-from auto_chia_wallet.config import load_config_from_file
-
-
-def lambda_handler(event, context):
-    with open("./config.yaml", "r") as file:
-        config = load_config_from_file(file)
-
-    nft_data = await generate_plotnft(config, use_feed_wallet=True)
-    if nft_data.status and nft_data.status == "success":
-        return {
-            "statusCode": 200,
-            "headers": {"Access-Control-Allow-Origin": "*", "Access-Control-Allow-Methods": "GET"},
-            "body": nft_data,
-        }
-    else:
-        return {
-            "statusCode": 500,
-            "headers": {"Access-Control-Allow-Origin": "*", "Access-Control-Allow-Methods": "GET"},
-            "body": nft_data,
-        }
+# Point the Lambda handler at auto_chia_wallet.serverless.lambda_handler, or re-export it as below.
+# The config is read from ./config.yaml, or the path in the AUTO_CHIA_WALLET_CONFIG environment variable.
+# Pass {"use_key_pool": true} in the event to claim keys made ahead of time with 'autowallet generate keys'.
+# Pass {"eager": true} to submit the launcher with the feed transaction instead of waiting for it to confirm.
+from auto_chia_wallet.serverless import lambda_handler  # noqa: F401
@@ -0,0 +1,74 @@
+import asyncio
+import os
+from typing import Dict, List
+
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.util.ints import uint32, uint64
+
+from auto_chia_wallet.coins import find_coin_records_bulk, find_coins_bulk
+
+
+class FakeNode:
+    # Answers get_coin_records_by_puzzle_hashes from a list of records, counting the calls
+    def __init__(self, records: List[CoinRecord]):
+        self.records = records
+        self.calls: List[int] = []
+
+    async def get_coin_records_by_puzzle_hashes(self, puzzle_hashes, include_spent_coins=False) -> List[CoinRecord]:
+        self.calls.append(len(puzzle_hashes))
+        return [
+            record
+            for record in self.records
+            if record.coin.puzzle_hash in puzzle_hashes and (include_spent_coins or not record.spent)
+        ]
+
+
+class FakeWallet:
+    def __init__(self, fingerprint: str, puzzle_hashes: List[bytes32], node_client: FakeNode):
+        self.fingerprint = fingerprint
+        self.puzzle_hashes = puzzle_hashes
+        self.node_client = node_client
+
+    def get_fp(self) -> str:
+        return self.fingerprint
+
+    async def get_puzzle_hashes(self) -> List[bytes32]:
+        return self.puzzle_hashes
+
+
+def coin_record(puzzle_hash: bytes32, spent: bool = False) -> CoinRecord:
+    coin = Coin(bytes32(os.urandom(32)), puzzle_hash, uint64(1000))
+    return CoinRecord(coin, uint32(1), uint32(2 if spent else 0), spent, False, uint64(0))
+
+
+def test_finds_coins_at_every_puzzle_hash_of_each_wallet():
+    puzzle_hashes: List[bytes32] = [bytes32(os.urandom(32)) for _ in range(5)]
+    first, second, spent = (
+        coin_record(puzzle_hashes[0]),
+        coin_record(puzzle_hashes[1]),
+        coin_record(puzzle_hashes[3], True),
+    )
+    node = FakeNode([first, second, spent])
+    wallets = [
+        FakeWallet("1", puzzle_hashes[0:2], node),
+        FakeWallet("2", puzzle_hashes[2:4], node),
+        FakeWallet("3", puzzle_hashes[4:5], node),
+    ]
+    coins: Dict[str, List[Coin]] = asyncio.run(find_coins_bulk(wallets, chunk_size=2))
+    assert {fingerprint: set(wallet_coins) for fingerprint, wallet_coins in coins.items()} == {
+        "1": {first.coin, second.coin},
+        "2": set(),
+        "3": set(),
+    }
+    # Five puzzle hashes in chunks of two
+    assert node.calls == [2, 2, 1]
+
+
+def test_spent_records_on_request():
+    puzzle_hash = bytes32(os.urandom(32))
+    spent = coin_record(puzzle_hash, True)
+    node = FakeNode([spent])
+    records = asyncio.run(find_coin_records_bulk([FakeWallet("1", [puzzle_hash], node)], 10, include_spent_coins=True))
+    assert records == {"1": [spent]}
@@ -0,0 +1,58 @@
+import os
+
+from blspy import AugSchemeMPL, PrivateKey
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.util.ints import uint32
+from chia.wallet.derive_keys import master_sk_to_farmer_sk, master_sk_to_wallet_sk
+from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import puzzle_for_pk
+
+from auto_chia_wallet.derivation import DerivationCache
+
+
+def master_sk() -> PrivateKey:
+    return AugSchemeMPL.key_gen(os.urandom(32))
+
+
+def test_matches_chia_derivation():
+    key = master_sk()
+    derivations = DerivationCache(key)
+    for index in (0, 1, 5):
+        assert (
+            derivations.puzzle_hash(index)
+            == puzzle_for_pk(master_sk_to_wallet_sk(key, uint32(index)).get_g1()).get_tree_hash()
+        )
+    assert derivations.farmer_pk() == master_sk_to_farmer_sk(key).get_g1()
+
+
+def test_derives_each_index_once():
+    derivations = DerivationCache(master_sk())
+    assert derivations.puzzle(3) is derivations.puzzle(3)
+    assert derivations.wallet_sk(3) is derivations.wallet_sk(3)
+    assert derivations.puzzle_hashes() == []
+    second, first = derivations.puzzle_hash(2), derivations.puzzle_hash(0)
+    assert derivations.puzzle_hashes() == [first, second]
+
+
+def test_finds_the_index_of_a_puzzle_hash():
+    key = master_sk()
+    puzzle_hash: bytes32 = DerivationCache(key).puzzle_hash(7)
+    # A fresh cache searches up to max_index for it
+    assert DerivationCache(key).index_for_puzzle_hash(puzzle_hash) == 7
+    assert DerivationCache(key, max_index=5).index_for_puzzle_hash(puzzle_hash) is None
+
+
+def test_remembered_puzzle_hashes_skip_derivation():
+    derivations = DerivationCache(master_sk())
+    puzzle_hash = bytes32(os.urandom(32))
+    derivations.remember_puzzle_hash(0, puzzle_hash)
+    assert derivations.puzzle_hash(0) == puzzle_hash
+    assert derivations.index_for_puzzle_hash(puzzle_hash) == 0
+
+
+def test_clear_forgets_everything():
+    derivations = DerivationCache(master_sk())
+    derivations.synthetic_sk(0)
+    derivations.puzzle_hash(0)
+    derivations.clear()
+    assert derivations.synthetic_sks() == []
+    assert derivations.puzzle_hashes() == []
@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+from chia.types.blockchain_format.sized_bytes import bytes32
+
+from auto_chia_wallet.feed_wallet import FeedWalletManager
+
+FEED_AMOUNT = 10
+FEE = 1
+
+
+class FakeFeedWallet:
+    # The wallet side the manager uses, max_send_amount excludes coins locked by pending transactions
+    def __init__(self, balance: int, batch_window: float = 0.0, max_batch_size: int = 1):
+        self.config = {
+            "feed_wallet": {
+                "feed_amount": FEED_AMOUNT,
+                "fee": FEE,
+                "batch_window": batch_window,
+                "max_batch_size": max_batch_size,
+            }
+        }
+        self.balance = balance
+        self.locked = 0
+        self.sent: List[List[bytes32]] = []
+        self.confirmations: Dict[int, asyncio.Future] = {}
+
+    async def get_max_send_amount(self) -> int:
+        return self.balance - self.locked
+
+    async def submit_feed_batch(self, puzzle_hashes: List[bytes32]) -> SimpleNamespace:
+        amount = FEED_AMOUNT * len(puzzle_hashes) + FEE
+        if amount > self.balance - self.locked:
+            raise ValueError("Can't send more than max_send_amount")
+        self.locked += amount
+        self.sent.append(puzzle_hashes)
+        transaction_record = SimpleNamespace(index=len(self.sent) - 1, amount=amount)
+        self.confirmations[transaction_record.index] = asyncio.get_running_loop().create_future()
+        return transaction_record
+
+    async def wait_for_confirmation(self, transaction_record: SimpleNamespace, watcher) -> SimpleNamespace:
+        await self.confirmations[transaction_record.index]
+        self.locked -= transaction_record.amount
+        self.balance -= transaction_record.amount
+        return transaction_record
+
+    def confirm(self, index: int):
+        self.confirmations[index].set_result(None)
+
+    def fail(self, index: int, error: Exception):
+        self.confirmations[index].set_exception(error)
+
+    def close(self):
+        pass
+
+
+async def manager_for(feed_wallet: FakeFeedWallet) -> FeedWalletManager:
+    manager = FeedWalletManager(feed_wallet)
+    manager.available = await feed_wallet.get_max_send_amount()
+    return manager
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def puzzle_hash(index: int) -> bytes32:
+    return bytes32(bytes([index]) * 32)
+
+
+def test_requests_in_the_window_share_one_transaction():
+    async def run():
+        feed_wallet = FakeFeedWallet(100, batch_window=0.05, max_batch_size=10)
+        manager = await manager_for(feed_wallet)
+        funding = asyncio.gather(*[manager.fund(puzzle_hash(index)) for index in range(3)])
+        while len(feed_wallet.sent) == 0:
+            await asyncio.sleep(0.01)
+        assert feed_wallet.sent == [[puzzle_hash(0), puzzle_hash(1), puzzle_hash(2)]]
+        assert manager.reserved == 3 * FEED_AMOUNT + FEE
+        feed_wallet.confirm(0)
+        records = await funding
+        assert [record.index for record in records] == [0, 0, 0]
+        assert (manager.available, manager.reserved) == (100 - 3 * FEED_AMOUNT - FEE, 0)
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_a_request_over_the_balance_fails_without_sending():
+    async def run():
+        feed_wallet = FakeFeedWallet(FEED_AMOUNT)
+        manager = await manager_for(feed_wallet)
+        with pytest.raises(Exception, match="Not enough funds in feed wallet"):
+            await manager.fund(puzzle_hash(0))
+        assert feed_wallet.sent == []
+        assert manager.reserved == 0
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_a_confirmation_from_an_old_reading_isnt_released_twice():
+    async def run():
+        feed_wallet = FakeFeedWallet(2 * FEED_AMOUNT)
+        manager = await manager_for(feed_wallet)
+        first = asyncio.ensure_future(manager.fund(puzzle_hash(0)))
+        await settle()
+        assert manager.reserved == FEED_AMOUNT + FEE
+        # The local figure runs short, so the balance is read again with the first payment already locked
+        with pytest.raises(Exception, match="Not enough funds in feed wallet"):
+            await manager.fund(puzzle_hash(1))
+        assert (manager.available, manager.reserved) == (FEED_AMOUNT - FEE, 0)
+        feed_wallet.confirm(0)
+        await first
+        # The new reading already excludes the first payment, subtracting it again would go negative
+        assert (manager.available, manager.reserved) == (FEED_AMOUNT - FEE, 0)
+        assert manager.available == await feed_wallet.get_max_send_amount()
+        await manager.close()
+
+    asyncio.run(run())
+
+
+def test_a_failed_confirmation_reads_the_balance_again():
+    async def run():
+        feed_wallet = FakeFeedWallet(100)
+        manager = await manager_for(feed_wallet)
+        first = asyncio.ensure_future(manager.fund(puzzle_hash(0)))
+        await settle()
+        feed_wallet.fail(0, TimeoutError("Not confirmed"))
+        with pytest.raises(TimeoutError):
+            await first
+        assert (manager.available, manager.reserved) == (0, 0)
+        # The wallet still holds the payment as pending, the next send reads what's left
+        second = asyncio.ensure_future(manager.fund(puzzle_hash(1)))
+        await settle()
+        assert manager.available == 100 - FEED_AMOUNT - FEE
+        feed_wallet.confirm(1)
+        await second
+        await manager.close()
+
+    asyncio.run(run())
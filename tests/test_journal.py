@@ -0,0 +1,42 @@
+import pytest
+
+from auto_chia_wallet.journal import CONFIRMED, FUNDED, FUNDING, KEY, SUBMITTED, Journal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = Journal.open(str(tmp_path / "journal.jsonl"))
+    yield journal
+    journal.close()
+
+
+def test_folds_entries_into_the_latest_state(journal):
+    journal.record("1", KEY, mnemonic="words")
+    journal.record("1", FUNDING, feed_tx_id="aa")
+    journal.record("1", FUNDED, coin_ids=["bb"])
+    state = journal.incomplete()["1"]
+    assert state["stage"] == FUNDED
+    assert state["mnemonic"] == "words"
+    assert state["feed_tx_id"] == "aa"
+    assert state["coin_ids"] == ["bb"]
+
+
+def test_submitted_and_confirmed_wallets_are_finished(journal):
+    journal.record_many([("1", KEY, {}), ("2", KEY, {}), ("3", KEY, {})])
+    journal.record("2", SUBMITTED, launcher_id="cc")
+    journal.record("3", CONFIRMED)
+    assert list(journal.incomplete()) == ["1"]
+    assert list(journal.incomplete(include_submitted=True)) == ["1", "2"]
+
+
+def test_skips_a_line_cut_off_by_a_crash(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = Journal.open(path)
+    journal.record("1", KEY)
+    journal.file.write('{"fingerprint": "1", "stage": "fun')
+    journal.close()
+    # Reopening ends the cut off line, so the next entry is readable
+    journal = Journal.open(path)
+    journal.record("2", KEY)
+    assert {fingerprint: state["stage"] for fingerprint, state in journal.incomplete().items()} == {"1": KEY, "2": KEY}
+    journal.close()
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from auto_chia_wallet.key_pool import KeyBundle, KeyPool
+
+
+def key_bundle(fingerprint: int) -> KeyBundle:
+    # Claiming only moves the bytes around, they don't have to be real keys
+    return KeyBundle(
+        mnemonic=f"mnemonic {fingerprint}",
+        master_sk=os.urandom(32),
+        fingerprint=fingerprint,
+        first_puzzle_hash=os.urandom(32),
+        payout_puzzle_hash=os.urandom(32),
+        farmer_pk=os.urandom(48),
+    )
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "key_pool.sqlite")
+
+
+def test_each_key_is_claimed_once(path):
+    key_pool = KeyPool.open(path)
+    key_pool.add([key_bundle(fingerprint) for fingerprint in range(5)])
+    other = KeyPool.open(path)
+    try:
+        first = key_pool.claim(3)
+        second = other.claim(3)
+        assert len(first) == 3
+        assert len(second) == 2
+        assert {bundle.fingerprint for bundle in first + second} == set(range(5))
+        assert key_pool.claim(1) == []
+        assert key_pool.unclaimed_count() == 0
+    finally:
+        other.close()
+        key_pool.close()
+
+
+def test_claimed_keys_round_trip(path):
+    bundle = key_bundle(7)
+    key_pool = KeyPool.open(path)
+    try:
+        # Adding a key twice keeps one copy
+        key_pool.add([bundle, bundle])
+        assert key_pool.unclaimed_count() == 1
+        assert key_pool.claim(1) == [bundle]
+        assert key_pool.get_by_fingerprint(7) == bundle
+        assert key_pool.get_by_puzzle_hash(bundle.first_puzzle_hash) == bundle
+        assert key_pool.get_by_fingerprint(8) is None
+    finally:
+        key_pool.close()
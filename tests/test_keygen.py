@@ -0,0 +1,27 @@
+import asyncio
+from typing import List
+
+from blspy import PrivateKey
+
+from auto_chia_wallet.derivation import DerivationCache
+from auto_chia_wallet.key_pool import KeyBundle
+from auto_chia_wallet.keygen import derive_key_bundle, generate_key_bundles
+
+
+def test_bundle_matches_the_mnemonic():
+    bundle: KeyBundle = derive_key_bundle()
+    again: KeyBundle = derive_key_bundle(bundle.mnemonic)
+    assert again == bundle
+    master_sk = PrivateKey.from_bytes(bundle.master_sk)
+    assert master_sk.get_g1().get_fingerprint() == bundle.fingerprint
+    derivations = DerivationCache(master_sk)
+    assert bundle.first_puzzle_hash == bytes(derivations.puzzle_hash(0))
+    assert bundle.payout_puzzle_hash == bytes(derivations.puzzle_hash(1))
+
+
+def test_generates_count_distinct_keys_across_workers():
+    async def collect() -> List[KeyBundle]:
+        return [bundle async for bundle in generate_key_bundles(4, workers=2)]
+
+    bundles: List[KeyBundle] = asyncio.run(collect())
+    assert len({bundle.fingerprint for bundle in bundles}) == 4
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from auto_chia_wallet.metrics import BUCKETS, Metrics, instrument_client
+
+
+class FakeClient:
+    # Every RpcClient method goes through fetch
+    async def fetch(self, path, request_json):
+        if request_json.get("fail"):
+            raise ValueError("Request failed")
+        return {"success": True}
+
+
+def test_histograms_count_into_every_bucket_at_or_above():
+    metrics = Metrics()
+    metrics.observe("stage_seconds", 0.02, stage="sign")
+    metrics.observe("stage_seconds", 2.0, stage="sign")
+    histogram = metrics.histograms[("stage_seconds", (("stage", "sign"),))]
+    assert histogram.buckets == [0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2]
+    assert (histogram.count, histogram.sum, histogram.max) == (2, 2.02, 2.0)
+    # Over the largest bound only +Inf has it
+    metrics.observe("stage_seconds", BUCKETS[-1] + 1, stage="sign")
+    assert histogram.buckets[-1] == 2
+    assert histogram.count == 3
+
+
+def test_timer_observes_the_stage_even_when_it_raises():
+    metrics = Metrics()
+    with metrics.timer("fund"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer("fund"):
+            raise ValueError("Funding failed")
+    assert metrics.histograms[("stage_seconds", (("stage", "fund"),))].count == 2
+
+
+def test_prometheus_text():
+    metrics = Metrics()
+    metrics.count("rpc_requests_total", service="full_node", method="push_tx")
+    metrics.count("rpc_requests_total", service="full_node", method="push_tx")
+    metrics.observe("stage_seconds", 0.5, stage="sign")
+    lines = metrics.prometheus_text().splitlines()
+    assert lines[:2] == [
+        "# TYPE autowallet_rpc_requests_total counter",
+        'autowallet_rpc_requests_total{method="push_tx",service="full_node"} 2',
+    ]
+    assert lines[2] == "# TYPE autowallet_stage_seconds histogram"
+    assert 'autowallet_stage_seconds_bucket{stage="sign",le="0.1"} 0' in lines
+    assert 'autowallet_stage_seconds_bucket{stage="sign",le="0.5"} 1' in lines
+    assert 'autowallet_stage_seconds_bucket{stage="sign",le="+Inf"} 1' in lines
+    assert lines[-2:] == [
+        'autowallet_stage_seconds_sum{stage="sign"} 0.5',
+        'autowallet_stage_seconds_count{stage="sign"} 1',
+    ]
+
+
+def test_summary_and_reset():
+    metrics = Metrics()
+    metrics.observe("stage_seconds", 1.0, stage="sign")
+    metrics.observe("stage_seconds", 3.0, stage="sign")
+    metrics.count("rpc_requests_total", service="full_node", method="push_tx")
+    assert metrics.summary() == {
+        "stage_seconds": {"sign": {"count": 2, "seconds": 4.0, "mean": 2.0, "max": 3.0}},
+        "rpc_requests_total": {"push_tx,full_node": 1},
+    }
+    metrics.reset()
+    assert metrics.summary() == {}
+    assert metrics.prometheus_text() == "\n"
+
+
+def test_instrumented_clients_count_requests_and_errors(monkeypatch):
+    from auto_chia_wallet import metrics as metrics_module
+
+    metrics = Metrics()
+    monkeypatch.setattr(metrics_module, "metrics", metrics)
+    client = instrument_client(FakeClient(), "wallet")
+
+    async def run():
+        assert await client.fetch("get_wallet_balance", {}) == {"success": True}
+        with pytest.raises(ValueError):
+            await client.fetch("send_transaction", {"fail": True})
+
+    asyncio.run(run())
+    assert metrics.counters == {
+        ("rpc_requests_total", (("method", "get_wallet_balance"), ("service", "wallet"))): 1,
+        ("rpc_requests_total", (("method", "send_transaction"), ("service", "wallet"))): 1,
+        ("rpc_errors_total", (("method", "send_transaction"), ("service", "wallet"))): 1,
+    }
+    assert metrics.histograms[("rpc_seconds", (("method", "send_transaction"), ("service", "wallet")))].count == 1
@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from auto_chia_wallet import output
+from auto_chia_wallet.output import CSV_FIELDS, BatchOutput, write_account_file
+
+
+def success(fingerprint: int) -> Dict:
+    return {
+        "status": "success",
+        "data": {"fingerprint": fingerprint, "mnemonic": f"words {fingerprint}", "launcher_id": f"{fingerprint:064x}"},
+    }
+
+
+def failure(fingerprint: int) -> Dict:
+    return {"status": "error", "data": "ValueError('Launcher failed')", "fingerprint": fingerprint, "mnemonic": "words"}
+
+
+@pytest.fixture
+def fsyncs(monkeypatch) -> List[int]:
+    fsyncs: List[int] = []
+    monkeypatch.setattr(output.os, "fsync", fsyncs.append)
+    return fsyncs
+
+
+def test_ndjson_writes_a_line_per_account(tmp_path):
+    path = str(tmp_path / "out" / "accounts.ndjson")
+    batch_output = BatchOutput(path)
+    batch_output.write([success(1), failure(2)])
+    batch_output.write([success(3)])
+    batch_output.close()
+    with open(path) as file:
+        lines = [json.loads(line) for line in file]
+    assert lines == [success(1), failure(2), success(3)]
+    assert (batch_output.succeeded, batch_output.failed) == (2, 1)
+
+
+def test_csv_keeps_the_keys_of_failed_accounts(tmp_path):
+    path = str(tmp_path / "accounts.csv")
+    batch_output = BatchOutput(path, "csv")
+    batch_output.write([success(1), failure(2)])
+    batch_output.close()
+    # Appending to the file again doesn't repeat the header
+    batch_output = BatchOutput(path, "csv")
+    batch_output.write([success(3)])
+    batch_output.close()
+    with open(path, newline="") as file:
+        reader = csv.DictReader(file)
+        assert reader.fieldnames == CSV_FIELDS
+        rows = list(reader)
+    assert [row["status"] for row in rows] == ["success", "error", "success"]
+    assert rows[0]["launcher_id"] == f"{1:064x}"
+    assert (rows[1]["fingerprint"], rows[1]["mnemonic"]) == ("2", "words")
+    assert rows[1]["error"] == "ValueError('Launcher failed')"
+
+
+def test_fsyncs_every_n_accounts_and_on_close(tmp_path, fsyncs):
+    batch_output = BatchOutput(str(tmp_path / "accounts.ndjson"), fsync_every=2)
+    batch_output.write([success(1)])
+    assert len(fsyncs) == 0
+    batch_output.write([success(2), success(3)])
+    assert len(fsyncs) == 1
+    batch_output.write([success(4)])
+    assert len(fsyncs) == 1
+    batch_output.close()
+    assert len(fsyncs) == 2
+
+
+def test_a_batch_without_accounts_leaves_no_file(tmp_path):
+    path = str(tmp_path / "accounts.ndjson")
+    BatchOutput(path).close()
+    assert not os.path.exists(path)
+
+
+def test_an_unknown_format_raises(tmp_path):
+    with pytest.raises(ValueError, match="Unknown output format: 'xml'"):
+        BatchOutput(str(tmp_path / "accounts.xml"), "xml")
+
+
+def test_open_names_the_file_after_the_run(tmp_path):
+    config = SimpleNamespace(output_dir=str(tmp_path), output_format="csv", output_fsync_every=10)
+    batch_output = BatchOutput.open(config)
+    assert os.path.dirname(batch_output.path) == str(tmp_path)
+    assert os.path.basename(batch_output.path).startswith("accounts-")
+    assert batch_output.path.endswith(".csv")
+    assert (batch_output.format, batch_output.fsync_every) == ("csv", 10)
+
+
+def test_account_files_are_replaced_whole(tmp_path, fsyncs):
+    output_dir = str(tmp_path / "accounts")
+    path = write_account_file(output_dir, success(1))
+    assert path == os.path.join(output_dir, "account1.json")
+    assert os.listdir(output_dir) == ["account1.json"]
+    assert len(fsyncs) == 1
+    with open(path) as file:
+        assert json.load(file) == success(1)
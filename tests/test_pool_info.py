@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Dict
+
+import pytest
+
+from auto_chia_wallet import pool_info
+from auto_chia_wallet.pool_info import PoolInfoCache
+
+POOL_URL = "https://pool.example"
+
+
+class FakePool:
+    # Stands in for chia's create_pool_args, on a clock the test moves
+    def __init__(self):
+        self.now = 1000.0
+        self.fetches = 0
+        self.error = None
+
+    async def create_pool_args(self, pool_url: str) -> Dict:
+        self.fetches += 1
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return {"target_puzzle_hash": f"0x{self.fetches:064x}", "relative_lock_height": 100, "name": "Pool"}
+
+
+@pytest.fixture
+def pool(monkeypatch) -> FakePool:
+    pool = FakePool()
+    monkeypatch.setattr(pool_info, "create_pool_args", pool.create_pool_args)
+    monkeypatch.setattr(pool_info, "time", SimpleNamespace(time=lambda: pool.now))
+    return pool
+
+
+def get(cache: PoolInfoCache) -> Dict:
+    return asyncio.run(cache.get(POOL_URL))
+
+
+def test_concurrent_lookups_fetch_once(pool):
+    cache = PoolInfoCache()
+
+    async def run():
+        return await asyncio.gather(*[cache.get(POOL_URL) for _ in range(5)])
+
+    entries = asyncio.run(run())
+    assert pool.fetches == 1
+    assert all(entry == entries[0] for entry in entries)
+    assert entries[0]["relative_lock_height"] == 100
+    assert "name" not in entries[0]
+
+
+def test_entries_are_fetched_again_after_the_ttl(pool):
+    cache = PoolInfoCache(ttl=60)
+    first = get(cache)
+    pool.now += 59
+    assert get(cache) == first
+    assert pool.fetches == 1
+    pool.now += 2
+    assert get(cache)["target_puzzle_hash"] != first["target_puzzle_hash"]
+    assert pool.fetches == 2
+
+
+def test_a_failed_refresh_uses_the_stale_entry_and_backs_off(pool):
+    cache = PoolInfoCache(ttl=60, max_stale=600)
+    first = get(cache)
+    pool.now += 100
+    pool.error = ConnectionError("Pool is down")
+    assert get(cache) == first
+    assert pool.fetches == 2
+    # The pool isn't asked again until ttl after the failure
+    pool.now += 59
+    assert get(cache) == first
+    assert pool.fetches == 2
+    pool.now += 2
+    pool.error = None
+    assert get(cache)["target_puzzle_hash"] != first["target_puzzle_hash"]
+    assert pool.fetches == 3
+
+
+def test_a_failed_refresh_past_max_stale_raises(pool):
+    cache = PoolInfoCache(ttl=60, max_stale=600)
+    get(cache)
+    pool.now += 601
+    pool.error = ConnectionError("Pool is down")
+    with pytest.raises(ConnectionError):
+        get(cache)
+    with pytest.raises(ConnectionError):
+        asyncio.run(PoolInfoCache().get("https://other.example"))
+
+
+def test_the_file_is_shared_between_caches(pool, tmp_path):
+    path = str(tmp_path / "pool_info.json")
+    first = get(PoolInfoCache(path))
+    assert get(PoolInfoCache(path)) == first
+    assert pool.fetches == 1
+    # Only a cache, a damaged file is fetched again
+    with open(path, "w") as file:
+        file.write("{")
+    get(PoolInfoCache(path))
+    assert pool.fetches == 2
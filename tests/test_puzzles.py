@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from blspy import AugSchemeMPL, G1Element
+from chia.pools.pool_puzzles import (
+    create_full_puzzle,
+    create_pooling_inner_puzzle,
+    create_waiting_room_inner_puzzle,
+    launcher_id_to_p2_puzzle_hash,
+)
+from chia.pools.pool_wallet_info import FARMING_TO_POOL, SELF_POOLING
+from chia.types.blockchain_format.sized_bytes import bytes32
+
+from auto_chia_wallet.puzzles import PoolPuzzleTemplate
+
+
+# Delays and lock heights around the edges of CLVM's integer encoding
+@pytest.mark.parametrize("delay_time", [0, 1, 127, 128, 255, 604800, 2**40])
+@pytest.mark.parametrize("relative_lock_height", [0, 100, 127, 128, 32768])
+def test_matches_chia_pool_puzzles(delay_time: int, relative_lock_height: int):
+    genesis_challenge = bytes32(os.urandom(32))
+    target_puzzle_hash = bytes32(os.urandom(32))
+    launcher_id = bytes32(os.urandom(32))
+    delay_ph = bytes32(os.urandom(32))
+    owner_pubkey: G1Element = AugSchemeMPL.key_gen(os.urandom(32)).get_g1()
+    template = PoolPuzzleTemplate(genesis_challenge)
+
+    waiting_room = create_waiting_room_inner_puzzle(
+        target_puzzle_hash, relative_lock_height, owner_pubkey, launcher_id, genesis_challenge, delay_time, delay_ph
+    )
+    pooling = create_pooling_inner_puzzle(
+        target_puzzle_hash,
+        waiting_room.get_tree_hash(),
+        owner_pubkey,
+        launcher_id,
+        genesis_challenge,
+        delay_time,
+        delay_ph,
+    )
+    p2_singleton_puzzle_hash = template.p2_singleton_puzzle_hash(launcher_id, delay_time, delay_ph)
+    assert p2_singleton_puzzle_hash == launcher_id_to_p2_puzzle_hash(launcher_id, delay_time, delay_ph)
+
+    for state, inner_puzzle in ((SELF_POOLING, waiting_room), (FARMING_TO_POOL, pooling)):
+        inner_puzzle_hash = template.inner_puzzle_hash(
+            state, target_puzzle_hash, relative_lock_height, owner_pubkey, p2_singleton_puzzle_hash
+        )
+        assert inner_puzzle_hash == inner_puzzle.get_tree_hash()
+        assert (
+            template.full_puzzle_hash(inner_puzzle_hash, launcher_id)
+            == create_full_puzzle(inner_puzzle, launcher_id).get_tree_hash()
+        )
+
+
+def test_unknown_state_raises():
+    template = PoolPuzzleTemplate(bytes32(os.urandom(32)))
+    with pytest.raises(ValueError, match="Invalid initial state"):
+        template.inner_puzzle_hash(
+            0, bytes32(os.urandom(32)), 0, AugSchemeMPL.key_gen(os.urandom(32)).get_g1(), bytes32(os.urandom(32))
+        )
@@ -0,0 +1,72 @@
+import asyncio
+import socket
+import tempfile
+from dataclasses import replace
+from typing import Dict
+
+import aiohttp
+
+from auto_chia_wallet.config import Config, load_default_config
+from auto_chia_wallet.server import PlotNFTServer
+from auto_chia_wallet.stub_node import StubServer, StubSettings
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_server(test, **serve):
+    # Runs test(session, url) against a PlotNFTServer backed by the stub full node and wallet
+    stub = StubServer(StubSettings(block_time=0.2))
+    with tempfile.TemporaryDirectory() as root_path:
+        config: Config = await stub.start(load_default_config(), root_path)
+        config = replace(config, serve=replace(config.serve, hostname="127.0.0.1", port=free_port(), **serve))
+        server = PlotNFTServer(config)
+        try:
+            await server.start()
+            async with aiohttp.ClientSession() as session:
+                return await test(session, f"http://127.0.0.1:{config.serve.port}")
+        finally:
+            await server.stop()
+            await stub.stop()
+
+
+def test_generates_a_plotnft():
+    async def test(session, url: str) -> Dict:
+        async with session.post(f"{url}/plotnft") as response:
+            assert response.status == 202
+            job_id: str = (await response.json())["job_id"]
+        for _ in range(200):
+            async with session.get(f"{url}/jobs/{job_id}") as response:
+                assert response.status == 200
+                job: Dict = await response.json()
+            if job["finished"] is not None:
+                return job
+            await asyncio.sleep(0.1)
+        raise AssertionError("job never finished")
+
+    job: Dict = asyncio.run(run_server(test))
+    assert job["status"] == "success", job["result"]
+    assert job["result"]["data"]["launcher_id"]
+
+
+def test_unknown_job():
+    async def test(session, url: str) -> int:
+        async with session.get(f"{url}/jobs/nope") as response:
+            return response.status
+
+    assert asyncio.run(run_server(test)) == 404
+
+
+def test_full_queue_is_refused():
+    # Without workers nothing leaves the queue
+    async def test(session, url: str):
+        statuses = []
+        for _ in range(3):
+            async with session.post(f"{url}/plotnft") as response:
+                statuses.append(response.status)
+        return statuses
+
+    assert asyncio.run(run_server(test, workers=0, queue_size=2)) == [202, 202, 429]
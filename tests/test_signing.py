@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+
+import pytest
+from blspy import AugSchemeMPL, G2Element
+from chia.consensus.default_constants import DEFAULT_CONSTANTS
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_spend import CoinSpend
+from chia.types.condition_opcodes import ConditionOpcode
+from chia.types.spend_bundle import SpendBundle
+from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import (
+    DEFAULT_HIDDEN_PUZZLE_HASH,
+    calculate_synthetic_secret_key,
+    puzzle_for_pk,
+    solution_for_conditions,
+)
+
+from auto_chia_wallet import signing
+from auto_chia_wallet.signing import BatchSigner, SigningJob, agg_sig_me_additional_data
+from auto_chia_wallet.validation import validate_spend_bundle
+
+ADDITIONAL_DATA = agg_sig_me_additional_data(DEFAULT_CONSTANTS)
+MAX_COST = DEFAULT_CONSTANTS.MAX_BLOCK_COST_CLVM
+
+
+def signing_job(seed: int, with_key: bool = True) -> SigningJob:
+    # A standard transaction spending a 1000 mojo coin of its own key
+    secret_key = AugSchemeMPL.key_gen(bytes([seed]) * 32)
+    puzzle = puzzle_for_pk(secret_key.get_g1())
+    coin = Coin(bytes32(bytes([seed]) * 32), puzzle.get_tree_hash(), 1000)
+    solution = solution_for_conditions([[ConditionOpcode.CREATE_COIN, bytes(32), 900]])
+    unsigned = SpendBundle([CoinSpend(coin, puzzle, solution)], G2Element())
+    synthetic_sk = calculate_synthetic_secret_key(secret_key, DEFAULT_HIDDEN_PUZZLE_HASH)
+    return SigningJob(bytes(unsigned), [bytes(synthetic_sk)] if with_key else [])
+
+
+def sign(signer: BatchSigner, jobs: List[SigningJob]) -> List:
+    async def run():
+        return await signer.sign(jobs, ADDITIONAL_DATA, MAX_COST)
+
+    return asyncio.run(run())
+
+
+def assert_signed(results: List, jobs: List[SigningJob]):
+    assert len(results) == len(jobs)
+    for result, job in zip(results, jobs):
+        assert isinstance(result, SpendBundle)
+        assert result.coin_spends == SpendBundle.from_bytes(job.spend_bundle).coin_spends
+        assert validate_spend_bundle(result, DEFAULT_CONSTANTS).error is None
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_signs_every_job_in_order(executor):
+    jobs = [signing_job(seed) for seed in range(1, 6)]
+    signer = BatchSigner(workers=2, executor=executor)
+    try:
+        assert_signed(sign(signer, jobs), jobs)
+    finally:
+        signer.close()
+
+
+def test_a_job_that_cant_be_signed_doesnt_fail_the_rest():
+    jobs = [signing_job(1), signing_job(2, with_key=False), signing_job(3)]
+    signer = BatchSigner(workers=1, executor="thread")
+    try:
+        results = sign(signer, jobs)
+    finally:
+        signer.close()
+    assert_signed([results[0], results[2]], [jobs[0], jobs[2]])
+    assert isinstance(results[1], ValueError)
+    assert str(results[1]).startswith("Signing failed: ")
+
+
+def test_a_broken_pool_signs_inline_and_is_replaced(monkeypatch):
+    def broken(*args):
+        raise BrokenProcessPool("A worker died")
+
+    monkeypatch.setattr(signing, "sign_jobs_in_worker", broken)
+    jobs = [signing_job(seed) for seed in range(1, 4)]
+    signer = BatchSigner(workers=2, executor="thread")
+    executor = signer.executor
+    try:
+        assert_signed(sign(signer, jobs), jobs)
+        assert signer.executor is not executor
+    finally:
+        signer.close()
+
+
+def test_an_unknown_executor_raises():
+    with pytest.raises(ValueError, match="Unknown signing executor: 'fiber'"):
+        BatchSigner(executor="fiber")
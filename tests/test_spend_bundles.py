@@ -0,0 +1,26 @@
+import pytest
+
+from chia.consensus.default_constants import DEFAULT_CONSTANTS
+
+from auto_chia_wallet.spend_bundles import max_bundle_cost, pack_spend_bundles
+
+
+def test_packs_in_order_under_the_limit():
+    assert pack_spend_bundles([4, 4, 4, 4, 4], 10) == [[0, 1], [2, 3], [4]]
+
+
+def test_a_group_may_reach_the_limit_exactly():
+    assert pack_spend_bundles([5, 5, 10, 1], 10) == [[0, 1], [2], [3]]
+
+
+def test_no_bundles_no_groups():
+    assert pack_spend_bundles([], 10) == []
+
+
+def test_a_bundle_over_the_limit_raises():
+    with pytest.raises(ValueError, match="Spend bundle 1 exceeds the cost limit: 11 > 10"):
+        pack_spend_bundles([1, 11, 1], 10)
+
+
+def test_max_bundle_cost_is_half_a_block():
+    assert max_bundle_cost(DEFAULT_CONSTANTS) == DEFAULT_CONSTANTS.MAX_BLOCK_COST_CLVM // 2
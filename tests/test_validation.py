@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+
+import pytest
+from blspy import AugSchemeMPL, G2Element
+from chia.consensus.default_constants import DEFAULT_CONSTANTS
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_spend import CoinSpend
+from chia.types.condition_opcodes import ConditionOpcode
+from chia.types.spend_bundle import SpendBundle
+from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import (
+    DEFAULT_HIDDEN_PUZZLE_HASH,
+    calculate_synthetic_secret_key,
+    puzzle_for_pk,
+    solution_for_conditions,
+)
+
+from auto_chia_wallet import validation
+from auto_chia_wallet.signing import SigningJob, agg_sig_me_additional_data, sign_job
+from auto_chia_wallet.validation import check_spend_bundle, validate_spend_bundle, validate_spend_bundles
+
+SECRET_KEY = AugSchemeMPL.key_gen(bytes([1] * 32))
+
+
+class FailingExecutor(Executor):
+    # Every job fails the way a process pool with a dead worker does
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        self.submitted += 1
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("A worker died"))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def clear_results():
+    validation._results.clear()
+    yield
+    validation._results.clear()
+
+
+def unsigned_bundle(conditions: List) -> SpendBundle:
+    # A standard transaction spending a 1000 mojo coin
+    puzzle = puzzle_for_pk(SECRET_KEY.get_g1())
+    coin = Coin(bytes32(bytes(32)), puzzle.get_tree_hash(), 1000)
+    return SpendBundle([CoinSpend(coin, puzzle, solution_for_conditions(conditions))], G2Element())
+
+
+def signed_bundle(conditions: List) -> SpendBundle:
+    synthetic_sk = calculate_synthetic_secret_key(SECRET_KEY, DEFAULT_HIDDEN_PUZZLE_HASH)
+    job = SigningJob(bytes(unsigned_bundle(conditions)), [bytes(synthetic_sk)])
+    return asyncio.run(
+        sign_job(job, agg_sig_me_additional_data(DEFAULT_CONSTANTS), DEFAULT_CONSTANTS.MAX_BLOCK_COST_CLVM)
+    )
+
+
+def test_a_signed_bundle_is_valid():
+    spend_bundle = signed_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900]])
+    result = validate_spend_bundle(spend_bundle, DEFAULT_CONSTANTS)
+    assert result.error is None
+    assert result.fee == 100
+    assert result.cost > 0
+    assert asyncio.run(check_spend_bundle(spend_bundle, DEFAULT_CONSTANTS)) == result.cost
+
+
+def test_a_bad_signature_raises():
+    spend_bundle = unsigned_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900]])
+    with pytest.raises(ValueError, match="failed local validation: BAD_AGGREGATE_SIGNATURE"):
+        asyncio.run(check_spend_bundle(spend_bundle, DEFAULT_CONSTANTS))
+
+
+def test_creating_more_than_is_spent_fails():
+    spend_bundle = signed_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 2000]])
+    assert validate_spend_bundle(spend_bundle, DEFAULT_CONSTANTS).error == "MINTING_COIN"
+
+
+def test_an_announcement_the_bundle_doesnt_create_fails():
+    spend_bundle = signed_bundle(
+        [[ConditionOpcode.CREATE_COIN, bytes(32), 900], [ConditionOpcode.ASSERT_COIN_ANNOUNCEMENT, bytes(32)]]
+    )
+    assert validate_spend_bundle(spend_bundle, DEFAULT_CONSTANTS).error == "ASSERT_ANNOUNCE_CONSUMED_FAILED"
+
+
+def test_a_reserved_fee_over_the_fee_fails():
+    spend_bundle = signed_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900], [ConditionOpcode.RESERVE_FEE, 200]])
+    assert validate_spend_bundle(spend_bundle, DEFAULT_CONSTANTS).error == "RESERVE_FEE_CONDITION_FAILED"
+
+
+def test_results_are_cached_by_name():
+    spend_bundle = signed_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900]])
+    result = validate_spend_bundle(spend_bundle, DEFAULT_CONSTANTS)
+    executor = FailingExecutor()
+    assert asyncio.run(validate_spend_bundles([spend_bundle], DEFAULT_CONSTANTS, executor)) == [result]
+    assert executor.submitted == 0
+
+
+def test_a_failing_executor_validates_in_process():
+    spend_bundles = [
+        signed_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900]]),
+        unsigned_bundle([[ConditionOpcode.CREATE_COIN, bytes(32), 900]]),
+    ]
+    executor = FailingExecutor()
+    results = asyncio.run(validate_spend_bundles(spend_bundles, DEFAULT_CONSTANTS, executor))
+    assert executor.submitted == 2
+    assert [result.error for result in results] == [None, "BAD_AGGREGATE_SIGNATURE"]
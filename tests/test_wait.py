@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from auto_chia_wallet.wait import wait_until
+
+WAIT = {"interval": 0.01, "max_interval": 0.05, "backoff": 2.0, "timeout": 0.0}
+
+
+def test_returns_the_first_truthy_result():
+    calls = []
+
+    async def check():
+        calls.append(1)
+        return len(calls) if len(calls) == 3 else None
+
+    assert asyncio.run(wait_until(check, WAIT)) == 3
+
+
+def test_raises_at_the_deadline():
+    async def check():
+        return None
+
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(asyncio.TimeoutError):
+            await wait_until(check, {**WAIT, "max_interval": 10.0, "timeout": 0.2})
+        return loop.time() - start
+
+    # The last sleep is cut short at the deadline rather than running a whole interval past it
+    assert 0.2 <= asyncio.run(run()) < 1.0
+
+
+def test_checks_once_more_at_the_deadline():
+    calls = []
+
+    async def check():
+        calls.append(1)
+        return None
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await wait_until(check, {**WAIT, "interval": 10.0, "timeout": 0.1})
+
+    asyncio.run(run())
+    assert len(calls) == 2
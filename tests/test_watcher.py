@@ -0,0 +1,117 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.util.ints import uint32, uint64
+
+from auto_chia_wallet.watcher import BlockWatcher
+
+WAIT = {"interval": 0.01, "max_interval": 0.01, "backoff": 1.0, "timeout": 0.0}
+
+
+class FakeNode:
+    def __init__(self):
+        self.height = 1
+        self.records: List[CoinRecord] = []
+        self.lookups = 0
+
+    async def get_blockchain_state(self) -> Dict:
+        return {"peak": SimpleNamespace(height=self.height)}
+
+    async def get_coin_records_by_puzzle_hashes(self, puzzle_hashes, include_spent_coins=False) -> List[CoinRecord]:
+        self.lookups += 1
+        return [record for record in self.records if record.coin.puzzle_hash in puzzle_hashes]
+
+    def add_block(self, *puzzle_hashes: bytes32):
+        for puzzle_hash in puzzle_hashes:
+            coin = Coin(bytes32(os.urandom(32)), puzzle_hash, uint64(1000))
+            self.records.append(CoinRecord(coin, uint32(self.height + 1), uint32(0), False, False, uint64(0)))
+        self.height += 1
+
+
+class FakeWalletClient:
+    def __init__(self):
+        self.transactions: Dict[bytes32, SimpleNamespace] = {}
+
+    async def get_transaction(self, wallet_id: str, tx_id: bytes32):
+        if tx_id not in self.transactions:
+            raise ValueError(f"Transaction 0x{tx_id.hex()} not found")
+        return self.transactions[tx_id]
+
+
+class FakeWallet:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.puzzle_hash = bytes32(os.urandom(32))
+
+    def get_fp(self) -> str:
+        return self.fingerprint
+
+    async def get_puzzle_hashes(self) -> List[bytes32]:
+        return [self.puzzle_hash]
+
+
+async def settle():
+    # Long enough for the watcher to poll a few times
+    await asyncio.sleep(0.1)
+
+
+def test_one_lookup_per_block_for_every_waiting_wallet():
+    async def run():
+        node = FakeNode()
+        watcher = BlockWatcher(node, WAIT)
+        wallets = [FakeWallet(str(index)) for index in range(10)]
+        waits = [asyncio.ensure_future(watcher.wait_for_coins(wallet)) for wallet in wallets]
+        await settle()
+        # Checked once when the wallets started waiting, not again until a new block
+        assert node.lookups == 1
+        node.add_block(*[wallet.puzzle_hash for wallet in wallets[:5]])
+        await settle()
+        assert node.lookups == 2
+        assert all(wait.done() for wait in waits[:5]) and not any(wait.done() for wait in waits[5:])
+        node.add_block(*[wallet.puzzle_hash for wallet in wallets[5:]])
+        coins = await asyncio.gather(*waits)
+        assert [next(iter(wallet_coins)).puzzle_hash for wallet_coins in coins] == [w.puzzle_hash for w in wallets]
+        assert node.lookups == 3
+
+    asyncio.run(run())
+
+
+def test_transactions_are_confirmed_by_id():
+    async def run():
+        node = FakeNode()
+        wallet_client = FakeWalletClient()
+        watcher = BlockWatcher(node, WAIT, wallet_client, "1")
+        known, unknown = bytes32(os.urandom(32)), bytes32(os.urandom(32))
+        wallet_client.transactions[known] = SimpleNamespace(confirmed=False)
+        waits = [asyncio.ensure_future(watcher.wait_for_transaction(tx_id)) for tx_id in (known, unknown)]
+        await settle()
+        # Only the waiter on the transaction the wallet doesn't know fails
+        with pytest.raises(ValueError, match="not found"):
+            await waits[1]
+        assert not waits[0].done()
+        wallet_client.transactions[known] = SimpleNamespace(confirmed=True)
+        node.add_block()
+        assert (await waits[0]).confirmed
+
+    asyncio.run(run())
+
+
+def test_each_waiter_has_its_own_deadline():
+    async def run():
+        watcher = BlockWatcher(FakeNode(), {**WAIT, "timeout": 0.05})
+        with pytest.raises(asyncio.TimeoutError):
+            await watcher.wait_for_coins(FakeWallet("1"))
+        assert watcher.coin_waiters == {}
+
+    asyncio.run(run())
+
+
+def test_transactions_need_a_wallet_client():
+    with pytest.raises(ValueError, match="wallet_client"):
+        asyncio.run(BlockWatcher(FakeNode(), WAIT).wait_for_transaction(bytes32(os.urandom(32))))